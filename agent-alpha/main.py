@@ -3,17 +3,36 @@ Agent Alpha - Quantitative Analysis Service
 FastAPI application for market data analysis and trading signal generation
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Literal
+from dataclasses import asdict
 from datetime import datetime
+import asyncio
+import json
 import os
+import numpy as np
 from dotenv import load_dotenv
 
-from services.coingecko import CoinGeckoService
+from services.providers import create_provider
+from services.hedging import HedgedProvider
+from services.market_data import MarketDataService, UpstreamUnavailableError
+from services.memory_cache import SizedCache
+from services.shared_cache import SharedCandleCache, SharedProvider
+from services.http_cache import candle_fingerprint, make_etag, etag_matches
+from services.compression import CompressedBodies, IDENTITY, negotiate
 from services.indicators import calculate_rsi, calculate_bollinger_bands
+from services.indicator_engine import IndicatorEngine, latest_values
 from services.signals import SignalGenerator, TradingSignal
+from services.backtest_cache import BacktestCache
+from services.performance import backtest_performance, periods_per_year
+from services.jobs import JobManager, BacktestRunner
+from services.options import realized_volatility, suggest_strike
+from services.history_store import HistoryStore
+from services.scanner import UniverseScanner
+from services.backfill import default_symbols
 
 load_dotenv()
 
@@ -33,8 +52,73 @@ app.add_middleware(
 )
 
 # Initialize services
-coingecko_service = CoinGeckoService(api_key=os.getenv('COINGECKO_API_KEY'))
-signal_generator = SignalGenerator()
+# Provider is chosen by MARKET_DATA_PROVIDER ("coingecko" or "binance")
+market_data_provider = create_provider(os.getenv('MARKET_DATA_PROVIDER'))
+if os.getenv('MARKET_DATA_HEDGE_PROVIDER'):
+    # Race a backup provider when the primary is slower than its recent p95
+    market_data_provider = HedgedProvider(
+        market_data_provider,
+        create_provider(os.getenv('MARKET_DATA_HEDGE_PROVIDER')),
+        hedge_percentile=float(os.getenv('MARKET_DATA_HEDGE_PERCENTILE', '95'))
+    )
+MARKET_DATA_TTL = float(os.getenv('MARKET_DATA_TTL', '60'))
+GAP_POLICY = os.getenv('MARKET_DATA_GAP_POLICY', 'ffill')
+if GAP_POLICY not in ('ffill', 'drop', 'none'):
+    # "mark" leaves NaN prices, which JSON responses cannot carry
+    raise ValueError(f"MARKET_DATA_GAP_POLICY must be ffill, drop or none, got {GAP_POLICY}")
+# With several workers, share fetched candles and /analyze results through
+# memory-mapped files so each key is fetched once per host per TTL
+shared_cache = None
+if os.getenv('MARKET_DATA_SHARED_DIR'):
+    shared_cache = SharedCandleCache(os.getenv('MARKET_DATA_SHARED_DIR'))
+    market_data_provider = SharedProvider(market_data_provider, shared_cache, ttl=MARKET_DATA_TTL)
+# Candle snapshots and indicator series share one byte budget; entries of
+# pinned (hot) symbols are never evicted
+history_cache = SizedCache(
+    max_bytes=int(float(os.getenv('MARKET_DATA_CACHE_MB', '256')) * 1024 * 1024),
+    policy=os.getenv('MARKET_DATA_CACHE_POLICY', 'lru'),
+    pinned_symbols=[s for s in os.getenv('MARKET_DATA_PINNED_SYMBOLS', '').split(',') if s]
+)
+market_data = MarketDataService(
+    market_data_provider,
+    fresh_ttl=MARKET_DATA_TTL,
+    max_stale=float(os.getenv('MARKET_DATA_MAX_STALE', '86400')),
+    cache=history_cache,
+    # Gaps and duplicates would skew bar-counted indicators and lookaheads
+    gap_policy=None if GAP_POLICY == 'none' else GAP_POLICY
+)
+# Serialized and gzip/brotli-compressed bodies of large responses, kept next
+# to the snapshots they were rendered from until their ETag changes
+response_bodies = CompressedBodies(history_cache)
+signal_generator = SignalGenerator(backtest_cache=BacktestCache())
+# Long backtests and sweeps run as background jobs, checkpointed to disk
+MAX_BACKTEST_JOBS = int(os.getenv('BACKTEST_MAX_JOBS', '2'))
+backtest_runner = BacktestRunner(market_data, max_workers=MAX_BACKTEST_JOBS)
+backtest_jobs = JobManager(
+    backtest_runner,
+    directory=os.getenv('BACKTEST_JOB_DIR', 'data/jobs'),
+    max_concurrent=MAX_BACKTEST_JOBS,
+    max_finished=int(os.getenv('BACKTEST_MAX_FINISHED_JOBS', '100'))
+)
+# Signals, indicator snapshots and backtest summaries, written in batches
+history = HistoryStore(os.getenv('HISTORY_DB', 'data/history.db'))
+
+# Candles used for indicators and backtesting (30 days of hourly data)
+ANALYSIS_LIMIT = 720
+# Backtest fees must lie in [0, MAX_FEE); at 0.5 a position flip costs everything
+MAX_FEE = 0.5
+# Symbols ranked by /scan (default: every CoinGecko-mapped coin against USDT)
+SCAN_UNIVERSE = [s for s in os.getenv('SCAN_UNIVERSE', '').split(',') if s] or default_symbols()
+scanner = UniverseScanner(
+    market_data,
+    signal_generator,
+    limit=ANALYSIS_LIMIT,
+    concurrency=int(os.getenv('SCAN_CONCURRENCY', '8')),
+    cache=history_cache
+)
+# Option suggested alongside BUY_CALL / BUY_PUT signals
+OPTION_EXPIRY_DAYS = float(os.getenv('OPTION_EXPIRY_DAYS', '7'))
+OPTION_TARGET_DELTA = float(os.getenv('OPTION_TARGET_DELTA', '0.30'))
 
 
 class HealthResponse(BaseModel):
@@ -59,15 +143,41 @@ class IndicatorsResponse(BaseModel):
     bollinger_lower: float
     current_price: float
     price_position: str  # "UPPER", "MIDDLE", "LOWER"
+    stale: bool = False  # True when computed from cached data past its TTL
+    # Extended indicators (None when history is too short or volume is missing)
+    macd: Optional[float] = None
+    macd_signal: Optional[float] = None
+    macd_hist: Optional[float] = None
+    atr: Optional[float] = None
+    stoch_k: Optional[float] = None
+    stoch_d: Optional[float] = None
+    vwap: Optional[float] = None
+
+
+class OptionSuggestionResponse(BaseModel):
+    option_type: str  # "CALL" or "PUT"
+    strike: float
+    expiry_days: float
+    premium: float  # Black-Scholes price at the realized volatility
+    delta: float
+    gamma: float
+    vega: float
+    theta: float  # Per day
+    volatility: float  # Annualized realized volatility of the candles
 
 
 class AnalysisResponse(BaseModel):
     signal: str  # "BUY_CALL", "BUY_PUT", "HOLD", "CLOSE_POSITION"
     confidence: float
     win_rate: float
+    win_rate_lower: float  # Bootstrap confidence interval for win_rate
+    win_rate_upper: float
+    total_signals: int  # Backtest signals behind win_rate
     reasoning: str
     indicators: IndicatorsResponse
+    suggested_option: Optional[OptionSuggestionResponse] = None  # Only for BUY_CALL / BUY_PUT
     timestamp: str
+    stale: bool = False
 
 
 class CandlesResponse(BaseModel):
@@ -75,6 +185,175 @@ class CandlesResponse(BaseModel):
     interval: str
     candles: List[CandlestickData]
     count: int
+    stale: bool = False
+    quality: Optional[dict] = None  # Gaps, duplicates and filled bars found in the upstream data
+
+
+class IndicatorSeriesResponse(BaseModel):
+    symbol: str
+    interval: str
+    timestamps: List[int]
+    series: dict  # Output name -> values aligned with timestamps (null while warming up)
+    stale: bool = False
+
+
+class BacktestResponse(BaseModel):
+    symbol: str
+    interval: str
+    total_return: float
+    max_drawdown: float
+    sharpe: float
+    sortino: float
+    hit_rate: float
+    avg_win: float
+    avg_loss: float
+    exposure: float
+    trades: int
+    equity: Optional[List[float]] = None  # One value per candle when requested
+    stale: bool = False
+
+
+class BacktestParams(BaseModel):
+    """One parameter set of a backtest sweep (unset fields use strategy defaults)"""
+    rsi_oversold: Optional[float] = None
+    rsi_overbought: Optional[float] = None
+    take_profit: Optional[float] = None
+    stop_loss: Optional[float] = None
+    max_bars: Optional[int] = None
+    trigger: Optional[Literal["close", "high_low"]] = None
+
+
+class BacktestJobRequest(BaseModel):
+    symbols: List[str] = ["ETH/USDT"]
+    interval: str = "1h"
+    limit: int = ANALYSIS_LIMIT
+    fee: float = 0.0
+    sweep: List[BacktestParams] = [BacktestParams()]  # Every symbol is run with every set
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: str  # "queued", "running", "completed", "failed", "cancelled"
+    progress: float  # 0 to 1
+    completed_tasks: int
+    total_tasks: int
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
+
+
+class JobResultResponse(JobStatusResponse):
+    results: List[Optional[dict]]  # One per task; null until that task finishes
+
+
+class ScanResultResponse(BaseModel):
+    symbol: str
+    signal: str
+    confidence: float
+    win_rate: float
+    price: Optional[float] = None
+    reasoning: str
+    stale: bool = False
+    error: Optional[str] = None
+    elapsed_seconds: float
+
+
+class ScanResponse(BaseModel):
+    interval: str
+    top: List[ScanResultResponse]  # Highest confidence first, BUY_CALL / BUY_PUT only
+    scanned: int
+    completed: int
+    failed: int
+    timed_out: List[str]  # Symbols still running when the budget ran out
+    elapsed_seconds: float
+
+
+class HistoryRecord(BaseModel):
+    symbol: str
+    kind: str
+    interval: str
+    timestamp: int  # Candle open time (ms) the record describes
+    tag: str
+    recorded_at: float
+    payload: dict
+
+
+class SignalMarker(BaseModel):
+    timestamp: int
+    signal: str  # "BUY_CALL" or "BUY_PUT"
+    price: float  # Close of the signal bar
+    rsi: float
+
+
+class SignalHistoryResponse(BaseModel):
+    symbol: str
+    interval: str
+    timestamps: List[int]
+    signals: List[str]  # "BUY_CALL", "BUY_PUT" or "HOLD", aligned with timestamps
+    markers: List[SignalMarker]  # Non-HOLD bars only, for chart overlays
+    buy_calls: int
+    buy_puts: int
+    stale: bool = False
+
+
+class HistoryResponse(BaseModel):
+    symbol: str
+    records: List[HistoryRecord]
+    count: int
+
+
+def _not_modified(etag: str, if_none_match: Optional[str]) -> Optional[Response]:
+    """Return a 304 response when the client's cached copy is still valid"""
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    return None
+
+
+def _set_validator(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def _encoded_response(key: tuple, etag: str, accept_encoding: Optional[str], render) -> Response:
+    """JSON response in the negotiated encoding, from stored bytes while the ETag holds"""
+    body, encoding = response_bodies.get(key, etag, negotiate(accept_encoding), render)
+    response = Response(content=body, media_type="application/json")
+    _set_validator(response, etag)
+    response.headers["Vary"] = "Accept-Encoding"
+    if encoding != IDENTITY:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def _check_fee(fee: float):
+    if not 0 <= fee < MAX_FEE:
+        raise HTTPException(status_code=400, detail=f"fee must be at least 0 and below {MAX_FEE}")
+
+
+def _indicator_series(symbol: str, interval: str, candles: List[List]) -> dict:
+    """Extended indicator series, cached until the candles change"""
+    key = (symbol, interval, "indicators")
+    fingerprint = candle_fingerprint(candles)
+    cached = history_cache.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    series = IndicatorEngine(candles).compute(["macd", "atr", "stochastic", "vwap"])
+    history_cache.put(key, (fingerprint, series))
+    return series
+
+
+@app.on_event("startup")
+async def startup():
+    backtest_jobs.resume()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await backtest_jobs.close()
+    backtest_runner.shutdown()
+    await history.close()
+    await market_data_provider.close()
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -87,38 +366,70 @@ async def health_check():
     )
 
 
+@app.get("/cache/stats")
+async def cache_stats():
+    """Resident size, pinned entries, hits and evictions of the history cache"""
+    stats = history_cache.stats()
+    stats["response_bodies"] = dict(response_bodies.stats)
+    if isinstance(market_data_provider, SharedProvider):
+        stats["shared"] = dict(market_data_provider.stats)
+    return stats
+
+
+@app.get("/upstream/stats")
+async def upstream_stats():
+    """Retries, throttling (429 / Retry-After) and rate limiter waits per upstream"""
+    return market_data_provider.upstream_stats()
+
+
 @app.get("/candles", response_model=CandlesResponse)
 async def get_candles(
     symbol: str = "ETH/USDT",
     interval: str = "1h",
-    limit: int = 720
+    limit: int = 720,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
 ):
     """
-    Fetch historical candlestick data from CoinGecko
+    Fetch historical candlestick data from the configured provider
     
     - symbol: Trading pair (default: ETH/USDT)
-    - interval: Candle interval (not used, CoinGecko uses days)
+    - interval: Candle interval (CoinGecko picks granularity from the day count)
     - limit: Number of candles to fetch
+    
+    The body is gzip or brotli compressed per Accept-Encoding.
     """
     try:
-        # Convert limit to days (CoinGecko uses days parameter)
-        days = min(max(limit // 24, 1), 365)  # Convert hours to days, max 365
-        candles = await coingecko_service.fetch_ohlc(symbol, days)
-        return CandlesResponse(
-            symbol=symbol,
-            interval=interval,
-            candles=[
-                CandlestickData(
-                    timestamp=c[0],
-                    open=c[1],
-                    high=c[2],
-                    low=c[3],
-                    close=c[4],
-                    volume=c[5] if len(c) > 5 else 0
-                ) for c in candles
-            ],
-            count=len(candles)
-        )
+        snapshot = await market_data.get_candles(symbol, interval, limit)
+        candles = snapshot.candles
+        
+        etag = make_etag("candles", symbol, interval, limit, candle_fingerprint(candles), snapshot.stale)
+        not_modified = _not_modified(etag, if_none_match)
+        if not_modified is not None:
+            return not_modified
+        
+        def render() -> bytes:
+            return CandlesResponse(
+                symbol=symbol,
+                interval=interval,
+                candles=[
+                    CandlestickData(
+                        timestamp=c[0],
+                        open=c[1],
+                        high=c[2],
+                        low=c[3],
+                        close=c[4],
+                        volume=c[5] if len(c) > 5 else 0
+                    ) for c in candles
+                ],
+                count=len(candles),
+                stale=snapshot.stale,
+                quality=asdict(snapshot.quality) if snapshot.quality else None
+            ).model_dump_json().encode()
+        
+        return _encoded_response((symbol, interval, "candles-body", limit), etag, accept_encoding, render)
+    except UpstreamUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -126,19 +437,30 @@ async def get_candles(
 @app.get("/indicators")
 async def get_indicators(
     symbol: str = "ETH/USDT",
-    interval: str = "1h"
+    interval: str = "1h",
+    response: Response = None,
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Get current technical indicators for a symbol
     """
     try:
         # Fetch enough data for indicator calculations (30 days)
-        candles = await coingecko_service.fetch_ohlc(symbol, days=30)
+        snapshot = await market_data.get_candles(symbol, interval, ANALYSIS_LIMIT)
+        candles = snapshot.candles
+        
+        etag = make_etag("indicators", symbol, interval, candle_fingerprint(candles), snapshot.stale)
+        not_modified = _not_modified(etag, if_none_match)
+        if not_modified is not None:
+            return not_modified
+        _set_validator(response, etag)
+        
         closes = [c[4] for c in candles]  # Close prices
         
         # Calculate indicators
         rsi = calculate_rsi(closes, period=14)
         bb_upper, bb_middle, bb_lower = calculate_bollinger_bands(closes, period=20, std_dev=2)
+        extended = latest_values(_indicator_series(symbol, interval, candles))
         
         current_price = closes[-1] if closes else 0
         
@@ -150,14 +472,60 @@ async def get_indicators(
         else:
             price_position = "MIDDLE"
         
-        return IndicatorsResponse(
+        result = IndicatorsResponse(
             rsi=round(rsi, 2),
             bollinger_upper=round(bb_upper, 2),
             bollinger_middle=round(bb_middle, 2),
             bollinger_lower=round(bb_lower, 2),
             current_price=round(current_price, 2),
-            price_position=price_position
+            price_position=price_position,
+            stale=snapshot.stale,
+            **{name: round(value, 2) if value is not None else None for name, value in extended.items()}
         )
+        history.record("indicators", symbol, interval, candles[-1][0], result.model_dump())
+        return result
+    except UpstreamUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/indicators/series", response_model=IndicatorSeriesResponse)
+async def get_indicator_series(
+    symbol: str = "ETH/USDT",
+    interval: str = "1h",
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
+    """
+    Full MACD, ATR, stochastic and VWAP series for charting
+    
+    The body is gzip or brotli compressed per Accept-Encoding.
+    """
+    try:
+        snapshot = await market_data.get_candles(symbol, interval, ANALYSIS_LIMIT)
+        candles = snapshot.candles
+        
+        etag = make_etag("indicator-series", symbol, interval, candle_fingerprint(candles), snapshot.stale)
+        not_modified = _not_modified(etag, if_none_match)
+        if not_modified is not None:
+            return not_modified
+        
+        def render() -> bytes:
+            series = {}
+            for name, values in _indicator_series(symbol, interval, candles).items():
+                series[name] = np.where(np.isnan(values), None, np.round(values, 6)).tolist()
+            return IndicatorSeriesResponse(
+                symbol=symbol,
+                interval=interval,
+                timestamps=[int(c[0]) for c in candles],
+                series=series,
+                stale=snapshot.stale
+            ).model_dump_json().encode()
+        
+        return _encoded_response((symbol, interval, "indicator-series-body"), etag, accept_encoding, render)
+    except UpstreamUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -165,7 +533,9 @@ async def get_indicators(
 @app.get("/analyze", response_model=AnalysisResponse)
 async def analyze_market(
     symbol: str = "ETH/USDT",
-    interval: str = "1h"
+    interval: str = "1h",
+    response: Response = None,
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Run full market analysis and generate trading signal
@@ -177,10 +547,27 @@ async def analyze_market(
     """
     try:
         # Fetch historical data for backtesting (30 days)
-        candles = await coingecko_service.fetch_ohlc(symbol, days=30)
+        snapshot = await market_data.get_candles(symbol, interval, ANALYSIS_LIMIT)
+        candles = snapshot.candles
+        
+        etag = make_etag(
+            "analyze", symbol, interval, candle_fingerprint(candles),
+            signal_generator.params, snapshot.stale
+        )
+        not_modified = _not_modified(etag, if_none_match)
+        if not_modified is not None:
+            return not_modified
+        _set_validator(response, etag)
+        
+        # Another worker may already have analyzed this exact window
+        shared_name = f"analyze-{symbol}-{interval}"
+        if shared_cache is not None:
+            shared = shared_cache.read_json(shared_name)
+            if shared is not None and shared["etag"] == etag:
+                return AnalysisResponse(**shared["response"])
         
         # Generate signal with backtesting
-        signal = signal_generator.generate_signal(candles)
+        signal = signal_generator.generate_signal(candles, cache_key=(symbol, interval))
         
         # Get current indicators for response
         closes = [c[4] for c in candles]
@@ -196,10 +583,21 @@ async def analyze_market(
         else:
             price_position = "MIDDLE"
         
-        return AnalysisResponse(
+        option = suggest_strike(
+            signal.signal,
+            current_price,
+            realized_volatility(closes, periods_per_year([c[0] for c in candles], interval)),
+            expiry_days=OPTION_EXPIRY_DAYS,
+            target_delta=OPTION_TARGET_DELTA
+        )
+        
+        result = AnalysisResponse(
             signal=signal.signal,
             confidence=signal.confidence,
             win_rate=signal.win_rate,
+            win_rate_lower=signal.win_rate_lower,
+            win_rate_upper=signal.win_rate_upper,
+            total_signals=signal.total_signals,
             reasoning=signal.reasoning,
             indicators=IndicatorsResponse(
                 rsi=round(rsi, 2),
@@ -207,24 +605,259 @@ async def analyze_market(
                 bollinger_middle=round(bb_middle, 2),
                 bollinger_lower=round(bb_lower, 2),
                 current_price=round(current_price, 2),
-                price_position=price_position
+                price_position=price_position,
+                stale=snapshot.stale
             ),
-            timestamp=datetime.utcnow().isoformat()
+            suggested_option=OptionSuggestionResponse(**asdict(option)) if option else None,
+            timestamp=datetime.utcnow().isoformat(),
+            stale=snapshot.stale
+        )
+        history.record("signal", symbol, interval, candles[-1][0], result.model_dump())
+        if shared_cache is not None:
+            shared_cache.write_json(shared_name, {"etag": etag, "response": result.model_dump()})
+        return result
+    except UpstreamUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/backtest", response_model=BacktestResponse)
+async def backtest(
+    symbol: str = "ETH/USDT",
+    interval: str = "1h",
+    limit: int = ANALYSIS_LIMIT,
+    fee: float = 0.0,
+    include_equity: bool = False
+):
+    """
+    Trade the strategy's signals over history and report performance
+    
+    Each signal opens a position (long for BUY_CALL, short for BUY_PUT) closed
+    by the backtest exit rules. fee is charged per unit of position change.
+    """
+    _check_fee(fee)
+    try:
+        snapshot = await market_data.get_candles(symbol, interval, limit)
+        report = backtest_performance(
+            snapshot.candles,
+            signal_generator,
+            fee=fee,
+            periods_per_year=periods_per_year([c[0] for c in snapshot.candles], interval)
+        )
+        
+        history.record(
+            "backtest", symbol, interval, snapshot.candles[-1][0],
+            {"limit": limit, "fee": fee, **report.summary()}, tag=f"limit={limit},fee={fee}"
         )
+        return BacktestResponse(
+            symbol=symbol,
+            interval=interval,
+            equity=report.equity.round(6).tolist() if include_equity else None,
+            stale=snapshot.stale,
+            **report.summary()
+        )
+    except UpstreamUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/jobs/backtest", response_model=JobStatusResponse, status_code=202)
+async def submit_backtest_job(request: BacktestJobRequest):
+    """
+    Queue a backtest over every (symbol, parameter set) combination
+    
+    Returns immediately with a job id to poll.
+    """
+    _check_fee(request.fee)
+    tasks = [
+        {
+            "symbol": symbol,
+            "interval": request.interval,
+            "limit": request.limit,
+            "fee": request.fee,
+            **params.model_dump(exclude_none=True),
+        }
+        for symbol in request.symbols
+        for params in request.sweep
+    ]
+    job = backtest_jobs.submit(tasks)
+    return JobStatusResponse(**job.status_dict())
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str):
+    """Job status and progress"""
+    try:
+        return JobStatusResponse(**backtest_jobs.get(job_id).status_dict())
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+
+
+@app.get("/jobs/{job_id}/result", response_model=JobResultResponse)
+async def get_job_result(job_id: str):
+    """Job results so far (complete once status is "completed")"""
+    try:
+        job = backtest_jobs.get(job_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return JobResultResponse(results=job.results, **job.status_dict())
+
+
+@app.delete("/jobs/{job_id}", response_model=JobStatusResponse)
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job, keeping results finished so far"""
+    try:
+        return JobStatusResponse(**backtest_jobs.cancel(job_id).status_dict())
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+
+
+@app.get("/history", response_model=HistoryResponse)
+async def get_history(
+    symbol: str = "ETH/USDT",
+    kind: Optional[Literal["signal", "indicators", "backtest"]] = None,
+    interval: Optional[str] = None,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    limit: int = 1000
+):
+    """
+    Recorded signals, indicator snapshots and backtest summaries for a symbol
+    
+    - kind: signal, indicators or backtest (default: all)
+    - start / end: Candle time range in ms, inclusive
+    
+    Served from the history database; nothing is recomputed.
+    """
+    records = await history.query(symbol, kind, interval, start, end, min(max(limit, 1), 10000))
+    return HistoryResponse(symbol=symbol, records=records, count=len(records))
+
+
+@app.get("/signals/history", response_model=SignalHistoryResponse)
+async def get_signal_history(
+    symbol: str = "ETH/USDT",
+    interval: str = "1h",
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    limit: int = ANALYSIS_LIMIT,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
+    """
+    Signal of every bar, for overlaying BUY_CALL / BUY_PUT markers on a chart
+    
+    - limit: Candles fetched; indicators warm up over the first bars
+    - start / end: Candle time range in ms to return, inclusive
+    
+    Uses the same rules and vectorized masks as the backtest, so the markers
+    are the signals behind the reported win rate.
+    """
+    try:
+        snapshot = await market_data.get_candles(symbol, interval, limit)
+        candles = snapshot.candles
+        
+        etag = make_etag(
+            "signal-history", symbol, interval, start, end, limit,
+            candle_fingerprint(candles), snapshot.stale, signal_generator.params
+        )
+        not_modified = _not_modified(etag, if_none_match)
+        if not_modified is not None:
+            return not_modified
+        
+        def render() -> bytes:
+            result = signal_generator.signal_history(candles)
+            in_range = np.ones(len(result.timestamps), dtype=bool)
+            if start is not None:
+                in_range &= result.timestamps >= start
+            if end is not None:
+                in_range &= result.timestamps <= end
+            timestamps = result.timestamps[in_range].astype(np.int64)
+            signals = result.signals[in_range]
+            closes, rsi = result.closes[in_range], result.rsi[in_range]
+            marked = np.flatnonzero(signals != "HOLD")
+            return SignalHistoryResponse(
+                symbol=symbol,
+                interval=interval,
+                timestamps=timestamps.tolist(),
+                signals=signals.tolist(),
+                markers=[
+                    SignalMarker(
+                        timestamp=int(timestamps[i]),
+                        signal=str(signals[i]),
+                        price=float(closes[i]),
+                        rsi=round(float(rsi[i]), 2)
+                    ) for i in marked
+                ],
+                buy_calls=int(np.count_nonzero(signals == "BUY_CALL")),
+                buy_puts=int(np.count_nonzero(signals == "BUY_PUT")),
+                stale=snapshot.stale
+            ).model_dump_json().encode()
+        
+        key = (symbol, interval, "signal-history-body", start, end, limit)
+        return _encoded_response(key, etag, accept_encoding, render)
+    except UpstreamUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/scan", response_model=ScanResponse)
+async def scan_universe(
+    interval: str = "1h",
+    top_k: int = 10,
+    budget: float = 5.0,
+    symbols: Optional[str] = None,
+    stream: bool = False
+):
+    """
+    Strongest BUY_CALL / BUY_PUT setups across the universe, by confidence
+    
+    - symbols: Comma-separated pairs (default: SCAN_UNIVERSE)
+    - top_k: Setups returned
+    - budget: Seconds to wait for candles; symbols not fetched by then are left out
+    - stream: Send NDJSON as each symbol's fetch completes: a "result" line
+      (failure or memoized signal), or a "fetched" line followed by a "result"
+      line once the universe is evaluated; then a "done" line with the ranking
+    """
+    universe = [s.strip() for s in symbols.split(',') if s.strip()] if symbols else SCAN_UNIVERSE
+    top_k = min(max(top_k, 1), 100)
+    budget = min(max(budget, 0.1), 60.0)
+    
+    if not stream:
+        report = await scanner.scan(universe, interval, top_k=top_k, budget=budget)
+        return ScanResponse(**asdict(report))
+    
+    queue: asyncio.Queue = asyncio.Queue()
+    scan = asyncio.ensure_future(
+        scanner.scan(universe, interval, top_k=top_k, budget=budget, on_result=queue.put_nowait)
+    )
+    scan.add_done_callback(lambda _: queue.put_nowait(None))
+    
+    async def lines():
+        try:
+            while (result := await queue.get()) is not None:
+                event = "result" if result.evaluated else "fetched"
+                yield json.dumps({"event": event, **asdict(result)}) + "\n"
+            yield json.dumps({"event": "done", **asdict(scan.result())}) + "\n"
+        finally:
+            scan.cancel()
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @app.get("/signal")
 async def get_signal(symbol: str = "ETH/USDT"):
     """
     Get current trading signal (simplified response)
     """
-    analysis = await analyze_market(symbol)
+    analysis = await analyze_market(symbol, response=Response(), if_none_match=None)
     return {
         "signal": analysis.signal,
         "confidence": analysis.confidence,
-        "timestamp": analysis.timestamp
+        "timestamp": analysis.timestamp,
+        "stale": analysis.stale
     }
 
 
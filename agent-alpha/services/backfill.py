@@ -0,0 +1,300 @@
+"""
+Historical Backfill
+Downloads candle history for many symbols and intervals concurrently into
+the local candle store, within the provider's rate limit
+
+Usage:
+    python -m services.backfill --symbols ETH/USDT,BTC/USDT --intervals 1h,1d \\
+        --start 2021-01-01 --store data/candles --rate 10 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from .candle_store import CandleStore
+from .providers import MarketDataProvider, create_provider, interval_to_ms
+from .rate_limit import RateLimiter
+
+
+@dataclass
+class BackfillResult:
+    """Outcome for one (symbol, interval)"""
+    symbol: str
+    interval: str
+    candles: int = 0  # Candles downloaded in this run
+    requests: int = 0
+    stored: int = 0  # Candles in the store afterwards
+    resumed_from: Optional[int] = None  # Open time (ms) the run continued from
+    error: Optional[str] = None
+    elapsed_seconds: float = 0.0
+
+
+@dataclass
+class BackfillReport:
+    """Totals for a backfill run"""
+    elapsed_seconds: float
+    candles: int
+    requests: int
+    candles_per_second: float
+    requests_per_second: float
+    results: List[BackfillResult] = field(default_factory=list)
+
+
+class Backfiller:
+    """
+    Pages through provider history and merges it into a CandleStore
+
+    Each (symbol, interval) is paged oldest to newest by one worker; up to
+    `concurrency` of them run at once and share one rate limiter. Pages are
+    buffered and merged into the store every `flush_rows` candles, so an
+    interrupted run loses at most one buffer. A rerun continues after the
+    newest stored candle instead of starting over, and fills every hole
+    between start and that candle (history before the oldest stored one, or
+    gaps left by an interrupted run). Only closed candles (open time +
+    interval <= end) are stored.
+    """
+
+    def __init__(
+        self,
+        provider: MarketDataProvider,
+        store: CandleStore,
+        start: int,
+        end: Optional[int] = None,
+        limiter: Optional[RateLimiter] = None,
+        concurrency: int = 8,
+        page_size: int = 1000,
+        flush_rows: int = 200_000,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize backfiller
+
+        Args:
+            provider: Provider implementing fetch_candles_since
+            store: Destination candle store
+            start: Earliest candle open time (ms)
+            end: Latest candle close time (ms, default: now)
+            limiter: Rate limiter applied to every upstream request
+            concurrency: (symbol, interval) pairs downloaded at once
+            page_size: Candles requested per call
+            flush_rows: Buffered candles that trigger a store merge
+            clock: Wall-clock time source for the default end
+        """
+        self.provider = provider
+        self.store = store
+        self.start = start
+        self.end = end
+        self.limiter = limiter
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.flush_rows = flush_rows
+        self._clock = clock
+
+    async def run(
+        self,
+        symbols: List[str],
+        intervals: List[str],
+        on_result: Optional[Callable[[BackfillResult], None]] = None
+    ) -> BackfillReport:
+        """
+        Backfill every (symbol, interval) combination
+
+        Args:
+            symbols: Trading pairs
+            intervals: Candle intervals
+            on_result: Called as each pair finishes (e.g. to print progress)
+
+        Returns:
+            BackfillReport (failed pairs carry an error; the others still complete)
+        """
+        end = self.end if self.end is not None else int(self._clock() * 1000)
+        queue: asyncio.Queue = asyncio.Queue()
+        for symbol in symbols:
+            for interval in intervals:
+                queue.put_nowait((symbol, interval))
+        results: List[BackfillResult] = []
+
+        async def worker():
+            while not queue.empty():
+                symbol, interval = queue.get_nowait()
+                result = await self.backfill(symbol, interval, end)
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(max(1, self.concurrency))))
+        elapsed = time.perf_counter() - started
+
+        candles = sum(r.candles for r in results)
+        requests = sum(r.requests for r in results)
+        return BackfillReport(
+            elapsed_seconds=round(elapsed, 3),
+            candles=candles,
+            requests=requests,
+            candles_per_second=round(candles / elapsed, 1) if elapsed > 0 else 0.0,
+            requests_per_second=round(requests / elapsed, 2) if elapsed > 0 else 0.0,
+            results=sorted(results, key=lambda r: (r.symbol, r.interval)),
+        )
+
+    async def backfill(self, symbol: str, interval: str, end: int) -> BackfillResult:
+        """
+        Download one (symbol, interval) from start to end, skipping what is stored
+
+        Every missing run in the range is paged: history before the oldest
+        stored candle (e.g. after start was moved earlier), holes left by an
+        interrupted run, then the range after the newest stored candle.
+        """
+        result = BackfillResult(symbol=symbol, interval=interval)
+        started = time.perf_counter()
+        step = interval_to_ms(interval)
+        stored = await asyncio.to_thread(self.store.timestamps, symbol, interval)
+        result.stored = len(stored)
+
+        ranges = missing_ranges(stored, self.start, step)
+        if len(stored) and stored[-1] >= self.start:
+            result.resumed_from = int(stored[-1]) + step
+        ranges.append((result.resumed_from or self.start, end))
+
+        buffer: List[List] = []
+        try:
+            for since, until in ranges:
+                await self._page(symbol, interval, since, min(until, end - step + 1), buffer, result)
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        finally:
+            if buffer:
+                result.stored = await self._flush(symbol, interval, buffer)
+        result.elapsed_seconds = round(time.perf_counter() - started, 3)
+        return result
+
+    async def _page(
+        self,
+        symbol: str,
+        interval: str,
+        since: int,
+        until: int,
+        buffer: List[List],
+        result: BackfillResult
+    ):
+        """Page candles opening in [since, until) into the buffer"""
+        step = interval_to_ms(interval)
+        while since < until:
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            page = await self.provider.fetch_candles_since(symbol, interval, since, self.page_size)
+            result.requests += 1
+            page = [c for c in page if since <= c[0] < until]
+            if not page:
+                break
+            buffer.extend(page)
+            result.candles += len(page)
+            since = int(page[-1][0]) + step
+            if len(buffer) >= self.flush_rows:
+                result.stored = await self._flush(symbol, interval, buffer)
+
+    async def _flush(self, symbol: str, interval: str, buffer: List[List]) -> int:
+        stored = await asyncio.to_thread(self.store.write, symbol, interval, list(buffer))
+        buffer.clear()
+        return stored
+
+
+def missing_ranges(stored: np.ndarray, start: int, step: int) -> List[Tuple[int, int]]:
+    """
+    Runs of candles missing between start and the newest stored candle
+
+    Args:
+        stored: Stored open times (ms), sorted
+        start: Earliest open time wanted (ms)
+        step: Interval length (ms)
+
+    Returns:
+        (first missing open time, open time the run stops before), oldest first
+    """
+    stored = np.asarray(stored, dtype=np.int64)
+    stored = stored[stored >= start]
+    if len(stored) == 0:
+        return []
+    ranges = [(start, int(stored[0]))] if stored[0] > start else []
+    holes = np.flatnonzero(np.diff(stored) > step)
+    ranges += [(int(stored[i]) + step, int(stored[i + 1])) for i in holes]
+    return ranges
+
+
+def parse_time(value: str) -> int:
+    """Milliseconds since the epoch from an ISO date/time (UTC) or a raw ms value"""
+    if value.isdigit():
+        return int(value)
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+def default_symbols() -> List[str]:
+    """Every coin the CoinGecko mapping knows, quoted in USDT"""
+    from .coingecko import COIN_IDS
+    return [f"{coin}/USDT" for coin in COIN_IDS]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Backfill candle history into the local candle store")
+    parser.add_argument("--symbols", help="Comma-separated pairs (default: every mapped coin vs USDT)")
+    parser.add_argument("--intervals", default="1h", help="Comma-separated intervals")
+    parser.add_argument("--start", required=True, help="ISO date (UTC) or ms timestamp")
+    parser.add_argument("--end", help="ISO date (UTC) or ms timestamp (default: now)")
+    parser.add_argument("--store", default="data/candles", help="CandleStore directory")
+    parser.add_argument("--provider", default="binance", help="Provider with range fetches")
+    parser.add_argument("--rate", type=float, default=10.0, help="Upstream requests per second")
+    parser.add_argument("--concurrency", type=int, default=8, help="Pairs downloaded at once")
+    parser.add_argument("--page-size", type=int, default=1000, help="Candles per request")
+    parser.add_argument("--output", help="Write the report as JSON")
+    args = parser.parse_args(argv)
+
+    symbols = args.symbols.split(",") if args.symbols else default_symbols()
+    intervals = [interval for interval in args.intervals.split(",") if interval]
+    for interval in intervals:
+        interval_to_ms(interval)
+
+    def progress(result: BackfillResult):
+        status = f"error: {result.error}" if result.error else "ok"
+        print(f"{result.symbol:<12} {result.interval:<4} +{result.candles:>8} candles "
+              f"({result.stored} stored, {result.requests} requests, {result.elapsed_seconds:.1f}s) {status}")
+
+    async def run() -> BackfillReport:
+        provider = create_provider(args.provider)
+        try:
+            backfiller = Backfiller(
+                provider,
+                CandleStore(args.store),
+                start=parse_time(args.start),
+                end=parse_time(args.end) if args.end else None,
+                limiter=RateLimiter(args.rate, burst=max(1, int(args.rate))),
+                concurrency=args.concurrency,
+                page_size=args.page_size,
+            )
+            return await backfiller.run(symbols, intervals, on_result=progress)
+        finally:
+            await provider.close()
+
+    report = asyncio.run(run())
+    print(
+        f"{report.candles} candles in {report.requests} requests over {report.elapsed_seconds}s "
+        f"({report.candles_per_second} candles/s, {report.requests_per_second} req/s)"
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(asdict(report), f, indent=2)
+    if any(result.error for result in report.results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""
+Incremental Backtest Cache
+Keeps per-bar backtest state so new candles extend results instead of
+rescanning the whole history
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .candle_store import candles_to_array
+from .exits import find_exits
+from .indicator_engine import IndicatorParams
+from .indicators import wilder_smooth
+from .ring_buffer import CandleRing
+
+
+class IncrementalBacktest:
+    """
+    Backtest state for one sliding candle window
+
+    The state always describes the last window passed to update(), so its
+    results equal SignalGenerator._backtest_outcomes over that window and do
+    not depend on how many windows came before. Each update lines the new
+    window up with the cached one:
+
+    - Bars that slid off the front are dropped, and outcomes of signals
+      entered on them are un-counted. RSI is seeded at the window start, so
+      every Wilder average shifts: the recursion is linear, so the new
+      averages are the old ones plus a decaying correction (no re-run of the
+      recursion). The signal masks are then re-derived, and only signals
+      that appeared, disappeared or flipped are re-resolved. Outcomes of the
+      others only depend on the bars after their entry and are kept.
+    - A revised bar (e.g. the forming candle closed at a different price)
+      rewinds the state to that bar.
+    - New bars are appended and evaluated, which covers fresh signals plus
+      older signals whose lookahead window has just completed.
+
+    Candles are held in a CandleRing sized to the window, so memory stays
+    bounded however long the process runs.
+    """
+
+    def __init__(self, generator, params: Optional[IndicatorParams] = None):
+        """
+        Initialize empty backtest state
+
+        Args:
+            generator: SignalGenerator providing thresholds and signal rules
+            params: Indicator periods (must match the generator's backtest)
+        """
+        self.generator = generator
+        self.params = params or IndicatorParams()
+        self.ring = CandleRing(1)
+        self._reset()
+
+    def _reset(self):
+        self.ring.clear()
+        self.avg_gain = np.empty(0)  # Wilder averages per bar (NaN while warming up)
+        self.avg_loss = np.empty(0)
+        self.upper = np.empty(0)  # Bollinger bands per bar (NaN while warming up)
+        self.lower = np.empty(0)
+        self.direction = np.zeros(0, dtype=np.int8)  # 1 BUY_CALL, -1 BUY_PUT, 0 none
+        self.win = np.zeros(0, dtype=bool)
+
+        # Bars below this index have their outcome settled (or are never eligible)
+        self.resolved_until = self.generator.BACKTEST_MIN_LOOKBACK
+        self.wins = 0
+        self.total = 0
+
+    def __len__(self) -> int:
+        return len(self.ring)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.ring.column("timestamp")
+
+    @property
+    def closes(self) -> np.ndarray:
+        return self.ring.column("close")
+
+    @property
+    def outcomes(self) -> np.ndarray:
+        """Outcomes (True = win) of every settled signal, in time order"""
+        settled = self.direction[:self.resolved_until] != 0
+        return self.win[:self.resolved_until][settled]
+
+    def update(self, candles: List[List]) -> int:
+        """
+        Make the state describe a fresh candle window
+
+        Args:
+            candles: List of [timestamp, open, high, low, close, volume]
+
+        Returns:
+            Number of new or revised bars evaluated
+        """
+        if len(candles) == 0:
+            return 0
+
+        data = candles_to_array(candles)
+        merge = self._merge_point(data)
+        if merge is None:
+            self._reset()
+            drop, keep = 0, 0
+        else:
+            drop, keep = merge
+
+        if drop == 0 and keep == len(self) == len(data):
+            return 0
+
+        self._truncate(drop + keep)
+        if keep <= self.params.rsi_period:
+            # Too little overlap to re-seed from; rebuild the window
+            self._reset()
+            keep = 0
+        elif drop:
+            self._slide(drop)
+        self._append(data[keep:])
+        return len(data) - keep
+
+    def _merge_point(self, data: np.ndarray) -> Optional[Tuple[int, int]]:
+        """
+        How the incoming window lines up with the cached one
+
+        Returns:
+            (cached bars that slid off the front, overlapping bars that are
+            unchanged), or None if the window does not overlap the cache
+        """
+        if len(self) == 0:
+            return None
+
+        cached = self.ring.to_array()
+        pos = int(np.searchsorted(cached[:, 0], data[0, 0]))
+        if pos >= len(cached) or cached[pos, 0] != data[0, 0]:
+            return None
+
+        overlap = min(len(cached) - pos, len(data))
+        compared = [0, 2, 3, 4]  # timestamp, high, low, close
+        same = (cached[pos:pos + overlap, compared] == data[:overlap, compared]).all(axis=1)
+        keep = overlap if same.all() else int(np.argmin(same))
+        return pos, keep
+
+    def _truncate(self, keep: int):
+        """Drop state for bars >= keep and un-count outcomes that depend on them"""
+        lookahead = self.generator.exit_rules.max_bars
+        resolved = min(self.resolved_until, max(keep - lookahead, self.generator.BACKTEST_MIN_LOOKBACK))
+        if resolved < self.resolved_until:
+            self._uncount(slice(resolved, self.resolved_until))
+            self.resolved_until = resolved
+
+        self.ring.drop_newest(len(self) - keep)
+        for name in ("avg_gain", "avg_loss", "upper", "lower", "direction", "win"):
+            setattr(self, name, getattr(self, name)[:keep])
+
+    def _uncount(self, bars: slice):
+        signalled = self.direction[bars] != 0
+        self.total -= int(signalled.sum())
+        self.wins -= int(self.win[bars][signalled].sum())
+
+    def _slide(self, drop: int):
+        """Move the window start forward by `drop` bars"""
+        generator = self.generator
+        self._uncount(slice(0, min(drop, self.resolved_until)))
+        self.resolved_until = max(self.resolved_until - drop, 0)
+        self.ring.drop_oldest(drop)
+        for name in ("avg_gain", "avg_loss", "upper", "lower", "direction", "win"):
+            setattr(self, name, getattr(self, name)[drop:])
+
+        # Re-seed the Wilder averages at the new start. Both seedings follow
+        # avg[i] = a * avg[i-1] + (1 - a) * x[i], so they differ by a
+        # difference that decays by a per bar.
+        period = self.params.rsi_period
+        closes = self.closes
+        deltas = np.diff(closes[:period + 1])
+        decay = ((period - 1) / period) ** np.arange(len(closes) - period)
+        for averages, moves in (
+            (self.avg_gain, np.where(deltas > 0, deltas, 0)),
+            (self.avg_loss, np.where(deltas < 0, -deltas, 0)),
+        ):
+            averages[period:] += (np.mean(moves) - averages[period]) * decay
+            averages[:period] = np.nan
+        self.upper[:self.params.bb_period - 1] = np.nan
+        self.lower[:self.params.bb_period - 1] = np.nan
+
+        # Re-resolve settled signals whose direction changed with the new RSI
+        direction = self._directions(0, self.avg_gain, self.avg_loss, self.upper, self.lower)
+        changed = np.flatnonzero(direction[:self.resolved_until] != self.direction[:self.resolved_until])
+        if len(changed):
+            signalled = self.direction[changed] != 0
+            self.total -= int(signalled.sum())
+            self.wins -= int(self.win[changed][signalled].sum())
+        self.direction = direction
+        self.win[changed] = False
+        entries = changed[direction[changed] != 0]
+        if len(entries):
+            exits = self._exits(entries)
+            self.win[entries] = exits.wins
+            self.total += len(entries)
+            self.wins += int(exits.wins.sum())
+
+    def _append(self, data: np.ndarray):
+        """Add bars to the end of the window and evaluate them"""
+        if len(data) == 0:
+            return
+        start = len(self)
+        if start + len(data) > self.ring.capacity:
+            ring = CandleRing(start + len(data))
+            ring.extend(self.ring.to_array())
+            self.ring = ring
+        self.ring.extend(data)
+
+        closes = self.closes
+        length = len(closes)
+        new = length - start
+
+        avg_gain, avg_loss = self._extend_wilder(start)
+        self.avg_gain = np.concatenate([self.avg_gain, avg_gain])
+        self.avg_loss = np.concatenate([self.avg_loss, avg_loss])
+
+        period, std_dev = self.params.bb_period, self.params.bb_std_dev
+        upper = np.full(new, np.nan)
+        lower = np.full(new, np.nan)
+        first_band = max(start, period - 1)
+        if length > first_band:
+            windows = sliding_window_view(closes[first_band - period + 1:], period)
+            middle = windows.mean(axis=1)
+            std = windows.std(axis=1, ddof=1)
+            upper[first_band - start:] = middle + std_dev * std
+            lower[first_band - start:] = middle - std_dev * std
+        self.upper = np.concatenate([self.upper, upper])
+        self.lower = np.concatenate([self.lower, lower])
+
+        direction = self._directions(start, avg_gain, avg_loss, upper, lower)
+        self.direction = np.concatenate([self.direction, direction])
+        self.win = np.concatenate([self.win, np.zeros(new, dtype=bool)])
+
+        self._resolve()
+
+    def _directions(
+        self,
+        start: int,
+        avg_gain: np.ndarray,
+        avg_loss: np.ndarray,
+        upper: np.ndarray,
+        lower: np.ndarray
+    ) -> np.ndarray:
+        """Signal direction of bars [start, start + len(avg_gain))"""
+        generator = self.generator
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+        rsi = np.where(avg_loss == 0, 100.0, rsi)
+
+        buy_call, buy_put = generator.signal_masks(self.closes[start:], rsi, upper, lower)
+        direction = buy_call.astype(np.int8) - buy_put.astype(np.int8)
+        direction[:max(generator.BACKTEST_MIN_LOOKBACK - start, 0)] = 0
+        return direction
+
+    def _extend_wilder(self, start: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Wilder average gain/loss for bars [start, len), continuing cached state"""
+        period = self.params.rsi_period
+        closes = self.closes
+        if start > period:
+            deltas = np.diff(closes[start - 1:])
+            return (
+                wilder_smooth(np.where(deltas > 0, deltas, 0), period, previous=self.avg_gain[start - 1]),
+                wilder_smooth(np.where(deltas < 0, -deltas, 0), period, previous=self.avg_loss[start - 1]),
+            )
+
+        # Not seeded yet: smooth every delta (bar i ends with delta i - 1)
+        deltas = np.diff(closes)
+        avg_gain = wilder_smooth(np.where(deltas > 0, deltas, 0), period)
+        avg_loss = wilder_smooth(np.where(deltas < 0, -deltas, 0), period)
+        return np.concatenate([[np.nan], avg_gain])[start:], np.concatenate([[np.nan], avg_loss])[start:]
+
+    def _exits(self, entries: np.ndarray):
+        return find_exits(
+            self.closes, entries, self.direction[entries], self.generator.exit_rules,
+            highs=self.ring.column("high"), lows=self.ring.column("low")
+        )
+
+    def _resolve(self):
+        """Settle outcomes for signals whose exit window is now complete"""
+        end = len(self) - self.generator.exit_rules.max_bars
+        if end <= self.resolved_until:
+            return
+
+        entries = self.resolved_until + np.flatnonzero(self.direction[self.resolved_until:end])
+        exits = self._exits(entries)
+        self.win[entries] = exits.wins
+        self.total += len(entries)
+        self.wins += int(exits.wins.sum())
+        self.resolved_until = end
+
+
+class BacktestCache:
+    """LRU cache of IncrementalBacktest state keyed by (symbol, interval, params)"""
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize backtest cache
+
+        Args:
+            max_entries: Histories kept before the least recently used is dropped
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, IncrementalBacktest]" = OrderedDict()
+        self.stats: Dict[str, int] = {"updates": 0, "bars_evaluated": 0, "evictions": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def outcomes(self, key: Tuple, candles: List[List], generator) -> np.ndarray:
+        """
+        Backtest outcomes for a candle window, updating the cached state for its key
+
+        Args:
+            key: Identifies the history, e.g. (symbol, interval)
+            candles: Latest candle window for that history
+            generator: SignalGenerator whose params are part of the cache key
+
+        Returns:
+            Boolean array of settled signal outcomes in time order
+        """
+        full_key = (*key, generator.params)
+        state = self._entries.get(full_key)
+        if state is None:
+            state = IncrementalBacktest(generator)
+            self._entries[full_key] = state
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        self._entries.move_to_end(full_key)
+
+        self.stats["updates"] += 1
+        self.stats["bars_evaluated"] += state.update(candles)
+        return state.outcomes
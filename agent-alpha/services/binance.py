@@ -3,18 +3,54 @@ Binance Market Data Service
 Fetches OHLCV data using ccxt library
 """
 
-import ccxt.async_support as ccxt
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import asyncio
 import time
 import random
 import os
 
+from .rate_limit import RateLimiter
+from .retry import RetryableError, RetryPolicy, parse_retry_after
+
 
 class BinanceService:
     """Service for fetching market data from Binance"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        mock_fallback: bool = True,
+        base_url: Optional[str] = None,
+        min_request_interval: Optional[float] = None,
+        retry: Optional[RetryPolicy] = None
+    ):
+        """
+        Initialize Binance service
+        
+        Args:
+            mock_fallback: Return generated mock data when the exchange call fails
+                (development aid); when False, errors are raised to the caller
+            base_url: Spot API host to use instead of api.binance.com (default:
+                BINANCE_BASE_URL), e.g. a local stand-in for load tests
+            min_request_interval: Seconds between klines requests (default:
+                BINANCE_MIN_INTERVAL or 0.05)
+            retry: Retry policy for throttled and failed requests (default:
+                from RETRY_* env, sharing this service's rate limiter); mock
+                fallback only happens once it gives up
+        """
+        self.mock_fallback = mock_fallback
+        base_url = base_url or os.getenv('BINANCE_BASE_URL')
+        
+        if min_request_interval is None:
+            min_request_interval = float(os.getenv('BINANCE_MIN_INTERVAL', '0.05'))
+        # Shared by every klines request, so a Retry-After pause holds all callers
+        self.limiter = RateLimiter(1 / min_request_interval) if min_request_interval > 0 else None
+        self.retry = retry or RetryPolicy.from_env(self.limiter)
+        
+        # ccxt is large; import it only when a Binance client is actually built
+        import ccxt.async_support as ccxt
+        # Throttling (429/418), 5xx and timeouts all derive from NetworkError
+        self._transient_error = ccxt.NetworkError
+        
         # Check if API keys are available
         api_key = os.getenv('BINANCE_API_KEY')
         secret_key = os.getenv('BINANCE_SECRET_KEY')
@@ -39,6 +75,40 @@ class BinanceService:
                 }
             })
             print("⚠️  No Binance API keys found. Using mock data for development.")
+        
+        if base_url:
+            base_url = base_url.rstrip('/')
+            self.exchange.urls['api']['public'] = f"{base_url}/api/v3"
+            self.exchange.urls['api']['private'] = f"{base_url}/api/v3"
+            # Futures markets live on other hosts; only spot is served there
+            self.exchange.options['fetchMarkets'] = {'types': ['spot']}
+    
+    async def _fetch_ohlcv(self, symbol: str, timeframe: str, since: Optional[int] = None, limit: Optional[int] = None) -> List[List]:
+        """One klines request through the retry policy"""
+        return await self.retry.call(self._fetch_ohlcv_once, symbol, timeframe, since, limit)
+    
+    async def _fetch_ohlcv_once(self, symbol: str, timeframe: str, since: Optional[int], limit: Optional[int]) -> List[List]:
+        try:
+            return await self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+        except self._transient_error as e:
+            headers = getattr(self.exchange, 'last_response_headers', None) or {}
+            retry_after = next((v for k, v in headers.items() if k.lower() == 'retry-after'), None)
+            retry_after = parse_retry_after(retry_after)
+            status = self._status(e)
+            if status == 418:
+                # An IP ban: retrying would only extend it. Hold every other
+                # caller off until it lifts and fail this one.
+                if retry_after and self.limiter is not None:
+                    self.limiter.pause(retry_after)
+                raise
+            raise RetryableError(f"Binance API error: {e}", status=status, retry_after=retry_after) from e
+    
+    def _status(self, error: Exception) -> Optional[int]:
+        """HTTP status in a ccxt throttling error ("binance 429 Too Many Requests ...")"""
+        parts = str(error).split(' ', 2)
+        if len(parts) > 1 and parts[0] == self.exchange.id and parts[1].isdigit():
+            return int(parts[1])
+        return None
     
     async def fetch_ohlcv(
         self,
@@ -67,7 +137,7 @@ class BinanceService:
                 
                 while remaining > 0:
                     batch_size = min(remaining, 1000)
-                    candles = await self.exchange.fetch_ohlcv(
+                    candles = await self._fetch_ohlcv(
                         symbol,
                         timeframe,
                         since=since,
@@ -83,19 +153,50 @@ class BinanceService:
                     # Set since to after the last candle
                     if candles:
                         since = candles[-1][0] + 1
-                    
-                    # Rate limiting
-                    await asyncio.sleep(0.1)
                 
                 return all_candles[-limit:]  # Return only requested amount
             else:
-                candles = await self.exchange.fetch_ohlcv(
+                candles = await self._fetch_ohlcv(
                     symbol,
                     timeframe,
                     limit=limit
                 )
                 return candles
         except Exception as e:
+            if not self.mock_fallback:
+                raise
+            print(f"⚠️  Binance API error: {str(e)}. Falling back to mock data.")
+            return self._generate_mock_ohlcv(symbol, timeframe, limit)
+    
+    async def fetch_ohlcv_since(
+        self,
+        symbol: str = "ETH/USDT",
+        timeframe: str = "1h",
+        since: int = 0,
+        limit: int = 1000
+    ) -> List[List]:
+        """
+        Fetch one page of OHLCV data starting at a point in time
+        
+        Args:
+            symbol: Trading pair (e.g., "ETH/USDT")
+            timeframe: Candle interval
+            since: Earliest candle open time (ms)
+            limit: Number of candles to fetch (max 1000)
+        
+        Returns:
+            List of [timestamp, open, high, low, close, volume], oldest first
+        """
+        try:
+            return await self._fetch_ohlcv(
+                symbol,
+                timeframe,
+                since=since,
+                limit=min(limit, 1000)
+            )
+        except Exception as e:
+            if not self.mock_fallback:
+                raise
             print(f"⚠️  Binance API error: {str(e)}. Falling back to mock data.")
             return self._generate_mock_ohlcv(symbol, timeframe, limit)
     
@@ -120,6 +221,8 @@ class BinanceService:
                 "timestamp": ticker["timestamp"]
             }
         except Exception as e:
+            if not self.mock_fallback:
+                raise
             print(f"⚠️  Binance API error: {str(e)}. Falling back to mock data.")
             return self._generate_mock_ticker(symbol)
     
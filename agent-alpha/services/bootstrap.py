@@ -0,0 +1,74 @@
+"""
+Bootstrap Resampling
+Confidence intervals for backtest win rates
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass
+class WinRateInterval:
+    """Bootstrap confidence interval for a win rate (percentages)"""
+    win_rate: float  # Observed win rate (0 when there are no outcomes)
+    lower: float
+    upper: float
+    samples: int  # Number of observed outcomes
+    confidence: float  # Interval coverage, e.g. 0.95
+
+
+def bootstrap_win_rate(
+    outcomes: np.ndarray,
+    n_resamples: int = 5000,
+    confidence: float = 0.95,
+    prior_wins: int = 1,
+    prior_losses: int = 1,
+    seed: Optional[int] = None
+) -> WinRateInterval:
+    """
+    Percentile bootstrap interval for the win rate of binary outcomes
+
+    The outcomes are padded with pseudo-observations (one win and one loss by
+    default) so that tiny samples such as a single win do not collapse to a
+    zero-width 100% interval. Resampling n binary outcomes with replacement
+    and counting wins is exactly a Binomial(n, wins / n) draw, so all
+    resamples are drawn in one vectorized call.
+
+    Args:
+        outcomes: Boolean array, True for a winning signal
+        n_resamples: Number of bootstrap resamples
+        confidence: Interval coverage in (0, 1)
+        prior_wins: Pseudo-wins added before resampling
+        prior_losses: Pseudo-losses added before resampling
+        seed: Random seed for reproducible intervals
+
+    Returns:
+        WinRateInterval
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+
+    outcomes = np.asarray(outcomes, dtype=bool)
+    observed = len(outcomes)
+    wins = int(outcomes.sum())
+
+    n = observed + prior_wins + prior_losses
+    if n == 0:
+        return WinRateInterval(0.0, 0.0, 100.0, 0, confidence)
+
+    rng = np.random.default_rng(seed)
+    resampled = rng.binomial(n, (wins + prior_wins) / n, size=n_resamples) / n * 100
+
+    tail = (1 - confidence) / 2 * 100
+    lower, upper = np.percentile(resampled, [tail, 100 - tail])
+    win_rate = wins / observed * 100 if observed else 0.0
+
+    return WinRateInterval(
+        win_rate=float(win_rate),
+        lower=float(lower),
+        upper=float(upper),
+        samples=observed,
+        confidence=confidence
+    )
@@ -0,0 +1,111 @@
+"""
+Local Candle Store
+Columnar on-disk candle history, one .npz file per (symbol, interval)
+"""
+
+import os
+from typing import List, Tuple
+
+import numpy as np
+
+
+COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+
+def candles_to_array(candles) -> np.ndarray:
+    """Candles as a float (N, 6) array of [timestamp, open, high, low, close, volume]"""
+    if len(candles) == 0:
+        return np.empty((0, 6))
+    return np.asarray(candles, dtype=float).reshape(len(candles), 6)
+
+
+def array_to_candles(data: np.ndarray) -> List[List]:
+    """Candle rows from a float array, with integer timestamps as providers return them"""
+    return [[int(row[0]), *row[1:]] for row in np.asarray(data).tolist()]
+
+
+class CandleStore:
+    """
+    Candle history stored column by column
+
+    Each (symbol, interval) lives in <root>/<SYMBOL>/<interval>.npz with one
+    array per OHLCV column, sorted by timestamp and without duplicates.
+    Writes merge with what is already stored and replace the file
+    atomically.
+    """
+
+    def __init__(self, root: str):
+        """
+        Initialize candle store
+
+        Args:
+            root: Directory holding the store
+        """
+        self.root = root
+
+    def path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, symbol.replace("/", "_"), f"{interval}.npz")
+
+    def exists(self, symbol: str, interval: str) -> bool:
+        return os.path.exists(self.path(symbol, interval))
+
+    def load(self, symbol: str, interval: str) -> np.ndarray:
+        """
+        Stored candles as an (N, 6) array (empty if nothing is stored)
+        """
+        path = self.path(symbol, interval)
+        if not os.path.exists(path):
+            return np.empty((0, 6))
+        with np.load(path) as data:
+            return np.column_stack([data[column].astype(float) for column in COLUMNS])
+
+    def timestamps(self, symbol: str, interval: str) -> np.ndarray:
+        """Stored open times (ms) only, without loading the price columns"""
+        path = self.path(symbol, interval)
+        if not os.path.exists(path):
+            return np.empty(0, dtype=np.int64)
+        with np.load(path) as data:
+            return data["timestamp"]
+
+    def write(self, symbol: str, interval: str, candles) -> int:
+        """
+        Merge candles into the stored history
+
+        Candles with a timestamp already stored replace the stored ones.
+
+        Args:
+            symbol: Trading pair, e.g. "ETH/USDT"
+            interval: Candle interval, e.g. "1h"
+            candles: List or array of [timestamp, open, high, low, close, volume]
+
+        Returns:
+            Number of candles stored after the merge
+        """
+        merged = np.concatenate([self.load(symbol, interval), candles_to_array(candles)])
+        # Keep the last occurrence of each timestamp (new data wins)
+        reversed_ts = merged[::-1, 0]
+        _, first = np.unique(reversed_ts, return_index=True)
+        merged = merged[len(merged) - 1 - first]
+
+        path = self.path(symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp = f"{path}.tmp.npz"
+        columns = {name: merged[:, i] for i, name in enumerate(COLUMNS)}
+        columns["timestamp"] = columns["timestamp"].astype(np.int64)
+        np.savez(temp, **columns)
+        os.replace(temp, path)
+        return len(merged)
+
+    def entries(self) -> List[Tuple[str, str]]:
+        """(symbol, interval) pairs present in the store"""
+        found = []
+        if not os.path.isdir(self.root):
+            return found
+        for directory in sorted(os.listdir(self.root)):
+            folder = os.path.join(self.root, directory)
+            if not os.path.isdir(folder):
+                continue
+            for name in sorted(os.listdir(folder)):
+                if name.endswith(".npz") and ".tmp" not in name:
+                    found.append((directory.replace("_", "/"), name[:-len(".npz")]))
+        return found
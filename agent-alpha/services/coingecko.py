@@ -6,7 +6,10 @@ Fetches price and OHLC data from CoinGecko API (free tier)
 import aiohttp
 from typing import List, Dict, Optional
 import asyncio
-import time
+import os
+
+from .rate_limit import RateLimiter
+from .retry import RETRYABLE_STATUSES, RetryableError, RetryPolicy, parse_retry_after
 
 
 # Coin ID mapping for CoinGecko
@@ -23,33 +26,62 @@ COIN_IDS = {
     'OP': 'optimism',
 }
 
-COINGECKO_BASE = 'https://api.coingecko.com/api/v3'
+# Overridable so load tests can point at a local stand-in (services/fake_upstream.py)
+COINGECKO_BASE = os.getenv('COINGECKO_BASE_URL', 'https://api.coingecko.com/api/v3')
 
 
 class CoinGeckoService:
     """Service for fetching market data from CoinGecko"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        min_request_interval: Optional[float] = None,
+        retry: Optional[RetryPolicy] = None
+    ):
         """
         Initialize CoinGecko service
         
         Args:
             api_key: Optional API key for higher rate limits (Pro tier)
+            base_url: API root (default: COINGECKO_BASE_URL or the public API)
+            min_request_interval: Seconds between requests (default:
+                COINGECKO_MIN_INTERVAL or 1.5 for the free tier)
+            retry: Retry policy for throttled and failed requests (default:
+                from RETRY_* env, sharing this service's rate limiter)
         """
         self.api_key = api_key
+        self.base_url = (base_url or COINGECKO_BASE).rstrip('/')
         self.headers = {}
         if api_key:
             self.headers['x-cg-demo-api-key'] = api_key
         
-        self._last_request_time = 0
-        self._min_request_interval = 1.5  # 1.5 seconds between requests for free tier
+        if min_request_interval is None:
+            min_request_interval = float(os.getenv('COINGECKO_MIN_INTERVAL', '1.5'))
+        # 1.5 seconds between requests for free tier; every attempt, retries included, takes a slot
+        self.limiter = RateLimiter(1 / min_request_interval) if min_request_interval > 0 else None
+        self.retry = retry or RetryPolicy.from_env(self.limiter)
     
-    async def _rate_limit(self):
-        """Ensure we don't exceed rate limits"""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self._min_request_interval:
-            await asyncio.sleep(self._min_request_interval - elapsed)
-        self._last_request_time = time.time()
+    async def _get_json(self, url: str, params: Dict):
+        """GET a JSON document, retrying throttling and transient failures"""
+        return await self.retry.call(self._request_json, url, params)
+    
+    async def _request_json(self, url: str, params: Dict):
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url, params=params, headers=self.headers) as response:
+                    if response.status in RETRYABLE_STATUSES:
+                        raise RetryableError(
+                            f"CoinGecko API error: {response.status}",
+                            status=response.status,
+                            retry_after=parse_retry_after(response.headers.get('Retry-After'))
+                        )
+                    if response.status != 200:
+                        raise Exception(f"CoinGecko API error: {response.status}")
+                    return await response.json()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            raise RetryableError(f"CoinGecko connection error: {e!r}") from e
     
     def _get_coin_id(self, symbol: str) -> str:
         """Convert symbol to CoinGecko coin ID"""
@@ -67,10 +99,9 @@ class CoinGeckoService:
         Returns:
             Dict with price data
         """
-        await self._rate_limit()
         coin_id = self._get_coin_id(symbol)
         
-        url = f"{COINGECKO_BASE}/simple/price"
+        url = f"{self.base_url}/simple/price"
         params = {
             'ids': coin_id,
             'vs_currencies': 'usd',
@@ -79,23 +110,18 @@ class CoinGeckoService:
             'include_market_cap': 'true'
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, headers=self.headers) as response:
-                if response.status != 200:
-                    raise Exception(f"CoinGecko API error: {response.status}")
-                
-                data = await response.json()
-                
-                if coin_id not in data:
-                    raise Exception(f"Coin {symbol} not found")
-                
-                return {
-                    'symbol': symbol,
-                    'price': data[coin_id]['usd'],
-                    'change_24h': data[coin_id].get('usd_24h_change', 0),
-                    'volume_24h': data[coin_id].get('usd_24h_vol', 0),
-                    'market_cap': data[coin_id].get('usd_market_cap', 0),
-                }
+        data = await self._get_json(url, params)
+        
+        if coin_id not in data:
+            raise Exception(f"Coin {symbol} not found")
+        
+        return {
+            'symbol': symbol,
+            'price': data[coin_id]['usd'],
+            'change_24h': data[coin_id].get('usd_24h_change', 0),
+            'volume_24h': data[coin_id].get('usd_24h_vol', 0),
+            'market_cap': data[coin_id].get('usd_market_cap', 0),
+        }
     
     async def fetch_ohlc(
         self,
@@ -112,36 +138,30 @@ class CoinGeckoService:
         Returns:
             List of [timestamp, open, high, low, close]
         """
-        await self._rate_limit()
         coin_id = self._get_coin_id(symbol)
         
-        url = f"{COINGECKO_BASE}/coins/{coin_id}/ohlc"
+        url = f"{self.base_url}/coins/{coin_id}/ohlc"
         params = {
             'vs_currency': 'usd',
             'days': str(days)
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, headers=self.headers) as response:
-                if response.status != 200:
-                    raise Exception(f"CoinGecko API error: {response.status}")
-                
-                data = await response.json()
-                
-                # CoinGecko returns [timestamp, open, high, low, close]
-                # Convert to standard OHLCV format (add 0 volume)
-                ohlcv = []
-                for candle in data:
-                    ohlcv.append([
-                        candle[0],  # timestamp
-                        candle[1],  # open
-                        candle[2],  # high
-                        candle[3],  # low
-                        candle[4],  # close
-                        0           # volume (not provided by OHLC endpoint)
-                    ])
-                
-                return ohlcv
+        data = await self._get_json(url, params)
+        
+        # CoinGecko returns [timestamp, open, high, low, close]
+        # Convert to standard OHLCV format (add 0 volume)
+        ohlcv = []
+        for candle in data:
+            ohlcv.append([
+                candle[0],  # timestamp
+                candle[1],  # open
+                candle[2],  # high
+                candle[3],  # low
+                candle[4],  # close
+                0           # volume (not provided by OHLC endpoint)
+            ])
+        
+        return ohlcv
     
     async def fetch_market_chart(
         self,
@@ -158,22 +178,15 @@ class CoinGeckoService:
         Returns:
             Dict with prices, market_caps, total_volumes arrays
         """
-        await self._rate_limit()
         coin_id = self._get_coin_id(symbol)
         
-        url = f"{COINGECKO_BASE}/coins/{coin_id}/market_chart"
+        url = f"{self.base_url}/coins/{coin_id}/market_chart"
         params = {
             'vs_currency': 'usd',
             'days': str(days)
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, headers=self.headers) as response:
-                if response.status != 200:
-                    raise Exception(f"CoinGecko API error: {response.status}")
-                
-                data = await response.json()
-                return data
+        return await self._get_json(url, params)
     
     async def fetch_market_data(self, symbol: str) -> Dict:
         """
@@ -185,10 +198,9 @@ class CoinGeckoService:
         Returns:
             Dict with comprehensive market data
         """
-        await self._rate_limit()
         coin_id = self._get_coin_id(symbol)
         
-        url = f"{COINGECKO_BASE}/coins/markets"
+        url = f"{self.base_url}/coins/markets"
         params = {
             'vs_currency': 'usd',
             'ids': coin_id,
@@ -198,17 +210,12 @@ class CoinGeckoService:
             'sparkline': 'false'
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, headers=self.headers) as response:
-                if response.status != 200:
-                    raise Exception(f"CoinGecko API error: {response.status}")
-                
-                data = await response.json()
-                
-                if not data:
-                    raise Exception(f"Coin {symbol} not found")
-                
-                return data[0]
+        data = await self._get_json(url, params)
+        
+        if not data:
+            raise Exception(f"Coin {symbol} not found")
+        
+        return data[0]
     
     async def close(self):
         """Cleanup resources"""
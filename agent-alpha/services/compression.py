@@ -0,0 +1,148 @@
+"""
+Response Compression
+Accept-Encoding negotiation and serialized, precompressed response bodies
+cached by ETag
+"""
+
+import gzip
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from .memory_cache import SizedCache
+
+try:
+    import brotli
+except ImportError:  # Optional: pip install brotli
+    brotli = None
+
+
+GZIP = "gzip"
+BROTLI = "br"
+IDENTITY = "identity"
+
+# Bodies smaller than this are sent uncompressed (headers would eat the gain)
+MIN_COMPRESS_SIZE = 1024
+
+
+def available_encodings() -> List[str]:
+    """Encodings this process can produce, most preferred first"""
+    return ([BROTLI] if brotli is not None else []) + [GZIP]
+
+
+def negotiate(accept_encoding: Optional[str], encodings: Optional[List[str]] = None) -> str:
+    """
+    Pick a content coding for an Accept-Encoding header
+
+    Args:
+        accept_encoding: Raw header value, e.g. "gzip, br;q=0.9, *;q=0"
+        encodings: Candidates, most preferred first (default: available_encodings())
+
+    Returns:
+        The candidate with the highest q-value (ties go to the earlier one),
+        or "identity" when the client accepts none of them
+    """
+    if not accept_encoding:
+        return IDENTITY
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+
+    best, best_q = IDENTITY, 0.0
+    for encoding in encodings if encodings is not None else available_encodings():
+        q = weights.get(encoding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Encode a body with gzip, br or identity"""
+    if encoding == GZIP:
+        # mtime=0 keeps the output deterministic for equal bodies
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    if encoding == BROTLI:
+        if brotli is None:
+            raise ValueError("brotli is not installed")
+        return brotli.compress(body, quality=5)
+    if encoding == IDENTITY:
+        return body
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class CompressedBodies:
+    """
+    Serialized response bodies and their compressed forms
+
+    Entries live in the shared SizedCache next to the snapshot they were
+    rendered from, one per resource key, tagged with the ETag of the
+    representation. While the ETag is unchanged, a request is answered from
+    the stored bytes without re-serializing or re-compressing; a new ETag
+    replaces the entry. Each encoding is produced once, on first request.
+    """
+
+    def __init__(self, cache: SizedCache, min_size: int = MIN_COMPRESS_SIZE):
+        """
+        Initialize body cache
+
+        Args:
+            cache: Cache the bodies are stored in (keys start with the symbol)
+            min_size: Smallest body worth compressing
+        """
+        self.cache = cache
+        self.min_size = min_size
+        self.stats: Dict[str, int] = {
+            "renders": 0,  # Bodies serialized
+            "compressions": 0,
+            "hits": 0,  # Requests answered from stored bytes
+            "bytes_in": 0,  # Uncompressed size of compressed bodies
+            "bytes_out": 0,
+        }
+
+    def get(self, key: Hashable, etag: str, encoding: str, render: Callable[[], bytes]) -> Tuple[bytes, str]:
+        """
+        Body for a representation in the requested encoding
+
+        Args:
+            key: Cache key of the resource, e.g. (symbol, interval, "candles-body", limit)
+            etag: Current validator of the resource
+            encoding: Result of negotiate()
+            render: Builds the uncompressed body (called only on a miss)
+
+        Returns:
+            (body, encoding actually used); small bodies stay uncompressed
+        """
+        cached = self.cache.get(key)
+        if cached is not None and cached[0] == etag:
+            bodies = cached[1]
+        else:
+            bodies = {IDENTITY: render()}
+            self.stats["renders"] += 1
+
+        identity = bodies[IDENTITY]
+        if len(identity) < self.min_size:
+            encoding = IDENTITY
+        if encoding in bodies:
+            if cached is not None and cached[1] is bodies:
+                self.stats["hits"] += 1
+            else:
+                self.cache.put(key, (etag, bodies))
+            return bodies[encoding], encoding
+
+        body = compress(identity, encoding)
+        self.stats["compressions"] += 1
+        self.stats["bytes_in"] += len(identity)
+        self.stats["bytes_out"] += len(body)
+        bodies = {**bodies, encoding: body}
+        self.cache.put(key, (etag, bodies))
+        return body, encoding
@@ -0,0 +1,168 @@
+"""
+Exit Rule Engine
+Finds the first take-profit, stop-loss or time exit for every signal at once
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+# Exit reason codes, indexes into EXIT_REASONS
+EXIT_OPEN = 0  # No barrier hit and the holding window has not finished yet
+EXIT_TAKE_PROFIT = 1
+EXIT_STOP_LOSS = 2
+EXIT_TIME = 3
+EXIT_REASONS = ("open", "take_profit", "stop_loss", "time")
+
+
+@dataclass(frozen=True)
+class ExitRules:
+    """
+    When a position opened at a signal bar's close is closed
+
+    Barriers are fractions of the entry price in the trade's direction: a
+    long takes profit above entry * (1 + take_profit) and stops out below
+    entry * (1 - stop_loss); a short mirrors that. A barrier counts as hit
+    when the price moves strictly beyond it. Without a hit the position is
+    closed at the close of bar entry + max_bars.
+    """
+    take_profit: Optional[float] = 0.01  # None disables the take-profit
+    stop_loss: Optional[float] = None  # None disables the stop-loss
+    max_bars: int = 24  # Holding window after the entry bar
+    trigger: str = "close"  # "close", or "high_low" to use each bar's extremes
+
+    def __post_init__(self):
+        if self.trigger not in ("close", "high_low"):
+            raise ValueError(f"Unknown exit trigger: {self.trigger}")
+        if self.max_bars < 1:
+            raise ValueError("max_bars must be at least 1")
+
+
+@dataclass
+class ExitResult:
+    """Exit of each signal, aligned with the entries passed to find_exits"""
+    exit_bar: np.ndarray  # Bar index of the exit, -1 while still open
+    reason: np.ndarray  # EXIT_* code per signal
+    exit_price: np.ndarray  # NaN while still open
+    returns: np.ndarray  # Signed trade return (positive = profit), NaN while open
+
+    @property
+    def reasons(self) -> np.ndarray:
+        """Exit reasons as strings"""
+        return np.asarray(EXIT_REASONS)[self.reason]
+
+    @property
+    def wins(self) -> np.ndarray:
+        """True where the take-profit was hit"""
+        return self.reason == EXIT_TAKE_PROFIT
+
+
+def find_exits(
+    closes: np.ndarray,
+    entries: np.ndarray,
+    directions: np.ndarray,
+    rules: ExitRules = ExitRules(),
+    highs: Optional[np.ndarray] = None,
+    lows: Optional[np.ndarray] = None
+) -> ExitResult:
+    """
+    First barrier hit for every signal
+
+    All signals are evaluated together on a (signals x max_bars) matrix of
+    the bars after each entry. When both barriers are crossed on the same
+    bar (possible with the high_low trigger), the stop-loss is assumed to
+    come first. With the high_low trigger a barrier exit fills at the
+    barrier price; otherwise exits fill at the bar's close.
+
+    Args:
+        closes: Close prices
+        entries: Bar index of each signal (entry at that bar's close)
+        directions: 1 for a long (BUY_CALL), -1 for a short (BUY_PUT)
+        rules: Exit rules
+        highs: High prices (required for the high_low trigger)
+        lows: Low prices (required for the high_low trigger)
+
+    Returns:
+        ExitResult
+    """
+    closes = np.asarray(closes, dtype=float)
+    entries = np.asarray(entries, dtype=np.intp)
+    directions = np.asarray(directions)
+    n, count = len(closes), len(entries)
+
+    if rules.trigger == "high_low":
+        if highs is None or lows is None:
+            raise ValueError("high_low trigger requires highs and lows")
+        highs, lows = np.asarray(highs, dtype=float), np.asarray(lows, dtype=float)
+    else:
+        highs = lows = closes
+
+    # Bars after each entry; positions past the end of the data are masked out
+    bars = entries[:, None] + np.arange(1, rules.max_bars + 1)
+    valid = bars < n
+    bars = np.minimum(bars, n - 1)
+
+    long = (directions == 1)[:, None]
+    entry_price = closes[entries]
+    favourable = np.where(long, highs[bars], lows[bars])
+    adverse = np.where(long, lows[bars], highs[bars])
+
+    tp_hit = _crossed(favourable, entry_price, rules.take_profit, long, valid)
+    sl_hit = _crossed(adverse, entry_price, -rules.stop_loss if rules.stop_loss is not None else None,
+                      long, valid)
+
+    never = rules.max_bars
+    first_tp = np.where(tp_hit.any(axis=1), tp_hit.argmax(axis=1), never)
+    first_sl = np.where(sl_hit.any(axis=1), sl_hit.argmax(axis=1), never)
+
+    exit_offset = np.full(count, never)
+    reason = np.full(count, EXIT_OPEN, dtype=np.int8)
+
+    stopped = (first_sl < never) & (first_sl <= first_tp)
+    profited = (first_tp < never) & ~stopped
+    timed = ~stopped & ~profited & valid[:, -1]
+
+    exit_offset[stopped] = first_sl[stopped]
+    exit_offset[profited] = first_tp[profited]
+    exit_offset[timed] = never - 1
+    reason[stopped] = EXIT_STOP_LOSS
+    reason[profited] = EXIT_TAKE_PROFIT
+    reason[timed] = EXIT_TIME
+
+    closed = reason != EXIT_OPEN
+    rows = np.arange(count)
+    exit_bar = np.where(closed, bars[rows, np.minimum(exit_offset, never - 1)], -1)
+    exit_price = np.where(closed, closes[np.maximum(exit_bar, 0)], np.nan)
+
+    if rules.trigger == "high_low":
+        sign = np.where(directions == 1, 1.0, -1.0)
+        if rules.take_profit is not None:
+            exit_price[profited] = entry_price[profited] * (1 + sign[profited] * rules.take_profit)
+        if rules.stop_loss is not None:
+            exit_price[stopped] = entry_price[stopped] * (1 - sign[stopped] * rules.stop_loss)
+
+    returns = np.where(directions == 1, 1.0, -1.0) * (exit_price / entry_price - 1)
+    return ExitResult(exit_bar=exit_bar, reason=reason, exit_price=exit_price, returns=returns)
+
+
+def _crossed(
+    prices: np.ndarray,
+    entry_price: np.ndarray,
+    move: Optional[float],
+    long: np.ndarray,
+    valid: np.ndarray
+) -> np.ndarray:
+    """
+    Where prices move strictly beyond entry * (1 + move) in the trade's
+    direction (move > 0) or against it (move < 0)
+    """
+    if move is None:
+        return np.zeros(prices.shape, dtype=bool)
+
+    up = np.where(long, move > 0, move < 0)  # Barrier lies above the entry
+    level = np.where(
+        long, entry_price[:, None] * (1 + move), entry_price[:, None] * (1 - move)
+    )
+    return np.where(up, prices > level, prices < level) & valid
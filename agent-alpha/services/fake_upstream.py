@@ -0,0 +1,303 @@
+"""
+Fake Market Data Upstream
+Local stand-in for the CoinGecko and Binance endpoints Agent Alpha calls,
+with configurable latency, errors and 429 responses, for load testing
+
+Usage:
+    python -m services.fake_upstream --port 8100 --latency-ms 80 --error-rate 0.01 --throttle-rate 0.05
+
+Then start the API against it:
+    COINGECKO_BASE_URL=http://127.0.0.1:8100 COINGECKO_MIN_INTERVAL=0 uvicorn main:app
+    MARKET_DATA_PROVIDER=binance BINANCE_BASE_URL=http://127.0.0.1:8100 uvicorn main:app
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+from aiohttp import web
+
+from .coingecko import COIN_IDS
+from .providers import DAY_MS, INTERVAL_MS
+
+
+BASE_PRICES = {"bitcoin": 60000.0, "ethereum": 3000.0, "solana": 150.0}
+DEFAULT_BASE_PRICE = 10.0
+
+
+@dataclass
+class FakeUpstreamConfig:
+    """How the fake upstream misbehaves"""
+    latency_ms: float = 0.0  # Added to every response
+    jitter_ms: float = 0.0  # Uniform extra latency in [0, jitter_ms]
+    error_rate: float = 0.0  # Fraction of requests answered with HTTP 500
+    throttle_rate: float = 0.0  # Fraction of requests answered with HTTP 429
+    requests_per_second: Optional[float] = None  # Hard rate limit; excess requests get 429
+    retry_after: int = 1  # Retry-After header (seconds) on 429 responses
+    seed: Optional[int] = None  # Seed for latency/error draws
+
+
+def _coin_for_pair(pair: str) -> str:
+    """Binance symbol (ETHUSDT) or coin id (ethereum) -> coin id"""
+    for quote in ("USDT", "BUSD", "USDC", "USD"):
+        if pair.upper().endswith(quote) and len(pair) > len(quote):
+            base = pair.upper()[:-len(quote)]
+            return COIN_IDS.get(base, base.lower())
+    return pair.lower()
+
+
+def synthetic_candles(coin: str, timestamps: np.ndarray, step_ms: int) -> np.ndarray:
+    """
+    Deterministic OHLCV candles for a coin
+
+    Prices are a smooth function of time plus pseudo-random noise, so the
+    same timestamp always yields the same candle without keeping history.
+
+    Returns:
+        (N, 6) array of [timestamp, open, high, low, close, volume]
+    """
+    base = BASE_PRICES.get(coin, DEFAULT_BASE_PRICE)
+    phase = zlib.crc32(coin.encode()) % 1000
+
+    def price(ts):
+        hours = ts / 3_600_000.0
+        noise = np.modf(np.abs(np.sin(hours * 12.9898 + phase) * 43758.5453))[0] - 0.5
+        return base * (1 + 0.08 * np.sin(hours / 97 + phase) + 0.03 * np.sin(hours / 13) + 0.01 * noise)
+
+    timestamps = np.asarray(timestamps, dtype=float)
+    close = price(timestamps)
+    open_ = price(timestamps - step_ms)
+    spread = np.maximum(open_, close) * 0.002
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = 1000 + 500 * (np.sin(timestamps / 3_600_000.0 + phase) + 1)
+    return np.column_stack([timestamps, open_, high, low, close, volume])
+
+
+def _aligned_timestamps(end_ms: int, step_ms: int, count: int) -> np.ndarray:
+    last = end_ms - end_ms % step_ms
+    return last - step_ms * np.arange(count - 1, -1, -1, dtype=np.int64)
+
+
+class FakeUpstream:
+    """aiohttp application serving fake CoinGecko and Binance responses"""
+
+    def __init__(self, config: Optional[FakeUpstreamConfig] = None, clock=time.time):
+        """
+        Initialize fake upstream
+
+        Args:
+            config: Latency and failure settings
+            clock: Wall-clock time source for candle timestamps
+        """
+        self.config = config or FakeUpstreamConfig()
+        self._clock = clock
+        self._random = random.Random(self.config.seed)
+        self._window_start = 0.0
+        self._window_count = 0
+        self.stats: Counter = Counter()  # (route, status) -> responses
+
+        self.app = web.Application(middlewares=[self._misbehave])
+        self.app.router.add_get("/coins/markets", self.coins_markets)
+        self.app.router.add_get("/coins/{coin_id}/ohlc", self.coin_ohlc)
+        self.app.router.add_get("/simple/price", self.simple_price)
+        self.app.router.add_get("/api/v3/klines", self.klines)
+        self.app.router.add_get("/api/v3/exchangeInfo", self.exchange_info)
+        self.app.router.add_get("/_stats", self.get_stats)
+
+    @web.middleware
+    async def _misbehave(self, request: web.Request, handler):
+        if request.path == "/_stats":
+            return await handler(request)
+
+        config = self.config
+        delay = config.latency_ms + self._random.uniform(0, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else request.path
+        draw = self._random.random()
+        if self._over_rate_limit() or draw < config.throttle_rate:
+            response = web.json_response(
+                {"status": {"error_code": 429, "error_message": "rate limited"}},
+                status=429, headers={"Retry-After": str(config.retry_after)}
+            )
+        elif draw < config.throttle_rate + config.error_rate:
+            response = web.json_response({"error": "internal error"}, status=500)
+        else:
+            response = await handler(request)
+
+        self.stats[(route, response.status)] += 1
+        return response
+
+    def _over_rate_limit(self) -> bool:
+        """Fixed one-second window counter"""
+        if self.config.requests_per_second is None:
+            return False
+        now = self._clock()
+        if now - self._window_start >= 1.0:
+            self._window_start, self._window_count = now, 0
+        self._window_count += 1
+        return self._window_count > self.config.requests_per_second
+
+    def _now_ms(self) -> int:
+        return int(self._clock() * 1000)
+
+    async def coin_ohlc(self, request: web.Request) -> web.Response:
+        """CoinGecko /coins/{id}/ohlc: [timestamp, open, high, low, close]"""
+        coin = request.match_info["coin_id"]
+        days = float(request.query.get("days", "1"))
+        # CoinGecko picks granularity from the range: 30m up to 2 days, 4h up to 30, else 4 days
+        if days <= 2:
+            step = INTERVAL_MS["30m"]
+        elif days <= 30:
+            step = INTERVAL_MS["4h"]
+        else:
+            step = 4 * DAY_MS
+        count = max(1, int(days * DAY_MS // step))
+        candles = synthetic_candles(coin, _aligned_timestamps(self._now_ms(), step, count), step)
+        return web.json_response([
+            [int(c[0]), round(c[1], 2), round(c[2], 2), round(c[3], 2), round(c[4], 2)] for c in candles
+        ])
+
+    async def simple_price(self, request: web.Request) -> web.Response:
+        """CoinGecko /simple/price"""
+        step = INTERVAL_MS["1h"]
+        now = self._now_ms()
+        result = {}
+        for coin in filter(None, request.query.get("ids", "").split(",")):
+            latest, previous = synthetic_candles(coin, np.array([now, now - DAY_MS]), step)
+            price = latest[4]
+            result[coin] = {
+                "usd": round(price, 2),
+                "usd_24h_change": round((price / previous[4] - 1) * 100, 4),
+                "usd_24h_vol": round(latest[5] * price * 24, 2),
+                "usd_market_cap": round(price * 1e8, 2),
+            }
+        return web.json_response(result)
+
+    async def coins_markets(self, request: web.Request) -> web.Response:
+        """CoinGecko /coins/markets"""
+        step = INTERVAL_MS["1h"]
+        now = self._now_ms()
+        ids = list(filter(None, request.query.get("ids", "").split(","))) or list(COIN_IDS.values())
+        per_page = int(request.query.get("per_page", "100"))
+        markets = []
+        for coin in ids[:per_page]:
+            latest, previous = synthetic_candles(coin, np.array([now, now - DAY_MS]), step)
+            price = latest[4]
+            markets.append({
+                "id": coin,
+                "symbol": next((s.lower() for s, c in COIN_IDS.items() if c == coin), coin[:4]),
+                "name": coin.title(),
+                "current_price": round(price, 2),
+                "market_cap": round(price * 1e8, 2),
+                "total_volume": round(latest[5] * price * 24, 2),
+                "high_24h": round(price * 1.02, 2),
+                "low_24h": round(price * 0.98, 2),
+                "price_change_percentage_24h": round((price / previous[4] - 1) * 100, 4),
+                "last_updated": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(now / 1000)),
+            })
+        markets.sort(key=lambda m: m["market_cap"], reverse=True)
+        return web.json_response(markets)
+
+    async def klines(self, request: web.Request) -> web.Response:
+        """Binance /api/v3/klines"""
+        interval = request.query.get("interval", "1h")
+        if interval not in INTERVAL_MS:
+            return web.json_response({"code": -1120, "msg": "Invalid interval."}, status=400)
+        step = INTERVAL_MS[interval]
+        limit = min(int(request.query.get("limit", "500")), 1000)
+        now = self._now_ms()
+
+        if "startTime" in request.query:
+            start = int(request.query["startTime"])
+            first = start + (-start) % step
+            last = now - now % step
+            count = max(0, min(limit, (last - first) // step + 1))
+            timestamps = first + step * np.arange(count, dtype=np.int64)
+        else:
+            timestamps = _aligned_timestamps(now, step, limit)
+
+        candles = synthetic_candles(_coin_for_pair(request.query.get("symbol", "ETHUSDT")), timestamps, step)
+        return web.json_response([
+            [
+                int(c[0]), f"{c[1]:.2f}", f"{c[2]:.2f}", f"{c[3]:.2f}", f"{c[4]:.2f}", f"{c[5]:.4f}",
+                int(c[0]) + step - 1, f"{c[5] * c[4]:.4f}", 100, "0", "0", "0"
+            ]
+            for c in candles
+        ])
+
+    async def exchange_info(self, request: web.Request) -> web.Response:
+        """Binance /api/v3/exchangeInfo (enough for ccxt to load spot markets)"""
+        symbols = []
+        for base in COIN_IDS:
+            symbols.append({
+                "symbol": f"{base}USDT",
+                "status": "TRADING",
+                "baseAsset": base,
+                "baseAssetPrecision": 8,
+                "quoteAsset": "USDT",
+                "quotePrecision": 8,
+                "quoteAssetPrecision": 8,
+                "orderTypes": ["LIMIT", "MARKET"],
+                "icebergAllowed": True,
+                "ocoAllowed": True,
+                "isSpotTradingAllowed": True,
+                "isMarginTradingAllowed": False,
+                "filters": [
+                    {"filterType": "PRICE_FILTER", "minPrice": "0.01", "maxPrice": "1000000", "tickSize": "0.01"},
+                    {"filterType": "LOT_SIZE", "minQty": "0.0001", "maxQty": "100000", "stepSize": "0.0001"},
+                ],
+                "permissions": ["SPOT"],
+                "permissionSets": [["SPOT"]],
+            })
+        return web.json_response({
+            "timezone": "UTC",
+            "serverTime": self._now_ms(),
+            "rateLimits": [],
+            "exchangeFilters": [],
+            "symbols": symbols,
+        })
+
+    async def get_stats(self, request: web.Request) -> web.Response:
+        """Responses served so far, by route and status"""
+        by_route: Dict[str, Dict[str, int]] = {}
+        for (route, status), count in self.stats.items():
+            by_route.setdefault(route, {})[str(status)] = count
+        return web.json_response(by_route)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Fake CoinGecko/Binance upstream for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--requests-per-second", type=float)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    upstream = FakeUpstream(FakeUpstreamConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        requests_per_second=args.requests_per_second,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    ))
+    web.run_app(upstream.app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
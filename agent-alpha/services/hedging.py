@@ -0,0 +1,165 @@
+"""
+Hedged Market Data Requests
+Races a backup provider against a slow primary to cut tail latency
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from .candle_store import array_to_candles
+from .metrics import LatencyTracker
+from .normalize import infer_step, resample_candles
+from .providers import MarketDataProvider
+
+
+class HedgedProvider(MarketDataProvider):
+    """
+    Provider that hedges a primary with a secondary
+
+    The primary is queried first. If it has not answered within the hedge
+    delay (a percentile of its recent latencies), the same request is sent to
+    the secondary. The first good answer wins and the other request is
+    cancelled. A primary failure sends the hedge immediately.
+
+    Both answers are cached under the same key, so the backup must match the
+    primary's candle spacing (declared by the primary, or observed in its
+    answers). Finer backup candles are aggregated to it; a backup that cannot
+    match it does not count as an answer. Until the primary's spacing is
+    known, requests are only failed over, not hedged.
+    """
+
+    name = "hedged"
+
+    def __init__(
+        self,
+        primary: MarketDataProvider,
+        secondary: MarketDataProvider,
+        hedge_percentile: float = 95.0,
+        initial_delay: float = 0.5,
+        min_delay: float = 0.05,
+        max_delay: float = 2.0,
+        window: int = 256
+    ):
+        """
+        Initialize hedged provider
+
+        Args:
+            primary: Provider queried first
+            secondary: Provider used for the backup request
+            hedge_percentile: Percentile of primary latency used as the hedge delay
+            initial_delay: Hedge delay (seconds) before latency samples exist
+            min_delay: Lower bound on the hedge delay
+            max_delay: Upper bound on the hedge delay
+            window: Number of recent primary latencies kept
+        """
+        self.primary = primary
+        self.secondary = secondary
+        self.hedge_percentile = hedge_percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.latency = LatencyTracker(window)
+        self._primary_steps: Dict[str, int] = {}  # Interval -> observed primary spacing
+
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "hedges_sent": 0,
+            "primary_wins": 0,
+            "secondary_wins": 0,
+            "backups_resampled": 0,  # Backup candles aggregated to the primary's spacing
+            "backups_rejected": 0,  # Backup candles whose spacing could not be matched
+        }
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait on the primary before sending the backup request"""
+        delay = self.latency.percentile(self.hedge_percentile)
+        if delay is None:
+            delay = self.initial_delay
+        return min(max(delay, self.min_delay), self.max_delay)
+
+    async def fetch_candles(
+        self,
+        symbol: str = "ETH/USDT",
+        interval: str = "1h",
+        limit: int = 720
+    ) -> List[List]:
+        self.stats["requests"] += 1
+        step = self.granularity_ms(interval, limit)
+        primary = asyncio.ensure_future(self._timed_primary(symbol, interval, limit))
+        tasks = {primary: "primary"}
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay() if step else None)
+            if primary in done and self._is_good(primary):
+                self.stats["primary_wins"] += 1
+                return primary.result()
+
+            self.stats["hedges_sent"] += 1
+            backup = asyncio.ensure_future(self._matched_secondary(symbol, interval, limit, step))
+            tasks[backup] = "secondary"
+
+            pending = {t for t in tasks if not t.done()}
+            while True:
+                for task in tasks:
+                    if task.done() and self._is_good(task):
+                        self.stats[f"{tasks[task]}_wins"] += 1
+                        return task.result()
+                if not pending:
+                    break
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+            raise self._failure(primary) or self._failure(backup) or \
+                Exception(f"No provider returned candles for {symbol}")
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def granularity_ms(self, interval: str = "1h", limit: int = 720) -> Optional[int]:
+        return self.primary.granularity_ms(interval, limit) or self._primary_steps.get(interval)
+
+    async def _timed_primary(self, symbol: str, interval: str, limit: int) -> List[List]:
+        started = time.monotonic()
+        try:
+            candles = await self.primary.fetch_candles(symbol, interval, limit)
+        finally:
+            # A cancelled primary took at least this long; leaving it out would
+            # bias the hedge delay towards the fast requests
+            self.latency.record(time.monotonic() - started)
+        step = infer_step([c[0] for c in candles])
+        if step:
+            self._primary_steps[interval] = step
+        return candles
+
+    async def _matched_secondary(self, symbol: str, interval: str, limit: int, step: Optional[int]) -> List[List]:
+        """Backup candles at the primary's spacing (step), when it is known"""
+        candles = await self.secondary.fetch_candles(symbol, interval, limit)
+        backup_step = infer_step([c[0] for c in candles])
+        if not step or not backup_step or backup_step == step:
+            return candles
+        if step % backup_step:
+            self.stats["backups_rejected"] += 1
+            raise Exception(
+                f"{self.secondary.name} candles are {backup_step} ms apart, "
+                f"{self.primary.name} candles {step} ms"
+            )
+        self.stats["backups_resampled"] += 1
+        return array_to_candles(resample_candles(candles, step)[-limit:])
+
+    @staticmethod
+    def _is_good(task: asyncio.Future) -> bool:
+        return not task.cancelled() and task.exception() is None and bool(task.result())
+
+    @staticmethod
+    def _failure(task: asyncio.Future) -> Optional[BaseException]:
+        if task.cancelled():
+            return None
+        return task.exception()
+
+    def upstream_stats(self) -> Dict[str, Any]:
+        return {"primary": self.primary.upstream_stats(), "secondary": self.secondary.upstream_stats()}
+
+    async def close(self):
+        await self.primary.close()
+        await self.secondary.close()
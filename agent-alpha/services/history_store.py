@@ -0,0 +1,229 @@
+"""
+Signal History Store
+Persists signals, indicator snapshots and backtest summaries to SQLite,
+written in batches off the request path
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Record kinds
+SIGNAL = "signal"
+INDICATORS = "indicators"
+BACKTEST = "backtest"
+KINDS = (SIGNAL, INDICATORS, BACKTEST)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    symbol TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    tag TEXT NOT NULL DEFAULT '',
+    recorded_at REAL NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (symbol, kind, interval, timestamp, tag)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS records_symbol_time ON records (symbol, timestamp);
+"""
+
+
+class HistoryStore:
+    """
+    Append-mostly record store keyed by symbol and candle time
+
+    record() only queues the row; a background task writes queued rows in
+    one transaction per batch on a dedicated thread, so request handlers
+    never wait on disk. Rows are unique per (symbol, kind, interval,
+    timestamp, tag): recomputing the same bar replaces its row. If writes
+    fall behind by more than max_pending rows, the oldest queued rows are
+    dropped and counted; so are the rows of a batch whose write fails.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        max_pending: int = 10_000,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize history store
+
+        Args:
+            path: SQLite database file
+            batch_size: Rows that trigger an immediate flush
+            flush_interval: Seconds between flushes of a partial batch
+            max_pending: Queued rows kept while writes are behind
+            clock: Wall-clock time source for recorded_at
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._clock = clock
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._writer = sqlite3.connect(path, check_same_thread=False)
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history")
+
+        self._pending: List[Tuple] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {"recorded": 0, "written": 0, "batches": 0, "dropped": 0}
+
+    def record(
+        self,
+        kind: str,
+        symbol: str,
+        interval: str,
+        timestamp: int,
+        payload: Dict[str, Any],
+        tag: str = ""
+    ):
+        """
+        Queue a record for writing (must be called from the event loop)
+
+        Args:
+            kind: signal, indicators or backtest
+            symbol: Trading pair
+            interval: Candle interval
+            timestamp: Candle open time (ms) the record describes
+            payload: JSON-serializable record body
+            tag: Distinguishes records for the same bar (e.g. backtest parameters)
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown record kind: {kind}")
+        self._pending.append((
+            symbol, kind, interval, int(timestamp), tag, self._clock(), json.dumps(payload)
+        ))
+        self.stats["recorded"] += 1
+        if len(self._pending) > self.max_pending:
+            overflow = len(self._pending) - self.max_pending
+            del self._pending[:overflow]
+            self.stats["dropped"] += overflow
+
+        self._ensure_flusher()
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self):
+        """Write everything queued so far (rows of a failed batch are dropped and counted)"""
+        while self._pending:
+            batch = self._pending[:self.batch_size]
+            del self._pending[:len(batch)]
+            try:
+                await asyncio.get_running_loop().run_in_executor(self._executor, self._write, batch)
+            except sqlite3.Error as e:
+                self.stats["dropped"] += len(batch)
+                logger.warning("History write failed, dropped %d rows: %s", len(batch), e)
+
+    async def query(
+        self,
+        symbol: str,
+        kind: Optional[str] = None,
+        interval: Optional[str] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        limit: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """
+        Records for a symbol in a time range, oldest first
+
+        Reads use their own connection, so they run alongside batch writes.
+
+        Args:
+            symbol: Trading pair
+            kind: Only records of this kind
+            interval: Only records for this interval
+            start: Earliest candle time (ms, inclusive)
+            end: Latest candle time (ms, inclusive)
+            limit: Maximum number of records
+
+        Returns:
+            List of dicts with symbol, kind, interval, timestamp, tag, recorded_at and payload
+        """
+        clauses, params = ["symbol = ?"], [symbol]
+        for column, value, op in (
+            ("kind", kind, "="), ("interval", interval, "="),
+            ("timestamp", start, ">="), ("timestamp", end, "<=")
+        ):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        sql = (
+            "SELECT symbol, kind, interval, timestamp, tag, recorded_at, payload FROM records "
+            f"WHERE {' AND '.join(clauses)} ORDER BY timestamp, kind, interval, tag LIMIT ?"
+        )
+        params.append(limit)
+        return await asyncio.get_running_loop().run_in_executor(None, self._read, sql, params)
+
+    async def close(self):
+        """Write what is queued, stop the flusher and close the database"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+        self._executor.shutdown(wait=True)
+        self._writer.close()
+
+    def _ensure_flusher(self):
+        if self._flusher is None or self._flusher.done():
+            self._wakeup = asyncio.Event()
+            self._flusher = asyncio.ensure_future(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def _write(self, batch: List[Tuple]):
+        with self._lock, self._writer:
+            self._writer.executemany(
+                "INSERT OR REPLACE INTO records "
+                "(symbol, kind, interval, timestamp, tag, recorded_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                batch
+            )
+        self.stats["written"] += len(batch)
+        self.stats["batches"] += 1
+
+    def _read(self, sql: str, params: List) -> List[Dict[str, Any]]:
+        connection = sqlite3.connect(self.path)
+        try:
+            rows = connection.execute(sql, params).fetchall()
+        finally:
+            connection.close()
+        return [
+            {
+                "symbol": symbol,
+                "kind": kind,
+                "interval": interval,
+                "timestamp": timestamp,
+                "tag": tag,
+                "recorded_at": recorded_at,
+                "payload": json.loads(payload),
+            }
+            for symbol, kind, interval, timestamp, tag, recorded_at, payload in rows
+        ]
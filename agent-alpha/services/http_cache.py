@@ -0,0 +1,70 @@
+"""
+HTTP Cache Validators
+ETag computation and If-None-Match evaluation for candle-derived responses
+"""
+
+import hashlib
+import json
+from typing import Any, List, Optional, Tuple
+
+
+def candle_fingerprint(candles: List[List]) -> Tuple:
+    """
+    Summarize a candle window for use in a validator
+
+    The window changes whenever a new candle closes (last timestamp), the
+    forming candle updates (last close) or the window slides (first timestamp).
+
+    Args:
+        candles: List of [timestamp, open, high, low, close, volume]
+
+    Returns:
+        Tuple of (first_timestamp, last_timestamp, last_close, count)
+    """
+    if len(candles) == 0:
+        return (None, None, None, 0)
+    return (candles[0][0], candles[-1][0], candles[-1][4], len(candles))
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from the inputs that determine a response
+
+    Weak because bodies carry a generation timestamp, so equal validators
+    mean semantically (not byte-for-byte) equivalent responses.
+
+    Args:
+        *parts: JSON-serializable values (endpoint, symbol, params, fingerprint...)
+
+    Returns:
+        ETag header value, e.g. W/"3f2a..."
+    """
+    payload = json.dumps(parts, separators=(',', ':'), default=str)
+    digest = hashlib.sha1(payload.encode()).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluate an If-None-Match header against an ETag (weak comparison)
+
+    Args:
+        if_none_match: Raw header value (may list several tags or be "*")
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client's cached representation is still valid
+    """
+    if not if_none_match:
+        return False
+
+    current = _opaque_tag(etag)
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or _opaque_tag(candidate) == current:
+            return True
+    return False
+
+
+def _opaque_tag(tag: str) -> str:
+    return tag[2:] if tag.startswith('W/') else tag
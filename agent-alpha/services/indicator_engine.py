@@ -0,0 +1,286 @@
+"""
+Indicator Engine
+Computes a requested set of indicator series in one pass over candle columns
+
+Shared intermediates (price deltas, EMAs, rolling windows, true range,
+typical price) are computed once per engine and reused by every indicator
+that needs them. All series are aligned to the candle index, with NaN
+during each indicator's warm-up period. Values at bar t equal the
+corresponding function in services.indicators applied to candles[:t+1].
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .indicators import wilder_smooth
+
+
+SUPPORTED_INDICATORS = (
+    "rsi",
+    "sma",
+    "ema",
+    "bollinger",
+    "macd",
+    "atr",
+    "stochastic",
+    "vwap",
+)
+
+COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+
+@dataclass
+class IndicatorParams:
+    """Periods and multipliers used by the engine"""
+    rsi_period: int = 14
+    sma_period: int = 20
+    ema_period: int = 20
+    bb_period: int = 20
+    bb_std_dev: float = 2.0
+    macd_fast: int = 12
+    macd_slow: int = 26
+    macd_signal: int = 9
+    atr_period: int = 14
+    stoch_k_period: int = 14
+    stoch_d_period: int = 3
+
+
+def candle_columns(candles: List[List]) -> Dict[str, np.ndarray]:
+    """
+    Convert candle rows into float column arrays
+
+    Args:
+        candles: List of [timestamp, open, high, low, close, volume]
+
+    Returns:
+        Dict mapping column name to a 1-D float array
+    """
+    data = np.asarray(candles, dtype=float).reshape(len(candles), -1)
+    columns = {}
+    for i, name in enumerate(COLUMNS):
+        columns[name] = data[:, i] if i < data.shape[1] else np.zeros(len(data))
+    return columns
+
+
+def latest_values(series: Dict[str, np.ndarray]) -> Dict[str, Optional[float]]:
+    """
+    Last value of each series (None when still warming up)
+
+    Args:
+        series: Output of IndicatorEngine.compute
+
+    Returns:
+        Dict mapping output name to its most recent value
+    """
+    latest = {}
+    for name, values in series.items():
+        value = float(values[-1]) if len(values) else float("nan")
+        latest[name] = None if np.isnan(value) else value
+    return latest
+
+
+def _ema_series(values: np.ndarray, period: int) -> np.ndarray:
+    """EMA seeded with the SMA of the first `period` values (NaN before)"""
+    out = np.full(len(values), np.nan)
+    if len(values) < period:
+        return out
+
+    multiplier = 2 / (period + 1)
+    ema = np.mean(values[:period])
+    out[period - 1] = ema
+    for i, price in enumerate(values[period:].tolist(), start=period):
+        ema = (price - ema) * multiplier + ema
+        out[i] = ema
+    return out
+
+
+class IndicatorEngine:
+    """
+    Computes indicator series for one candle set, sharing intermediates
+
+    Usage:
+        engine = IndicatorEngine(candles)
+        series = engine.compute(["rsi", "bollinger", "macd"])
+    """
+
+    def __init__(
+        self,
+        candles: Optional[List[List]] = None,
+        columns: Optional[Dict[str, np.ndarray]] = None
+    ):
+        """
+        Initialize engine from candle rows or pre-built columns
+
+        Args:
+            candles: List of [timestamp, open, high, low, close, volume]
+            columns: Dict of column arrays (see candle_columns)
+        """
+        if columns is None:
+            columns = candle_columns(candles if candles is not None else [])
+        self.columns = columns
+        self.length = len(columns["close"])
+        self._cache: Dict[Tuple, np.ndarray] = {}
+
+    def compute(
+        self,
+        indicators: Iterable[str] = SUPPORTED_INDICATORS,
+        params: Optional[IndicatorParams] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute the requested indicators
+
+        Args:
+            indicators: Names from SUPPORTED_INDICATORS
+            params: Indicator periods (defaults match the rest of the service)
+
+        Returns:
+            Dict of series keyed by output name:
+            rsi, sma, ema, bb_upper/bb_middle/bb_lower, macd/macd_signal/macd_hist,
+            atr, stoch_k/stoch_d, vwap
+        """
+        params = params or IndicatorParams()
+        requested = list(dict.fromkeys(indicators))
+        unknown = [name for name in requested if name not in SUPPORTED_INDICATORS]
+        if unknown:
+            raise ValueError(f"Unsupported indicators: {', '.join(unknown)}")
+
+        result: Dict[str, np.ndarray] = {}
+        for name in requested:
+            result.update(getattr(self, f"_compute_{name}")(params))
+        return result
+
+    # Shared intermediates
+
+    def _memo(self, key: Tuple, build) -> np.ndarray:
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def _deltas(self) -> np.ndarray:
+        return self._memo(("deltas",), lambda: np.diff(self.columns["close"]))
+
+    def _ema(self, column: str, period: int) -> np.ndarray:
+        return self._memo(("ema", column, period), lambda: _ema_series(self.columns[column], period))
+
+    def _window(self, column: str, period: int) -> Optional[np.ndarray]:
+        """Rolling window view (no copy) of shape (length - period + 1, period)"""
+        if self.length < period:
+            return None
+        return self._memo(
+            ("window", column, period),
+            lambda: sliding_window_view(self.columns[column], period)
+        )
+
+    def _rolling(self, stat: str, column: str, period: int) -> np.ndarray:
+        """Rolling mean / sample std / max / min aligned to the candle index"""
+        def build():
+            out = np.full(self.length, np.nan)
+            window = self._window(column, period)
+            if window is not None:
+                if stat == "mean":
+                    out[period - 1:] = window.mean(axis=1)
+                elif stat == "std":
+                    out[period - 1:] = window.std(axis=1, ddof=1)
+                elif stat == "max":
+                    out[period - 1:] = window.max(axis=1)
+                else:
+                    out[period - 1:] = window.min(axis=1)
+            return out
+        return self._memo(("rolling", stat, column, period), build)
+
+    def _true_range(self) -> np.ndarray:
+        """True range per bar; bar 0 has no previous close and is NaN"""
+        def build():
+            high, low, close = self.columns["high"], self.columns["low"], self.columns["close"]
+            tr = np.full(self.length, np.nan)
+            if self.length > 1:
+                prev_close = close[:-1]
+                tr[1:] = np.maximum.reduce([
+                    high[1:] - low[1:],
+                    np.abs(high[1:] - prev_close),
+                    np.abs(low[1:] - prev_close),
+                ])
+            return tr
+        return self._memo(("true_range",), build)
+
+    # Indicators
+
+    def _compute_rsi(self, params: IndicatorParams) -> Dict[str, np.ndarray]:
+        period = params.rsi_period
+        deltas = self._deltas()
+        gains = np.where(deltas > 0, deltas, 0)
+        losses = np.where(deltas < 0, -deltas, 0)
+
+        # Smoothed averages indexed by delta; bar t uses deltas[:t]
+        avg_gain = wilder_smooth(gains, period)
+        avg_loss = wilder_smooth(losses, period)
+
+        rsi = np.full(self.length, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = 100 - (100 / (1 + avg_gain / avg_loss))
+        rsi[1:] = np.where(avg_loss == 0, 100.0, values)
+        return {"rsi": rsi}
+
+    def _compute_sma(self, params: IndicatorParams) -> Dict[str, np.ndarray]:
+        return {"sma": self._rolling("mean", "close", params.sma_period)}
+
+    def _compute_ema(self, params: IndicatorParams) -> Dict[str, np.ndarray]:
+        return {"ema": self._ema("close", params.ema_period)}
+
+    def _compute_bollinger(self, params: IndicatorParams) -> Dict[str, np.ndarray]:
+        middle = self._rolling("mean", "close", params.bb_period)
+        std = self._rolling("std", "close", params.bb_period)
+        return {
+            "bb_upper": middle + params.bb_std_dev * std,
+            "bb_middle": middle,
+            "bb_lower": middle - params.bb_std_dev * std,
+        }
+
+    def _compute_macd(self, params: IndicatorParams) -> Dict[str, np.ndarray]:
+        macd = self._ema("close", params.macd_fast) - self._ema("close", params.macd_slow)
+
+        signal = np.full(self.length, np.nan)
+        start = max(params.macd_fast, params.macd_slow) - 1
+        if self.length > start:
+            signal[start:] = _ema_series(macd[start:], params.macd_signal)
+        return {"macd": macd, "macd_signal": signal, "macd_hist": macd - signal}
+
+    def _compute_atr(self, params: IndicatorParams) -> Dict[str, np.ndarray]:
+        atr = np.full(self.length, np.nan)
+        atr[1:] = wilder_smooth(self._true_range()[1:], params.atr_period)
+        return {"atr": atr}
+
+    def _compute_stochastic(self, params: IndicatorParams) -> Dict[str, np.ndarray]:
+        highest = self._rolling("max", "high", params.stoch_k_period)
+        lowest = self._rolling("min", "low", params.stoch_k_period)
+        span = highest - lowest
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k = 100 * (self.columns["close"] - lowest) / span
+        # A flat range has no defined position; report the midpoint
+        k = np.where(span == 0, 50.0, k)
+
+        d = np.full(self.length, np.nan)
+        start = params.stoch_k_period - 1
+        valid = k[start:]
+        if len(valid) >= params.stoch_d_period:
+            d[start + params.stoch_d_period - 1:] = sliding_window_view(
+                valid, params.stoch_d_period
+            ).mean(axis=1)
+        return {"stoch_k": k, "stoch_d": d}
+
+    def _compute_vwap(self, params: IndicatorParams) -> Dict[str, np.ndarray]:
+        typical = self._memo(
+            ("typical",),
+            lambda: (self.columns["high"] + self.columns["low"] + self.columns["close"]) / 3
+        )
+        volume = self.columns["volume"]
+        cumulative_volume = np.cumsum(volume)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vwap = np.cumsum(typical * volume) / cumulative_volume
+        # Sources without volume (e.g., CoinGecko OHLC) have no VWAP
+        vwap[cumulative_volume == 0] = np.nan
+        return {"vwap": vwap}
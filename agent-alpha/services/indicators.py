@@ -4,6 +4,7 @@ Implements RSI and Bollinger Bands calculations
 """
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import List, Tuple
 
 
@@ -34,14 +35,9 @@ def calculate_rsi(prices: List[float], period: int = 14) -> float:
     gains = np.where(deltas > 0, deltas, 0)
     losses = np.where(deltas < 0, -deltas, 0)
     
-    # Calculate initial average gain and loss
-    avg_gain = np.mean(gains[:period])
-    avg_loss = np.mean(losses[:period])
-    
-    # Calculate subsequent values using smoothed moving average
-    for i in range(period, len(gains)):
-        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+    # Wilder's smoothed averages, seeded with the mean of the first period
+    avg_gain = wilder_smooth(gains, period)[-1]
+    avg_loss = wilder_smooth(losses, period)[-1]
     
     # Avoid division by zero
     if avg_loss == 0:
@@ -160,3 +156,244 @@ def get_price_position(
         return "LOWER"
     else:
         return "MIDDLE"
+
+
+def calculate_rsi_batch(prices: List[float], periods: List[int]) -> np.ndarray:
+    """
+    Calculate full RSI series for several periods at once
+    
+    Row i, column t equals calculate_rsi(prices[:t+1], periods[i]); columns
+    before a row's first defined value are NaN. The smoothing recursion
+    advances all periods together, one vectorized step per bar.
+    
+    Args:
+        prices: List of closing prices (oldest to newest)
+        periods: RSI periods
+    
+    Returns:
+        Array of shape (len(periods), len(prices))
+    """
+    prices_array = np.asarray(prices, dtype=float)
+    periods_array = np.asarray(periods, dtype=int)
+    if np.any(periods_array < 1):
+        raise ValueError("RSI periods must be positive")
+    
+    rows = np.broadcast_to(prices_array, (len(periods_array), len(prices_array)))
+    starts = np.zeros(len(periods_array), dtype=int)
+    return _rsi_rows(rows, periods_array, starts)
+
+
+def calculate_bollinger_bands_batch(
+    prices: List[float],
+    periods: List[int],
+    std_devs: List[float]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate full Bollinger Band series for several windows and multipliers
+    
+    Values at column t equal calculate_bollinger_bands(prices[:t+1], period, std_dev);
+    columns before a window fills are NaN. Each window's mean and standard
+    deviation are computed once and shared by every multiplier.
+    
+    Args:
+        prices: List of closing prices (oldest to newest)
+        periods: Moving average periods
+        std_devs: Standard deviation multipliers
+    
+    Returns:
+        Tuple of (upper, middle, lower); middle has shape (len(periods), len(prices)),
+        upper and lower have shape (len(periods), len(std_devs), len(prices))
+    """
+    prices_array = np.asarray(prices, dtype=float)
+    multipliers = np.asarray(std_devs, dtype=float)
+    length = len(prices_array)
+    
+    middle = np.full((len(periods), length), np.nan)
+    std = np.full((len(periods), length), np.nan)
+    for i, period in enumerate(periods):
+        if period < 2:
+            raise ValueError("Bollinger periods must be at least 2")
+        if length >= period:
+            windows = sliding_window_view(prices_array, period)
+            middle[i, period - 1:] = windows.mean(axis=1)
+            std[i, period - 1:] = windows.std(axis=1, ddof=1)
+    
+    spread = multipliers[None, :, None] * std[:, None, :]
+    upper = middle[:, None, :] + spread
+    lower = middle[:, None, :] - spread
+    return upper, middle, lower
+
+
+def calculate_rsi_matrix(prices: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Calculate full RSI series for every row of a (symbols x time) price matrix
+    
+    Leading NaNs mark a row whose history starts later; each row's values
+    equal calculate_rsi on that row's own prices. Rows must not contain NaNs
+    after their first price (see services.universe for gap handling).
+    
+    Args:
+        prices: 2-D array of closing prices, one row per symbol
+        period: RSI period (default: 14)
+    
+    Returns:
+        Array with the same shape as prices
+    """
+    prices = np.asarray(prices, dtype=float)
+    present = ~np.isnan(prices)
+    starts = np.where(present.any(axis=1), present.argmax(axis=1), prices.shape[1])
+    periods = np.full(prices.shape[0], period, dtype=int)
+    return _rsi_rows(prices, periods, starts)
+
+
+def calculate_bollinger_bands_matrix(
+    prices: np.ndarray,
+    period: int = 20,
+    std_dev: float = 2.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate full Bollinger Band series for every row of a price matrix
+    
+    Any window containing a NaN yields NaN.
+    
+    Args:
+        prices: 2-D array of closing prices, one row per symbol
+        period: Moving average period (default: 20)
+        std_dev: Number of standard deviations (default: 2)
+    
+    Returns:
+        Tuple of (upper, middle, lower), each with the same shape as prices
+    """
+    prices = np.asarray(prices, dtype=float)
+    middle = np.full(prices.shape, np.nan)
+    std = np.full(prices.shape, np.nan)
+    if prices.shape[1] >= period:
+        windows = sliding_window_view(prices, period, axis=1)
+        with np.errstate(invalid="ignore"):
+            middle[:, period - 1:] = windows.mean(axis=-1)
+            std[:, period - 1:] = windows.std(axis=-1, ddof=1)
+    
+    return middle + std_dev * std, middle, middle - std_dev * std
+
+
+def wilder_smooth(
+    values: np.ndarray,
+    period,
+    starts=0,
+    previous=None
+) -> np.ndarray:
+    """
+    Wilder's smoothed average along the last axis of a 1-D or 2-D array
+    
+    out[t] = (out[t-1] * (period - 1) + values[t]) / period
+    
+    Without `previous`, a row whose data begins at column `start` is seeded
+    at column start + period - 1 with the mean of its first `period` values;
+    earlier columns are NaN. With `previous`, every column continues the
+    recursion from that average (e.g. one computed over earlier values).
+    Every RSI and ATR in the package smooths through this function, so
+    their values agree exactly.
+    
+    Args:
+        values: Series to smooth, or one series per row
+        period: Smoothing period, or one per row
+        starts: First column of each row's data (ignored with previous)
+        previous: Average just before column 0, or one per row
+    
+    Returns:
+        Array with the same shape as values
+    """
+    values = np.asarray(values, dtype=float)
+    rows = np.atleast_2d(values)
+    n_rows, length = rows.shape
+    periods = np.broadcast_to(np.asarray(period, dtype=int), (n_rows,))
+    out = np.full((n_rows, length), np.nan)
+    
+    if previous is not None:
+        avg = np.array(np.broadcast_to(previous, (n_rows,)), dtype=float)
+        seed_at = np.full(n_rows, -1)
+    else:
+        avg = np.full(n_rows, np.nan)
+        starts = np.broadcast_to(np.asarray(starts, dtype=int), (n_rows,))
+        seed_at = starts + periods - 1  # Column holding the seed
+        for r in np.flatnonzero(seed_at < length):
+            avg[r] = np.mean(rows[r, starts[r]:starts[r] + periods[r]])
+            out[r, seed_at[r]] = avg[r]
+    
+    valid = seed_at < length
+    if not np.any(valid):
+        return out.reshape(values.shape)
+    first = int(seed_at[valid].min()) + 1
+    
+    if n_rows == 1:
+        # The recursion is inherently sequential; run one row on plain floats
+        value, p = float(avg[0]), int(periods[0])
+        for t, x in enumerate(rows[0, first:].tolist(), start=first):
+            value = (value * (p - 1) + x) / p
+            out[0, t] = value
+        return out.reshape(values.shape)
+    
+    weights = (periods - 1).astype(float)
+    for t in range(first, length):
+        # Rows past their seed advance one step per column
+        advancing = seed_at < t
+        avg[advancing] = (avg[advancing] * weights[advancing] + rows[advancing, t]) / periods[advancing]
+        out[advancing, t] = avg[advancing]
+    return out
+
+
+def _rsi_rows(prices: np.ndarray, periods: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    Full RSI series for each row of a 2-D price array
+    
+    Row r uses period periods[r] and its data begins at column starts[r]
+    (earlier columns are ignored). Values are identical to calculate_rsi.
+    """
+    n_rows, length = prices.shape
+    rsi = np.full((n_rows, length), np.nan)
+    if length < 2:
+        return rsi
+    
+    deltas = np.diff(prices, axis=1)
+    avg_gain = wilder_smooth(np.where(deltas > 0, deltas, 0), periods, starts)
+    avg_loss = wilder_smooth(np.where(deltas < 0, -deltas, 0), periods, starts)
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = 100 - (100 / (1 + avg_gain / avg_loss))
+    rsi[:, 1:] = np.where(avg_loss == 0, 100.0, values)
+    return rsi
+    
+    deltas = np.diff(prices, axis=1)
+    gains = np.where(deltas > 0, deltas, 0)
+    losses = np.where(deltas < 0, -deltas, 0)
+    
+    # Seed each row with the mean of its first `period` deltas
+    avg_gain = np.full(n_rows, np.nan)
+    avg_loss = np.full(n_rows, np.nan)
+    seed_at = starts + periods - 1  # delta index holding the seed
+    for r in range(n_rows):
+        if seed_at[r] < length - 1:
+            window = slice(starts[r], starts[r] + periods[r])
+            avg_gain[r] = np.mean(gains[r, window])
+            avg_loss[r] = np.mean(losses[r, window])
+    
+    valid_rows = seed_at < length - 1
+    if not np.any(valid_rows):
+        return rsi
+    
+    weights = (periods - 1).astype(float)
+    first = int(seed_at[valid_rows].min())
+    for d in range(first, length - 1):
+        # Rows past their seed advance; the seed column itself is emitted as-is
+        advancing = seed_at < d
+        if np.any(advancing):
+            avg_gain[advancing] = (avg_gain[advancing] * weights[advancing] + gains[advancing, d]) / periods[advancing]
+            avg_loss[advancing] = (avg_loss[advancing] * weights[advancing] + losses[advancing, d]) / periods[advancing]
+        
+        active = seed_at <= d
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = 100 - (100 / (1 + avg_gain / avg_loss))
+        values = np.where(avg_loss == 0, 100.0, values)
+        rsi[active, d + 1] = values[active]
+    
+    return rsi
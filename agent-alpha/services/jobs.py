@@ -0,0 +1,323 @@
+"""
+Background Job Queue
+Runs long backtests and parameter sweeps outside the request path, with
+progress, cancellation and on-disk checkpoints
+"""
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .exits import ExitRules
+from .performance import backtest_performance, periods_per_year
+from .signals import SignalGenerator
+
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+
+@dataclass
+class Job:
+    """A batch of tasks run in order; results[i] is filled when task i finishes"""
+    id: str
+    kind: str
+    tasks: List[Dict[str, Any]]
+    status: str = QUEUED
+    results: List[Optional[Dict[str, Any]]] = field(default_factory=list)
+    error: Optional[str] = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    def __post_init__(self):
+        if len(self.results) < len(self.tasks):
+            self.results += [None] * (len(self.tasks) - len(self.results))
+
+    @property
+    def completed_tasks(self) -> int:
+        return sum(result is not None for result in self.results)
+
+    @property
+    def progress(self) -> float:
+        """Fraction of tasks finished, 0 to 1"""
+        return self.completed_tasks / len(self.tasks) if self.tasks else 1.0
+
+    def status_dict(self) -> Dict[str, Any]:
+        """Job state without the results"""
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": round(self.progress, 4),
+            "completed_tasks": self.completed_tasks,
+            "total_tasks": len(self.tasks),
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+class JobManager:
+    """
+    Runs submitted jobs in the background, at most max_concurrent at a time
+
+    Each job's tasks run one after another through an async runner. After
+    every task the job is written to `directory` as JSON (atomically), so a
+    restarted process can call resume() and continue from the first
+    unfinished task instead of starting over. Only the newest max_finished
+    finished jobs are kept; older ones are forgotten and their checkpoints
+    deleted, so the directory does not grow without bound.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        directory: str,
+        max_concurrent: int = 2,
+        kind: str = "backtest",
+        clock: Callable[[], float] = time.time,
+        max_finished: int = 100
+    ):
+        """
+        Initialize job manager
+
+        Args:
+            runner: Async function computing one task's result (a JSON-serializable dict)
+            directory: Where job checkpoints are stored
+            max_concurrent: Jobs allowed to run at the same time
+            kind: Label stored with each job
+            clock: Wall-clock time source (injectable for tests)
+            max_finished: Finished jobs kept (with their checkpoints) before
+                the oldest are deleted
+        """
+        self.runner = runner
+        self.directory = directory
+        self.max_concurrent = max_concurrent
+        self.kind = kind
+        self._clock = clock
+        self.max_finished = max_finished
+        self._jobs: Dict[str, Job] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def submit(self, tasks: List[Dict[str, Any]]) -> Job:
+        """
+        Queue a job
+
+        Args:
+            tasks: Task specs passed one by one to the runner
+
+        Returns:
+            The queued Job (its id is used to poll, cancel and fetch results)
+        """
+        now = self._clock()
+        job = Job(id=uuid.uuid4().hex, kind=self.kind, tasks=list(tasks),
+                  created_at=now, updated_at=now)
+        self._jobs[job.id] = job
+        self._checkpoint(job)
+        self._start(job)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """Look up a job (raises KeyError if unknown)"""
+        return self._jobs[job_id]
+
+    def jobs(self) -> List[Job]:
+        """All known jobs, oldest first"""
+        return sorted(self._jobs.values(), key=lambda job: job.created_at)
+
+    def cancel(self, job_id: str) -> Job:
+        """
+        Cancel a queued or running job
+
+        Results of tasks that already finished are kept. A task running in a
+        worker is allowed to finish, but its result is discarded.
+        """
+        job = self.get(job_id)
+        if job.status in FINISHED_STATES:
+            return job
+        self._finish(job, CANCELLED)
+        task = self._tasks.pop(job_id, None)
+        if task is not None:
+            task.cancel()
+        return job
+
+    def resume(self) -> List[Job]:
+        """
+        Load checkpoints from disk and restart unfinished jobs
+
+        Returns:
+            Jobs that were restarted
+        """
+        resumed = []
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(self.directory, name)) as f:
+                job = Job(**json.load(f))
+            if job.id in self._jobs:
+                continue
+            self._jobs[job.id] = job
+            if job.status not in FINISHED_STATES:
+                job.status = QUEUED
+                self._start(job)
+                resumed.append(job)
+        self._prune()
+        return resumed
+
+    async def wait(self, job_id: str) -> Job:
+        """Wait for a job to stop running"""
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+        return self.get(job_id)
+
+    async def close(self):
+        """Stop running jobs; their checkpoints stay resumable"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _start(self, job: Job):
+        if self._slots is None:
+            # Created lazily so it binds to the running event loop
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._tasks[job.id] = asyncio.create_task(self._run(job))
+
+    async def _run(self, job: Job):
+        try:
+            async with self._slots:
+                if job.status in FINISHED_STATES:
+                    return
+                job.status = RUNNING
+                self._checkpoint(job)
+
+                for index, spec in enumerate(job.tasks):
+                    if job.results[index] is not None:
+                        continue  # Finished before a restart
+                    result = await self.runner(spec)
+                    if job.status != RUNNING:
+                        return
+                    job.results[index] = result
+                    self._checkpoint(job)
+
+                self._finish(job, COMPLETED)
+        except asyncio.CancelledError:
+            # Cancelled by cancel() (already recorded) or by shutdown (resumable)
+            pass
+        except Exception as e:
+            self._finish(job, FAILED, str(e))
+        finally:
+            self._tasks.pop(job.id, None)
+
+    def _finish(self, job: Job, status: str, error: Optional[str] = None):
+        job.status = status
+        job.error = error
+        self._checkpoint(job)
+        self._prune()
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond max_finished and delete their checkpoints"""
+        finished = sorted(
+            (job for job in self._jobs.values() if job.status in FINISHED_STATES),
+            key=lambda job: job.updated_at
+        )
+        for job in finished[:max(len(finished) - self.max_finished, 0)]:
+            del self._jobs[job.id]
+            try:
+                os.remove(os.path.join(self.directory, f"{job.id}.json"))
+            except FileNotFoundError:
+                pass
+
+    def _checkpoint(self, job: Job):
+        """Write the job to disk, replacing the previous checkpoint atomically"""
+        job.updated_at = self._clock()
+        path = os.path.join(self.directory, f"{job.id}.json")
+        temp = f"{path}.tmp"
+        with open(temp, "w") as f:
+            json.dump(asdict(job), f)
+        os.replace(temp, path)
+
+
+def run_backtest_task(candles: List[List], task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Backtest one parameter set over a candle history
+
+    Args:
+        candles: List of [timestamp, open, high, low, close, volume]
+        task: Spec with optional rsi_oversold, rsi_overbought, take_profit,
+            stop_loss, max_bars, trigger, fee and interval
+
+    Returns:
+        Win rate and performance metrics (JSON-serializable)
+    """
+    generator = SignalGenerator(exit_rules=ExitRules(
+        take_profit=task.get("take_profit", SignalGenerator.BACKTEST_PROFIT_THRESHOLD),
+        stop_loss=task.get("stop_loss"),
+        max_bars=task.get("max_bars", SignalGenerator.BACKTEST_LOOKAHEAD),
+        trigger=task.get("trigger", "close")
+    ))
+    generator.RSI_OVERSOLD = task.get("rsi_oversold", generator.RSI_OVERSOLD)
+    generator.RSI_OVERBOUGHT = task.get("rsi_overbought", generator.RSI_OVERBOUGHT)
+
+    win_rate, total_signals = generator._summarize_outcomes(generator._backtest_outcomes(candles))
+    report = backtest_performance(
+        candles,
+        generator,
+        fee=task.get("fee", 0.0),
+        periods_per_year=periods_per_year([c[0] for c in candles], task.get("interval", "1h"))
+    )
+    return {
+        "task": task,
+        "candles": len(candles),
+        "win_rate": float(win_rate),
+        "total_signals": int(total_signals),
+        **report.summary(),
+    }
+
+
+class BacktestRunner:
+    """
+    Fetches candles for a task and backtests them on a worker pool
+
+    The backtest is CPU-bound, largely in Python loops that hold the GIL, so
+    by default it runs in worker processes and does not stall the event loop
+    or other requests.
+    """
+
+    def __init__(self, market_data, executor: Optional[Executor] = None, max_workers: int = 2):
+        """
+        Initialize backtest runner
+
+        Args:
+            market_data: MarketDataService used to fetch candles
+            executor: Worker pool for the CPU-bound backtest
+            max_workers: Process pool size when no executor is given
+        """
+        self.market_data = market_data
+        self._owns_executor = executor is None
+        self.executor = executor or ProcessPoolExecutor(max_workers=max_workers)
+
+    def shutdown(self):
+        """Stop the worker pool if this runner created it"""
+        if self._owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __call__(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        snapshot = await self.market_data.get_candles(
+            task.get("symbol", "ETH/USDT"), task.get("interval", "1h"), task.get("limit", 720)
+        )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, run_backtest_task, snapshot.candles, task)
@@ -0,0 +1,186 @@
+"""
+HTTP Load Driver
+Drives endpoints at fixed concurrency levels and reports throughput and
+latency percentiles per endpoint
+
+Usage:
+    python -m services.loadtest --url http://127.0.0.1:8000 \\
+        --endpoint /candles --endpoint /indicators --endpoint /analyze \\
+        --concurrency 1,8,32 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from .metrics import LatencyTracker
+
+
+# Enough samples for every request of a typical run to count in the percentiles
+SAMPLE_WINDOW = 1_000_000
+
+
+@dataclass
+class EndpointStats:
+    """Results for one endpoint at one concurrency level"""
+    requests: int = 0
+    errors: int = 0  # Transport failures and HTTP status >= 400
+    statuses: Dict[str, int] = field(default_factory=dict)
+    throughput: float = 0.0  # Completed requests per second
+    latency: Dict[str, float] = field(default_factory=dict)  # LatencyTracker summary
+
+
+@dataclass
+class LevelResult:
+    """Results for one concurrency level"""
+    concurrency: int
+    elapsed_seconds: float
+    endpoints: Dict[str, EndpointStats]
+
+
+async def run_level(
+    session: aiohttp.ClientSession,
+    base_url: str,
+    endpoints: List[str],
+    concurrency: int,
+    duration: Optional[float] = None,
+    total_requests: Optional[int] = None
+) -> LevelResult:
+    """
+    Keep `concurrency` requests in flight until the duration or request budget runs out
+
+    Workers cycle through the endpoints, each starting at a different one,
+    so every endpoint gets an even share of the load.
+
+    Args:
+        session: HTTP session to send requests with
+        base_url: Server root, e.g. http://127.0.0.1:8000
+        endpoints: Paths (with query strings) to request
+        concurrency: Requests in flight at once
+        duration: Seconds to run
+        total_requests: Requests to send across all workers
+
+    Returns:
+        LevelResult
+    """
+    if duration is None and total_requests is None:
+        raise ValueError("duration or total_requests is required")
+
+    base_url = base_url.rstrip("/")
+    trackers = {endpoint: LatencyTracker(window=SAMPLE_WINDOW) for endpoint in endpoints}
+    statuses = {endpoint: Counter() for endpoint in endpoints}
+    errors = Counter()
+    remaining = [total_requests if total_requests is not None else float("inf")]
+    started = time.perf_counter()
+    deadline = started + duration if duration is not None else float("inf")
+
+    async def worker(offset: int):
+        turn = offset
+        while time.perf_counter() < deadline and remaining[0] > 0:
+            remaining[0] -= 1
+            endpoint = endpoints[turn % len(endpoints)]
+            turn += 1
+            sent = time.perf_counter()
+            try:
+                async with session.get(base_url + endpoint) as response:
+                    await response.read()
+                    status = str(response.status)
+                    if response.status >= 400:
+                        errors[endpoint] += 1
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status = type(e).__name__
+                errors[endpoint] += 1
+            trackers[endpoint].record(time.perf_counter() - sent)
+            statuses[endpoint][status] += 1
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return LevelResult(
+        concurrency=concurrency,
+        elapsed_seconds=round(elapsed, 6),
+        endpoints={
+            endpoint: EndpointStats(
+                requests=len(trackers[endpoint]),
+                errors=errors[endpoint],
+                statuses=dict(statuses[endpoint]),
+                throughput=round(len(trackers[endpoint]) / elapsed, 3) if elapsed > 0 else 0.0,
+                latency=trackers[endpoint].summary(),
+            )
+            for endpoint in endpoints
+        },
+    )
+
+
+async def run_load_test(
+    base_url: str,
+    endpoints: List[str],
+    concurrency_levels: List[int],
+    duration: Optional[float] = None,
+    requests_per_level: Optional[int] = None,
+    timeout: float = 30.0
+) -> List[LevelResult]:
+    """
+    Run one load level per concurrency value, one after another
+
+    Returns:
+        LevelResult for each concurrency level
+    """
+    connector = aiohttp.TCPConnector(limit=max(concurrency_levels))
+    async with aiohttp.ClientSession(
+        connector=connector, timeout=aiohttp.ClientTimeout(total=timeout)
+    ) as session:
+        results = []
+        for concurrency in concurrency_levels:
+            results.append(await run_level(
+                session, base_url, endpoints, concurrency, duration, requests_per_level
+            ))
+        return results
+
+
+def format_results(results: List[LevelResult]) -> str:
+    """Plain-text table: one row per (concurrency, endpoint)"""
+    header = f"{'conc':>5}  {'endpoint':<32} {'req':>7} {'err':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    lines = [header, "-" * len(header)]
+    for level in results:
+        for endpoint, stats in level.endpoints.items():
+            latency = stats.latency
+            lines.append(
+                f"{level.concurrency:>5}  {endpoint[:32]:<32} {stats.requests:>7} {stats.errors:>5} "
+                f"{stats.throughput:>9.1f} {latency.get('p50_ms', 0):>9.1f} "
+                f"{latency.get('p95_ms', 0):>9.1f} {latency.get('p99_ms', 0):>9.1f}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Load test HTTP endpoints at fixed concurrency levels")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server root")
+    parser.add_argument("--endpoint", action="append", dest="endpoints",
+                        help="Path to request, repeatable (default: /candles, /indicators, /analyze)")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, help="Seconds per level (default 10)")
+    parser.add_argument("--requests", type=int, help="Requests per level instead of a duration")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args(argv)
+
+    endpoints = args.endpoints or ["/candles", "/indicators", "/analyze"]
+    levels = [int(level) for level in args.concurrency.split(",") if level]
+    duration = args.duration if args.duration is not None or args.requests else 10.0
+
+    results = asyncio.run(run_load_test(args.url, endpoints, levels, duration, args.requests, args.timeout))
+    print(format_results(results))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump([asdict(level) for level in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
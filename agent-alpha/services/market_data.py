@@ -0,0 +1,167 @@
+"""
+Market Data Layer
+Stale-while-revalidate candle cache in front of the upstream provider
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .candle_store import array_to_candles
+from .memory_cache import SizedCache
+from .normalize import DataQuality, normalize_candles
+from .resilience import CircuitBreaker
+
+
+class UpstreamUnavailableError(Exception):
+    """Raised when the provider failed and no usable cached data exists"""
+
+
+@dataclass
+class CandleSnapshot:
+    """Candles for one request key plus freshness metadata"""
+    candles: List[List]
+    fetched_at: float  # Unix time the candles were received from upstream
+    stale: bool = False  # True when served past its freshness window
+    quality: Optional[DataQuality] = None  # Set when a gap policy is configured
+
+
+class MarketDataService:
+    """
+    Serves candles from a stale-while-revalidate cache
+
+    - Fresh entries (younger than fresh_ttl) are returned directly
+    - Expired entries younger than max_stale are returned immediately with
+      stale=True while a single background refresh runs
+    - Upstream calls go through a circuit breaker so an outage is not hit
+      by every request; while the circuit is open, stale data is served
+      without waiting on the provider
+    """
+
+    def __init__(
+        self,
+        source,
+        fresh_ttl: float = 60.0,
+        max_stale: float = 24 * 3600.0,
+        breaker: Optional[CircuitBreaker] = None,
+        clock: Callable[[], float] = time.time,
+        cache: Optional[SizedCache] = None,
+        gap_policy: Optional[str] = None
+    ):
+        """
+        Initialize market data service
+
+        Args:
+            source: MarketDataProvider exposing async fetch_candles(symbol, interval, limit)
+            fresh_ttl: Seconds a snapshot is served without revalidation
+            max_stale: Seconds past which a snapshot is no longer served
+            breaker: Circuit breaker for upstream calls
+            clock: Wall-clock time source (injectable for tests)
+            cache: Byte-bounded store for snapshots (default: 256 MB LRU);
+                may be shared with other caches of per-symbol data
+            gap_policy: Normalize fetched candles onto a regular grid with
+                this policy (ffill, drop or mark; None keeps them as received)
+        """
+        self._source = source
+        self.fresh_ttl = fresh_ttl
+        self.max_stale = max_stale
+        self.breaker = breaker or CircuitBreaker()
+        self._clock = clock
+        self.gap_policy = gap_policy
+
+        self._entries = cache if cache is not None else SizedCache()
+        self._inflight: Dict[Tuple, asyncio.Task] = {}
+
+    @property
+    def provider(self):
+        """Provider used for upstream fetches"""
+        return self._source
+
+    async def get_candles(
+        self,
+        symbol: str = "ETH/USDT",
+        interval: str = "1h",
+        limit: int = 720
+    ) -> CandleSnapshot:
+        """
+        Get OHLCV candles, serving cached data when possible
+
+        Args:
+            symbol: Trading pair (e.g., "ETH/USDT")
+            interval: Candle interval
+            limit: Number of candles
+
+        Returns:
+            CandleSnapshot (stale=True when served past its freshness window)
+
+        Raises:
+            UpstreamUnavailableError: If the provider failed and nothing usable is cached
+        """
+        key = (symbol, interval, limit)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            age = self._clock() - entry.fetched_at
+            if age < self.fresh_ttl:
+                return entry
+            if age < self.max_stale:
+                if self.breaker.state != CircuitBreaker.OPEN:
+                    self._refresh(key)
+                return replace(entry, stale=True)
+
+        try:
+            # Shield so a client disconnect does not cancel the shared fetch
+            return await asyncio.shield(self._refresh(key))
+        except Exception as e:
+            raise UpstreamUnavailableError(
+                f"Market data unavailable for {symbol}: {e}"
+            ) from e
+
+    def _refresh(self, key: Tuple) -> asyncio.Task:
+        """Start (or join) the single in-flight fetch for a key"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._on_refresh_done(k, t))
+        return task
+
+    def _on_refresh_done(self, key: Tuple, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None and key in self._entries:
+            print(f"⚠️  Background refresh failed for {key[0]}: {error}. Serving stale data.")
+
+    async def _fetch(self, key: Tuple) -> CandleSnapshot:
+        symbol, interval, limit = key
+        candles = await self.breaker.call(self._source.fetch_candles, symbol, interval, limit)
+        if len(candles) == 0:
+            raise Exception(f"Empty candle response for {symbol}")
+
+        quality = None
+        if self.gap_policy is not None:
+            # Without a declared granularity (CoinGecko picks its own) the grid step is inferred
+            granularity = getattr(self._source, "granularity_ms", None)
+            step = granularity(interval, limit) if granularity is not None else None
+            normalized = normalize_candles(candles, step_ms=step, policy=self.gap_policy)
+            quality = normalized.quality
+            if not quality.clean:
+                candles = array_to_candles(normalized.candles[-limit:])
+
+        snapshot = CandleSnapshot(candles=candles, fetched_at=self._clock(), quality=quality)
+        self._entries[key] = snapshot
+        return snapshot
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop cached snapshots (all, or only those for one symbol)
+
+        With a shared cache this also drops series derived from the candles.
+        """
+        if symbol is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k[0] == symbol]:
+            del self._entries[key]
@@ -0,0 +1,214 @@
+"""
+Memory-Bounded Cache
+In-process cache for candle histories and indicator series with a byte
+budget, LRU or LFU eviction and pinned symbols
+"""
+
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any, Dict, Hashable, Iterable, Iterator, Optional
+
+import numpy as np
+
+
+# Lists longer than this are sized from a sample of their elements
+_SAMPLE = 8
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate resident size of a value in bytes
+
+    Counts numpy buffers exactly and walks containers and dataclasses. A view
+    counts the bytes it spans, since caching it keeps them alive. Long lists
+    (such as candle lists) are extrapolated from their first elements, which
+    is accurate for the homogeneous rows stored here.
+    """
+    if isinstance(value, np.ndarray):
+        # getsizeof includes the buffer only for arrays that own it
+        return sys.getsizeof(value) + (0 if value.flags.owndata else value.nbytes)
+    if isinstance(value, (list, tuple)):
+        size = sys.getsizeof(value)
+        if len(value) > _SAMPLE:
+            sample = sum(estimate_size(item) for item in value[:_SAMPLE])
+            return size + sample * len(value) // _SAMPLE
+        return size + sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k) + estimate_size(v) for k, v in value.items()
+        )
+    if is_dataclass(value) and not isinstance(value, type):
+        return sys.getsizeof(value) + sum(estimate_size(getattr(value, f.name)) for f in fields(value))
+    return sys.getsizeof(value)
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    hits: int = 0
+    last_used: int = 0
+
+
+class SizedCache:
+    """
+    Mapping-style cache that keeps its estimated size under max_bytes
+
+    Keys are tuples whose first element is the symbol, e.g.
+    (symbol, interval, limit). Entries of pinned symbols are never evicted
+    (they still count towards the budget). When an insert goes over budget,
+    unpinned entries are evicted least recently used first ("lru") or least
+    frequently used first ("lfu", ties broken by recency). A value larger
+    than the whole budget is not cached.
+    """
+
+    POLICIES = ("lru", "lfu")
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        policy: str = "lru",
+        pinned_symbols: Iterable[str] = ()
+    ):
+        """
+        Initialize sized cache
+
+        Args:
+            max_bytes: Byte budget for all entries
+            policy: "lru" or "lfu"
+            pinned_symbols: Symbols whose entries are never evicted
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.pinned_symbols = set(pinned_symbols)
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._resident = 0
+        self._clock = 0  # Access counter used as recency for LFU ties
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "evicted_bytes": 0, "rejected": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(list(self._entries))
+
+    def __setitem__(self, key: Hashable, value: Any):
+        self.put(key, value)
+
+    def __delitem__(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self._resident -= entry.size
+
+    @property
+    def resident_bytes(self) -> int:
+        return self._resident
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Look up a value, counting a hit or miss and refreshing its recency"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return default
+        self._stats["hits"] += 1
+        self._touch(key, entry)
+        return entry.value
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None) -> bool:
+        """
+        Insert or replace a value, evicting others if over budget
+
+        Args:
+            key: Cache key; the first tuple element is treated as the symbol
+            value: Value to cache
+            size: Size in bytes (estimated if omitted)
+
+        Returns:
+            False if the value alone exceeds the budget and was not cached
+        """
+        size = estimate_size(value) if size is None else size
+        if key in self._entries:
+            del self[key]
+        if size > self.max_bytes:
+            self._stats["rejected"] += 1
+            return False
+
+        entry = _Entry(value=value, size=size)
+        self._entries[key] = entry
+        self._resident += size
+        self._touch(key, entry)
+        self._evict(protect=key)
+        return True
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        if key not in self._entries:
+            return default
+        value = self._entries[key].value
+        del self[key]
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self._resident = 0
+
+    def pin(self, symbol: str):
+        """Never evict entries for this symbol"""
+        self.pinned_symbols.add(symbol)
+
+    def unpin(self, symbol: str):
+        self.pinned_symbols.discard(symbol)
+        self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        """Resident size, entry counts and hit/eviction counters"""
+        pinned = [e for k, e in self._entries.items() if self._is_pinned(k)]
+        return {
+            "policy": self.policy,
+            "entries": len(self._entries),
+            "resident_bytes": self._resident,
+            "max_bytes": self.max_bytes,
+            "pinned_entries": len(pinned),
+            "pinned_bytes": sum(e.size for e in pinned),
+            "pinned_symbols": sorted(self.pinned_symbols),
+            **self._stats,
+        }
+
+    def _touch(self, key: Hashable, entry: _Entry):
+        self._clock += 1
+        entry.hits += 1
+        entry.last_used = self._clock
+        self._entries.move_to_end(key)
+
+    def _is_pinned(self, key: Hashable) -> bool:
+        symbol = key[0] if isinstance(key, tuple) and key else key
+        return symbol in self.pinned_symbols
+
+    def _evict(self, protect: Optional[Hashable] = None):
+        """Evict unpinned entries until the budget is met (never the one just inserted)"""
+        excess = self._resident - self.max_bytes
+        if excess <= 0:
+            return
+        # OrderedDict keeps least recently used first, so under LRU the scan is
+        # lazy and stops once enough has been freed; LFU sorts candidates once
+        candidates = (
+            (key, entry) for key, entry in self._entries.items()
+            if key != protect and not self._is_pinned(key)
+        )
+        if self.policy == "lfu":
+            candidates = iter(sorted(candidates, key=lambda item: (item[1].hits, item[1].last_used)))
+
+        victims = []
+        for key, entry in candidates:
+            if excess <= 0:
+                break
+            victims.append(key)
+            excess -= entry.size
+        for key in victims:
+            self._stats["evictions"] += 1
+            self._stats["evicted_bytes"] += self._entries[key].size
+            del self[key]
@@ -0,0 +1,59 @@
+"""
+Latency Metrics
+Rolling latency samples with percentile summaries
+"""
+
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class LatencyTracker:
+    """Keeps the most recent latency samples (seconds) in a bounded window"""
+
+    def __init__(self, window: int = 1024):
+        """
+        Initialize latency tracker
+
+        Args:
+            window: Number of most recent samples kept
+        """
+        self._samples = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float):
+        """Add one latency sample"""
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Latency at percentile q
+
+        Args:
+            q: Percentile in [0, 100]
+
+        Returns:
+            Latency in seconds, or None if no samples were recorded
+        """
+        if not self._samples:
+            return None
+        return float(np.percentile(np.fromiter(self._samples, dtype=float), q))
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, p50/p95/p99 and max of the current window (milliseconds)"""
+        if not self._samples:
+            return {"count": 0}
+
+        samples = np.fromiter(self._samples, dtype=float) * 1000
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        return {
+            "count": len(samples),
+            "mean_ms": round(float(samples.mean()), 3),
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3),
+            "max_ms": round(float(samples.max()), 3),
+        }
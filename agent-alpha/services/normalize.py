@@ -0,0 +1,173 @@
+"""
+Candle Normalization
+Finds gaps, duplicates and misaligned candles against the interval grid and
+repairs them in one vectorized pass
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .candle_store import candles_to_array
+from .providers import interval_to_ms
+
+
+# Gap policies
+FFILL = "ffill"  # Fill missing bars with flat candles at the previous close, volume 0
+DROP = "drop"  # Leave missing bars out (duplicates are still removed)
+MARK = "mark"  # Fill missing bars with NaN prices, volume 0
+POLICIES = (FFILL, DROP, MARK)
+
+
+@dataclass
+class DataQuality:
+    """What normalization found in a candle series"""
+    step_ms: int  # Grid spacing the series was checked against
+    rows_in: int
+    rows_out: int
+    duplicates: int  # Rows sharing a grid slot with a later row (the later one is kept)
+    out_of_order: int  # Places where a timestamp was lower than the one before it
+    misaligned: int  # Rows off the grid, snapped to the nearest slot
+    gaps: int  # Runs of missing bars
+    missing_bars: int
+    largest_gap: int  # Longest run of missing bars
+    filled: int  # Bars added by the policy
+    coverage: float  # Bars present / bars on the grid between first and last
+
+    @property
+    def clean(self) -> bool:
+        return not (self.duplicates or self.out_of_order or self.misaligned or self.missing_bars)
+
+
+@dataclass
+class NormalizedCandles:
+    candles: np.ndarray  # (N, 6) float array
+    filled: np.ndarray  # Bool per row: True where the policy added the bar
+    quality: DataQuality
+
+
+def infer_step(timestamps: np.ndarray) -> Optional[int]:
+    """Most likely bar spacing (median positive difference), None with fewer than two bars"""
+    diffs = np.diff(np.sort(np.asarray(timestamps, dtype=float)))
+    diffs = diffs[diffs > 0]
+    return int(np.median(diffs)) if len(diffs) else None
+
+
+def resample_candles(candles, step_ms: int) -> np.ndarray:
+    """
+    Aggregate candles into coarser bars on the step_ms grid
+
+    Each bar takes the first open, highest high, lowest low, last close and
+    summed volume of the candles opening in its slot. The last bar may be
+    partial, like a forming candle.
+
+    Args:
+        candles: Candles at a spacing that divides step_ms
+        step_ms: Bar length of the output in ms
+
+    Returns:
+        (N, 6) float array in time order
+    """
+    data = candles_to_array(candles)
+    if len(data) == 0:
+        return data
+    data = data[np.argsort(data[:, 0], kind="stable")]
+    slots = np.floor(data[:, 0] / step_ms) * step_ms
+    starts = np.flatnonzero(np.r_[True, np.diff(slots) != 0])
+    ends = np.r_[starts[1:], len(data)]
+    return np.column_stack([
+        slots[starts],
+        data[starts, 1],
+        np.maximum.reduceat(data[:, 2], starts),
+        np.minimum.reduceat(data[:, 3], starts),
+        data[ends - 1, 4],
+        np.add.reduceat(data[:, 5], starts),
+    ])
+
+
+def normalize_candles(
+    candles,
+    interval: Optional[str] = None,
+    policy: str = FFILL,
+    step_ms: Optional[int] = None
+) -> NormalizedCandles:
+    """
+    Put candles on a regular grid
+
+    Rows are sorted by time, snapped to the grid anchored at the first
+    candle and deduplicated (the last row for a slot wins). Missing bars
+    are then handled by the policy: ffill and mark give one row per grid
+    slot, drop leaves the gaps.
+
+    Args:
+        candles: List or array of [timestamp, open, high, low, close, volume]
+        interval: Expected candle interval; omitted, the spacing is inferred
+            from the data (CoinGecko picks its own granularity)
+        policy: ffill, drop or mark
+        step_ms: Grid spacing in ms (overrides interval)
+
+    Returns:
+        NormalizedCandles
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown gap policy: {policy}")
+    data = candles_to_array(candles)
+    rows_in = len(data)
+    if step_ms is None:
+        step_ms = interval_to_ms(interval) if interval else infer_step(data[:, 0])
+    if rows_in == 0 or not step_ms:
+        return NormalizedCandles(
+            candles=data.copy(),
+            filled=np.zeros(rows_in, dtype=bool),
+            quality=DataQuality(step_ms or 0, rows_in, rows_in, 0, 0, 0, 0, 0, 0, 0, 1.0),
+        )
+
+    out_of_order = int(np.count_nonzero(np.diff(data[:, 0]) < 0))
+    data = data[np.argsort(data[:, 0], kind="stable")]
+    origin = data[0, 0]
+    position = (data[:, 0] - origin) / step_ms
+    slots = np.rint(position).astype(np.int64)
+    misaligned = int(np.count_nonzero(np.abs(position - slots) > 1e-9))
+
+    # Keep the last row of each slot
+    last = np.append(slots[1:] != slots[:-1], True)
+    duplicates = int(rows_in - np.count_nonzero(last))
+    data, slots = data[last], slots[last]
+    data[:, 0] = origin + slots * step_ms
+
+    gap_sizes = np.diff(slots) - 1
+    missing_bars = int(gap_sizes.sum())
+    total = int(slots[-1]) + 1
+
+    if policy == DROP or missing_bars == 0:
+        result, filled = data, np.zeros(len(data), dtype=bool)
+    else:
+        result = np.empty((total, 6))
+        present = np.zeros(total, dtype=bool)
+        present[slots] = True
+        result[slots] = data
+        filled = ~present
+        # Index of the latest present bar at or before each slot
+        source = np.maximum.accumulate(np.where(present, np.arange(total), 0))
+        result[filled, 0] = origin + np.flatnonzero(filled) * step_ms
+        if policy == FFILL:
+            result[filled, 1:5] = result[source[filled], 4][:, None]
+        else:
+            result[filled, 1:5] = np.nan
+        result[filled, 5] = 0.0
+
+    quality = DataQuality(
+        step_ms=int(step_ms),
+        rows_in=rows_in,
+        rows_out=len(result),
+        duplicates=duplicates,
+        out_of_order=out_of_order,
+        misaligned=misaligned,
+        gaps=int(np.count_nonzero(gap_sizes > 0)),
+        missing_bars=missing_bars,
+        largest_gap=int(gap_sizes.max()) if len(gap_sizes) else 0,
+        filled=int(np.count_nonzero(filled)),
+        coverage=round(len(slots) / total, 6),
+    )
+    return NormalizedCandles(candles=result, filled=filled, quality=quality)
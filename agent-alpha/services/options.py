@@ -0,0 +1,254 @@
+"""
+Options Pricing
+Vectorized Black-Scholes prices, Greeks and implied volatility, used to
+suggest a strike for BUY_CALL / BUY_PUT signals
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+DAYS_PER_YEAR = 365.0
+_SQRT2 = math.sqrt(2.0)
+_SQRT_2PI = math.sqrt(2.0 * math.pi)
+
+# Implied volatility search range
+IV_LOWER = 1e-4
+IV_UPPER = 5.0
+
+
+@dataclass
+class OptionGreeks:
+    """Black-Scholes values; each field broadcasts like the inputs"""
+    price: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    vega: np.ndarray  # Per 1.00 change in volatility (divide by 100 for per vol point)
+    theta: np.ndarray  # Per year (divide by 365 for per day)
+
+
+@dataclass
+class OptionSuggestion:
+    """Strike suggested for a signal"""
+    option_type: str  # "CALL" or "PUT"
+    strike: float
+    expiry_days: float
+    premium: float
+    delta: float
+    gamma: float
+    vega: float
+    theta: float  # Per day
+    volatility: float  # Annualized volatility used for pricing
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    """
+    Standard normal CDF
+
+    Uses the Chebyshev erfc approximation from Numerical Recipes (relative
+    error below 1.2e-7 everywhere, including the tails).
+    """
+    x = np.asarray(x, dtype=float)
+    z = np.abs(x) / _SQRT2
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = -1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (
+        -0.18628806 + t * (0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (
+            -0.82215223 + t * 0.17087277))))))))
+    erfc = t * np.exp(-z * z + poly)
+    return np.where(x >= 0, 1.0 - 0.5 * erfc, 0.5 * erfc)
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, dtype=float)
+    return np.exp(-0.5 * x * x) / _SQRT_2PI
+
+
+def black_scholes(
+    spot,
+    strike,
+    time,
+    volatility,
+    rate: float = 0.0,
+    is_call=True
+) -> OptionGreeks:
+    """
+    European option prices and Greeks for whole chains at once
+
+    All arguments broadcast against each other, so a chain is priced by
+    passing an array of strikes (and optionally expiries, volatilities and
+    call/put flags).
+
+    Args:
+        spot: Underlying price
+        strike: Strike price(s)
+        time: Years to expiry (> 0)
+        volatility: Annualized volatility (> 0)
+        rate: Continuously compounded risk-free rate
+        is_call: True for calls, False for puts (bool or boolean array)
+
+    Returns:
+        OptionGreeks
+    """
+    spot, strike, time, volatility, is_call = np.broadcast_arrays(
+        np.asarray(spot, dtype=float), np.asarray(strike, dtype=float),
+        np.asarray(time, dtype=float), np.asarray(volatility, dtype=float),
+        np.asarray(is_call, dtype=bool)
+    )
+
+    sqrt_t = np.sqrt(time)
+    vol_sqrt_t = volatility * sqrt_t
+    d1 = (np.log(spot / strike) + (rate + 0.5 * volatility ** 2) * time) / vol_sqrt_t
+    d2 = d1 - vol_sqrt_t
+    discount = np.exp(-rate * time)
+    pdf_d1 = norm_pdf(d1)
+
+    # Put values via N(-x) = 1 - N(x) applied to the signed arguments
+    sign = np.where(is_call, 1.0, -1.0)
+    cdf_d1 = norm_cdf(sign * d1)
+    cdf_d2 = norm_cdf(sign * d2)
+
+    price = sign * (spot * cdf_d1 - strike * discount * cdf_d2)
+    delta = sign * cdf_d1
+    gamma = pdf_d1 / (spot * vol_sqrt_t)
+    vega = spot * pdf_d1 * sqrt_t
+    theta = -spot * pdf_d1 * volatility / (2 * sqrt_t) - sign * rate * strike * discount * cdf_d2
+
+    return OptionGreeks(price=price, delta=delta, gamma=gamma, vega=vega, theta=theta)
+
+
+def implied_volatility(
+    price,
+    spot,
+    strike,
+    time,
+    rate: float = 0.0,
+    is_call=True,
+    tol: float = 1e-8,
+    max_iter: int = 100
+) -> np.ndarray:
+    """
+    Implied volatility for many option prices at once
+
+    Runs safeguarded Newton iterations on every option together: each
+    option keeps a bracket [low, high] around its root, and a Newton step
+    that leaves the bracket (or has vanishing vega) is replaced by
+    bisection, so deep in/out-of-the-money options still converge.
+
+    Args:
+        price: Observed option price(s)
+        spot, strike, time, rate, is_call: As in black_scholes
+        tol: Volatility tolerance for convergence
+        max_iter: Maximum iterations
+
+    Returns:
+        Implied volatilities; NaN where the price is outside no-arbitrage bounds
+    """
+    price, spot, strike, time, is_call = np.broadcast_arrays(
+        np.asarray(price, dtype=float), np.asarray(spot, dtype=float),
+        np.asarray(strike, dtype=float), np.asarray(time, dtype=float),
+        np.asarray(is_call, dtype=bool)
+    )
+    discount = np.exp(-rate * time)
+    intrinsic = np.where(is_call, np.maximum(spot - strike * discount, 0), np.maximum(strike * discount - spot, 0))
+    upper_bound = np.where(is_call, spot, strike * discount)
+    solvable = (price > intrinsic) & (price < upper_bound)
+
+    low = np.full(price.shape, IV_LOWER)
+    high = np.full(price.shape, IV_UPPER)
+    vol = np.full(price.shape, 0.5)
+    active = solvable.copy()
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        greeks = black_scholes(spot[active], strike[active], time[active], vol[active], rate, is_call[active])
+        diff = greeks.price - price[active]
+
+        # Price increases with volatility, so the sign of diff moves the bracket
+        high[active] = np.where(diff > 0, vol[active], high[active])
+        low[active] = np.where(diff < 0, vol[active], low[active])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = vol[active] - diff / greeks.vega
+        lo, hi = low[active], high[active]
+        inside = np.isfinite(newton) & (newton > lo) & (newton < hi)
+        step = np.where(diff == 0, vol[active], np.where(inside, newton, 0.5 * (lo + hi)))
+
+        converged = np.zeros(price.shape, dtype=bool)
+        converged[active] = (np.abs(step - vol[active]) < tol) | (hi - lo < tol)
+        vol[active] = step
+        active &= ~converged
+
+    return np.where(solvable, vol, np.nan)
+
+
+def realized_volatility(closes, periods_per_year: float) -> float:
+    """Annualized standard deviation of log returns"""
+    closes = np.asarray(closes, dtype=float)
+    if len(closes) < 3:
+        return 0.0
+    returns = np.diff(np.log(closes))
+    return float(returns.std(ddof=1) * math.sqrt(periods_per_year))
+
+
+def strike_step(spot: float) -> float:
+    """Strike spacing of about 1% of spot, rounded to 1, 2 or 5 times a power of ten"""
+    raw = spot * 0.01
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for multiple in (1, 2, 5, 10):
+        if multiple * magnitude >= raw:
+            return multiple * magnitude
+    return 10 * magnitude
+
+
+def suggest_strike(
+    signal: str,
+    spot: float,
+    volatility: float,
+    expiry_days: float = 7.0,
+    target_delta: float = 0.30,
+    rate: float = 0.0,
+    strikes_per_side: int = 20
+) -> Optional[OptionSuggestion]:
+    """
+    Strike whose delta is closest to the target for a signal
+
+    Args:
+        signal: "BUY_CALL" or "BUY_PUT" (anything else returns None)
+        spot: Current underlying price
+        volatility: Annualized volatility used for pricing
+        expiry_days: Days to expiry
+        target_delta: Absolute delta to aim for (0.5 is at the money)
+        rate: Risk-free rate
+        strikes_per_side: Strikes listed above and below spot
+
+    Returns:
+        OptionSuggestion, or None for non-trade signals or unusable inputs
+    """
+    if signal not in ("BUY_CALL", "BUY_PUT") or spot <= 0 or volatility <= 0 or expiry_days <= 0:
+        return None
+
+    is_call = signal == "BUY_CALL"
+    step = strike_step(spot)
+    center = round(spot / step) * step
+    strikes = center + np.arange(-strikes_per_side, strikes_per_side + 1) * step
+    strikes = strikes[strikes > 0]
+    time = expiry_days / DAYS_PER_YEAR
+
+    chain = black_scholes(spot, strikes, time, volatility, rate, is_call)
+    best = int(np.argmin(np.abs(np.abs(chain.delta) - target_delta)))
+
+    return OptionSuggestion(
+        option_type="CALL" if is_call else "PUT",
+        strike=float(strikes[best]),
+        expiry_days=expiry_days,
+        premium=float(chain.price[best]),
+        delta=float(chain.delta[best]),
+        gamma=float(chain.gamma[best]),
+        vega=float(chain.vega[best]),
+        theta=float(chain.theta[best] / DAYS_PER_YEAR),
+        volatility=float(volatility)
+    )
@@ -0,0 +1,274 @@
+"""
+Backtest Performance Engine
+Turns signals and their exits into positions, returns, an equity curve and metrics
+"""
+
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .exits import ExitResult, find_exits
+from .normalize import infer_step
+from .signals import SignalGenerator
+
+
+# Bars per year for annualizing Sharpe/Sortino
+PERIODS_PER_YEAR = {
+    "1m": 525600,
+    "5m": 105120,
+    "15m": 35040,
+    "30m": 17520,
+    "1h": 8760,
+    "4h": 2190,
+    "1d": 365,
+}
+YEAR_MS = 365 * 24 * 3600 * 1000
+
+
+def periods_per_year(timestamps, interval: str = "1h") -> float:
+    """
+    Bars per year for the spacing the candles actually have
+
+    Providers do not always honor the requested interval (CoinGecko's OHLC
+    endpoint returns 4h candles for any of them), so the spacing is inferred
+    from the timestamps. The interval's nominal value is the fallback when
+    there are too few bars to tell.
+
+    Args:
+        timestamps: Candle open times in ms
+        interval: Requested candle interval
+    """
+    step = infer_step(timestamps)
+    if step:
+        return YEAR_MS / step
+    return PERIODS_PER_YEAR.get(interval, PERIODS_PER_YEAR["1h"])
+
+
+@dataclass
+class PerformanceReport:
+    """Strategy performance over a candle history"""
+    equity: np.ndarray  # Equity curve starting at 1.0, one value per bar
+    returns: np.ndarray  # Strategy return per bar (after fees)
+    positions: np.ndarray  # Position held after each bar's close: 1 long, -1 short, 0 flat
+    total_return: float  # Final equity - 1
+    max_drawdown: float  # Largest peak-to-trough loss as a fraction (0.2 = 20%)
+    sharpe: float  # Annualized
+    sortino: float  # Annualized
+    hit_rate: float  # Percentage of trades with positive return
+    avg_win: float  # Mean return of winning trades
+    avg_loss: float  # Mean return of losing trades (negative)
+    exposure: float  # Fraction of bars spent in a position
+    trades: int
+
+    def summary(self) -> Dict[str, float]:
+        """Scalar metrics without the per-bar arrays"""
+        return {
+            "total_return": self.total_return,
+            "max_drawdown": self.max_drawdown,
+            "sharpe": self.sharpe,
+            "sortino": self.sortino,
+            "hit_rate": self.hit_rate,
+            "avg_win": self.avg_win,
+            "avg_loss": self.avg_loss,
+            "exposure": self.exposure,
+            "trades": self.trades,
+        }
+
+
+def positions_from_exits(
+    buy_call: np.ndarray,
+    buy_put: np.ndarray,
+    exits: ExitResult
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert signal masks and their exits into a position series
+
+    A BUY_CALL goes long and a BUY_PUT goes short at the signal bar's close.
+    The position is closed at its exit bar (take-profit, stop-loss or time
+    exit), or held to the end while still open. A new signal before the exit
+    replaces the position and may flip the direction.
+
+    Args:
+        buy_call: Boolean mask of BUY_CALL bars
+        buy_put: Boolean mask of BUY_PUT bars
+        exits: find_exits result for every signal bar, in time order
+
+    Returns:
+        Tuple of (int8 positions held after each bar's close, exit fill price
+        per bar, NaN where the bar's close applies)
+    """
+    direction = buy_call.astype(np.int8) - buy_put.astype(np.int8)
+    n = len(direction)
+    bars = np.arange(n)
+    entries = np.flatnonzero(direction)
+
+    # Exit bar of every bar's signal (n while still open)
+    exit_bar = np.full(n, n)
+    exit_bar[entries] = np.where(exits.exit_bar >= 0, exits.exit_bar, n)
+
+    last_signal = np.maximum.accumulate(np.where(direction != 0, bars, -1))
+    latest = np.maximum(last_signal, 0)
+    held = (last_signal >= 0) & (bars < exit_bar[latest])
+    positions = np.where(held, direction[latest], 0).astype(np.int8)
+
+    # Exits that happen (no later signal replaced the trade first) fill at their price
+    following = np.append(entries[1:], n)
+    filled = (exits.exit_bar >= 0) & (following >= exits.exit_bar)
+    fills = np.full(n, np.nan)
+    fills[exits.exit_bar[filled]] = exits.exit_price[filled]
+    return positions, fills
+
+
+def evaluate_positions(
+    closes: np.ndarray,
+    positions: np.ndarray,
+    fee: float = 0.0,
+    periods_per_year: float = PERIODS_PER_YEAR["1h"],
+    fills: Optional[np.ndarray] = None
+) -> PerformanceReport:
+    """
+    Compute returns, equity curve and metrics for a position series
+
+    The position held after bar t's close earns bar t+1's close-to-close
+    return, or the return to bar t+1's fill price when it is closed there.
+    Fees are charged per unit of position change at the bar where the change
+    happens.
+
+    Args:
+        closes: Close prices
+        positions: Output of positions_from_exits (or any -1/0/1 series)
+        fee: Cost per unit of turnover, as a fraction (0.001 = 10 bps)
+        periods_per_year: Bars per year for annualization
+        fills: Exit price per bar (NaN = the bar's close), e.g. a stop level
+
+    Returns:
+        PerformanceReport
+    """
+    closes = np.asarray(closes, dtype=float)
+    positions = np.asarray(positions, dtype=np.int8)
+    n = len(closes)
+
+    exit_prices = closes if fills is None else np.where(np.isnan(fills), closes, fills)
+    market = np.zeros(n)
+    if n > 1:
+        market[1:] = positions[:-1] * (exit_prices[1:] / closes[:-1] - 1)
+    costs = fee * np.abs(np.diff(positions.astype(float), prepend=0.0))
+    returns = market - costs
+
+    equity = np.cumprod(1 + returns)
+    peaks = np.maximum.accumulate(equity) if n else equity
+    max_drawdown = float(np.max(1 - equity / peaks)) if n else 0.0
+
+    trade_returns = _trade_returns(positions, market, costs)
+    winners = trade_returns[trade_returns > 0]
+    losers = trade_returns[trade_returns <= 0]
+
+    return PerformanceReport(
+        equity=equity,
+        returns=returns,
+        positions=positions,
+        total_return=float(equity[-1] - 1) if n else 0.0,
+        max_drawdown=max_drawdown,
+        sharpe=_sharpe(returns, periods_per_year),
+        sortino=_sortino(returns, periods_per_year),
+        hit_rate=float(len(winners) / len(trade_returns) * 100) if len(trade_returns) else 0.0,
+        avg_win=float(winners.mean()) if len(winners) else 0.0,
+        avg_loss=float(losers.mean()) if len(losers) else 0.0,
+        exposure=float(np.mean(positions != 0)) if n else 0.0,
+        trades=len(trade_returns),
+    )
+
+
+def backtest_performance(
+    candles: List[List],
+    generator: Optional[SignalGenerator] = None,
+    holding_period: Optional[int] = None,
+    fee: float = 0.0,
+    periods_per_year: float = PERIODS_PER_YEAR["1h"]
+) -> PerformanceReport:
+    """
+    Trade the generator's signals over a candle history
+
+    Each signal is closed by the generator's exit rules, the same exits the
+    backtested win rate is scored on.
+
+    Args:
+        candles: List of [timestamp, open, high, low, close, volume]
+        generator: SignalGenerator providing the strategy and exit rules
+        holding_period: Overrides exit_rules.max_bars for the time exit
+        fee: Cost per unit of turnover, as a fraction
+        periods_per_year: Bars per year for annualization
+
+    Returns:
+        PerformanceReport
+    """
+    generator = generator or SignalGenerator()
+    rules = generator.exit_rules
+    if holding_period is not None:
+        rules = replace(rules, max_bars=holding_period)
+
+    closes, buy_call, buy_put = generator.historical_signals(candles)
+    direction = buy_call.astype(np.int8) - buy_put.astype(np.int8)
+    entries = np.flatnonzero(direction)
+    data = np.asarray(candles, dtype=float)
+    exits = find_exits(
+        closes, entries, direction[entries], rules, highs=data[:, 2], lows=data[:, 3]
+    )
+
+    positions, fills = positions_from_exits(buy_call, buy_put, exits)
+    return evaluate_positions(closes, positions, fee, periods_per_year, fills)
+
+
+def _trade_returns(positions: np.ndarray, market: np.ndarray, costs: np.ndarray) -> np.ndarray:
+    """Compounded return of each trade (a run of one non-zero position)"""
+    previous = np.concatenate([[0], positions[:-1]]).astype(np.int8)
+    starts = (positions != 0) & (positions != previous)
+    trades = int(starts.sum())
+    if trades == 0:
+        return np.zeros(0)
+
+    # Trade open after each bar's close (-1 while flat before the first trade)
+    trade_id = np.cumsum(starts) - 1
+    previous_id = np.concatenate([[-1], trade_id[:-1]])
+
+    # Bar t's market return belongs to the trade held after bar t-1
+    held = previous != 0
+    growth = np.bincount(previous_id[held], weights=np.log1p(market[held]), minlength=trades)
+
+    # Costs are split by turnover: the exit leg goes to the trade being closed,
+    # the entry leg to the new one (a flip pays half to each)
+    charged = costs > 0
+    turnover = np.abs(previous.astype(float)) + np.abs(positions.astype(float))
+    exit_share = np.abs(previous[charged]) / turnover[charged]
+    closing = held[charged]
+    opening = starts[charged]
+    growth += np.bincount(
+        previous_id[charged][closing],
+        weights=np.log1p(-costs[charged][closing] * exit_share[closing]),
+        minlength=trades
+    )
+    growth += np.bincount(
+        trade_id[charged][opening],
+        weights=np.log1p(-costs[charged][opening] * (1 - exit_share[opening])),
+        minlength=trades
+    )
+    return np.expm1(growth)
+
+
+def _sharpe(returns: np.ndarray, periods_per_year: float) -> float:
+    if len(returns) < 2:
+        return 0.0
+    std = returns.std(ddof=1)
+    if std == 0:
+        return 0.0
+    return float(returns.mean() / std * np.sqrt(periods_per_year))
+
+
+def _sortino(returns: np.ndarray, periods_per_year: float) -> float:
+    if len(returns) < 2:
+        return 0.0
+    downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2))
+    if downside == 0:
+        return 0.0
+    return float(returns.mean() / downside * np.sqrt(periods_per_year))
@@ -0,0 +1,270 @@
+"""
+Market Data Providers
+Common candle provider interface and a config-driven provider registry
+
+Provider classes are cheap to construct: the client libraries behind them
+(aiohttp for CoinGecko, ccxt for Binance) are imported on first use.
+"""
+
+import math
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Candle interval lengths in milliseconds
+INTERVAL_MS = {
+    "1m": 60 * 1000,
+    "5m": 5 * 60 * 1000,
+    "15m": 15 * 60 * 1000,
+    "30m": 30 * 60 * 1000,
+    "1h": 60 * 60 * 1000,
+    "4h": 4 * 60 * 60 * 1000,
+    "1d": 24 * 60 * 60 * 1000,
+}
+
+DAY_MS = INTERVAL_MS["1d"]
+
+DEFAULT_PROVIDER = "coingecko"
+
+
+def interval_to_ms(interval: str) -> int:
+    """
+    Convert a candle interval string to milliseconds
+
+    Args:
+        interval: Interval such as "1h" or "15m"
+
+    Returns:
+        Interval length in milliseconds
+    """
+    if interval not in INTERVAL_MS:
+        raise ValueError(f"Unsupported interval: {interval}")
+    return INTERVAL_MS[interval]
+
+
+class MarketDataProvider:
+    """Base class for candle providers"""
+
+    name = "base"
+
+    async def fetch_candles(
+        self,
+        symbol: str = "ETH/USDT",
+        interval: str = "1h",
+        limit: int = 720
+    ) -> List[List]:
+        """
+        Fetch OHLCV candles
+
+        Args:
+            symbol: Trading pair (e.g., "ETH/USDT")
+            interval: Candle interval ("1m", "5m", "15m", "1h", "4h", "1d")
+            limit: Number of candles wanted
+
+        Returns:
+            List of [timestamp, open, high, low, close, volume]
+        """
+        raise NotImplementedError
+
+    async def fetch_candles_since(
+        self,
+        symbol: str = "ETH/USDT",
+        interval: str = "1h",
+        since: int = 0,
+        limit: int = 1000
+    ) -> List[List]:
+        """
+        Fetch up to limit candles opening at or after a point in time
+
+        Used for historical backfills. Providers that can only serve the
+        latest window do not implement it.
+
+        Args:
+            symbol: Trading pair (e.g., "ETH/USDT")
+            interval: Candle interval
+            since: Earliest candle open time (ms)
+            limit: Maximum candles in the page
+
+        Returns:
+            List of [timestamp, open, high, low, close, volume], oldest first
+        """
+        raise NotImplementedError(f"{self.name} does not support range fetches")
+
+    def granularity_ms(self, interval: str = "1h", limit: int = 720) -> Optional[int]:
+        """
+        Spacing of the candles fetch_candles returns, in ms
+
+        Returns:
+            The interval's length by default; None when the upstream picks the
+            spacing itself
+        """
+        return interval_to_ms(interval)
+
+    def upstream_stats(self) -> Dict[str, Any]:
+        """Retry and rate limiter counters for the upstream API, if any"""
+        return {}
+
+    async def close(self):
+        """Release provider resources"""
+        pass
+
+
+class CoinGeckoProvider(MarketDataProvider):
+    """CoinGecko OHLC endpoint (granularity is chosen by CoinGecko from days)"""
+
+    name = "coingecko"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        min_request_interval: Optional[float] = None,
+        retry=None
+    ):
+        self._api_key = api_key if api_key is not None else os.getenv('COINGECKO_API_KEY')
+        self._base_url = base_url
+        self._min_request_interval = min_request_interval
+        self._retry = retry
+        self._service = None
+
+    @property
+    def service(self):
+        """Underlying CoinGeckoService, created on first use"""
+        if self._service is None:
+            from .coingecko import CoinGeckoService
+            self._service = CoinGeckoService(
+                api_key=self._api_key,
+                base_url=self._base_url,
+                min_request_interval=self._min_request_interval,
+                retry=self._retry
+            )
+        return self._service
+
+    async def fetch_candles(
+        self,
+        symbol: str = "ETH/USDT",
+        interval: str = "1h",
+        limit: int = 720
+    ) -> List[List]:
+        # CoinGecko takes a day count rather than a candle count
+        days = math.ceil(limit * interval_to_ms(interval) / DAY_MS)
+        days = min(max(days, 1), 365)
+        return await self.service.fetch_ohlc(symbol, days)
+
+    def granularity_ms(self, interval: str = "1h", limit: int = 720) -> Optional[int]:
+        return None  # Chosen by CoinGecko from the day count
+
+    def upstream_stats(self) -> Dict[str, Any]:
+        if self._service is None:
+            return {}
+        stats = {"retry": dict(self._service.retry.stats)}
+        if self._service.limiter is not None:
+            stats["limiter"] = dict(self._service.limiter.stats)
+        return stats
+
+    async def close(self):
+        if self._service is not None:
+            await self._service.close()
+
+
+class BinanceProvider(MarketDataProvider):
+    """Binance klines via ccxt"""
+
+    name = "binance"
+
+    def __init__(
+        self,
+        mock_fallback: bool = False,
+        base_url: Optional[str] = None,
+        min_request_interval: Optional[float] = None,
+        retry=None
+    ):
+        # Random mock candles must not pass for real data outside development
+        self._mock_fallback = mock_fallback
+        self._base_url = base_url
+        self._min_request_interval = min_request_interval
+        self._retry = retry
+        self._service = None
+
+    @property
+    def service(self):
+        """Underlying BinanceService, created (and ccxt imported) on first use"""
+        if self._service is None:
+            from .binance import BinanceService
+            self._service = BinanceService(
+                mock_fallback=self._mock_fallback,
+                base_url=self._base_url,
+                min_request_interval=self._min_request_interval,
+                retry=self._retry
+            )
+        return self._service
+
+    async def fetch_candles(
+        self,
+        symbol: str = "ETH/USDT",
+        interval: str = "1h",
+        limit: int = 720
+    ) -> List[List]:
+        return await self.service.fetch_ohlcv(symbol, interval, limit)
+
+    async def fetch_candles_since(
+        self,
+        symbol: str = "ETH/USDT",
+        interval: str = "1h",
+        since: int = 0,
+        limit: int = 1000
+    ) -> List[List]:
+        return await self.service.fetch_ohlcv_since(symbol, interval, since, limit)
+
+    def upstream_stats(self) -> Dict[str, Any]:
+        if self._service is None:
+            return {}
+        stats = {"retry": dict(self._service.retry.stats)}
+        if self._service.limiter is not None:
+            stats["limiter"] = dict(self._service.limiter.stats)
+        return stats
+
+    async def close(self):
+        if self._service is not None:
+            await self._service.close()
+
+
+_REGISTRY: Dict[str, Callable[..., MarketDataProvider]] = {
+    CoinGeckoProvider.name: CoinGeckoProvider,
+    BinanceProvider.name: BinanceProvider,
+}
+
+
+def register_provider(name: str, factory: Callable[..., MarketDataProvider]):
+    """
+    Register a provider factory under a config name
+
+    Args:
+        name: Name used in MARKET_DATA_PROVIDER
+        factory: Callable returning a MarketDataProvider
+    """
+    _REGISTRY[name.lower()] = factory
+
+
+def available_providers() -> List[str]:
+    """Names of all registered providers"""
+    return sorted(_REGISTRY)
+
+
+def create_provider(name: Optional[str] = None, **kwargs) -> MarketDataProvider:
+    """
+    Create a provider by name
+
+    Args:
+        name: Registered provider name (default: MARKET_DATA_PROVIDER env, then "coingecko")
+        **kwargs: Passed to the provider factory
+
+    Returns:
+        MarketDataProvider instance
+    """
+    name = (name or os.getenv('MARKET_DATA_PROVIDER') or DEFAULT_PROVIDER).lower()
+    if name not in _REGISTRY:
+        raise ValueError(
+            f"Unknown market data provider '{name}'. Available: {', '.join(available_providers())}"
+        )
+    return _REGISTRY[name](**kwargs)
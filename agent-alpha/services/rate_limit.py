@@ -0,0 +1,69 @@
+"""
+Rate Limiter
+Async limiter shared by every task that calls the same upstream
+"""
+
+import asyncio
+import time
+from typing import Callable, Dict
+
+
+class RateLimiter:
+    """
+    Spaces requests to at most `rate` per second with bursts of `burst`
+
+    Uses the generic cell rate algorithm: each acquire() reserves the next
+    slot on a single schedule, so concurrent callers are served in arrival
+    order and no caller can starve another.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize rate limiter
+
+        Args:
+            rate: Requests per second
+            burst: Requests allowed back to back after an idle period
+            clock: Monotonic time source (injectable for tests)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._interval = 1.0 / rate
+        self._tat = clock()  # Theoretical arrival time of the next request
+        self.stats: Dict[str, float] = {"acquired": 0, "waited": 0, "wait_seconds": 0.0}
+
+    def reserve(self) -> float:
+        """
+        Claim the next slot
+
+        Returns:
+            Seconds the caller must wait before sending
+        """
+        now = self._clock()
+        tat = max(self._tat, now)
+        wait = max(0.0, tat - (self.burst - 1) * self._interval - now)
+        self._tat = tat + self._interval
+        self.stats["acquired"] += 1
+        if wait > 0:
+            self.stats["waited"] += 1
+            self.stats["wait_seconds"] += wait
+        return wait
+
+    def pause(self, seconds: float):
+        """Hold every caller off for `seconds` (e.g. after the upstream sent Retry-After)"""
+        resume = self._clock() + seconds + (self.burst - 1) * self._interval
+        self._tat = max(self._tat, resume)
+
+    async def acquire(self):
+        """Wait for the next slot"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
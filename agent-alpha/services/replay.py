@@ -0,0 +1,241 @@
+"""
+Candle Replay Harness
+Feeds recorded candles bar by bar through the market data -> indicator ->
+signal path, optionally paced at a multiple of real time, and records
+signals, stage latencies and throughput
+
+Usage:
+    python -m services.replay candles.csv --symbol ETH/USDT --interval 1h --speedup 3600
+    python -m services.replay --store data/candles --symbol ETH/USDT --output report.json
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .backtest_cache import BacktestCache
+from .candle_store import CandleStore, candles_to_array
+from .indicator_engine import IndicatorEngine, latest_values
+from .market_data import MarketDataService
+from .metrics import LatencyTracker
+from .providers import MarketDataProvider, interval_to_ms
+from .signals import SignalGenerator
+
+
+STAGES = ("fetch", "indicators", "signal", "total")
+
+
+def load_candle_file(path: str) -> np.ndarray:
+    """
+    Read candles from a CSV or .npz file
+
+    CSV rows are timestamp,open,high,low,close,volume (a header row is
+    skipped). An .npz file holds either one (N, 6) "candles" array or one
+    array per column, as written by CandleStore.
+
+    Returns:
+        (N, 6) float array sorted by timestamp
+    """
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            if "candles" in data:
+                candles = candles_to_array(data["candles"])
+            else:
+                candles = np.column_stack([
+                    data[c].astype(float) for c in ("timestamp", "open", "high", "low", "close", "volume")
+                ])
+    else:
+        with open(path) as f:
+            first = f.readline()
+        try:
+            float(first.split(",")[0])
+            skip = 0
+        except ValueError:
+            skip = 1  # Header row
+        candles = candles_to_array(np.loadtxt(path, delimiter=",", skiprows=skip, ndmin=2)[:, :6])
+    return candles[np.argsort(candles[:, 0], kind="stable")]
+
+
+class ReplayProvider(MarketDataProvider):
+    """Serves recorded candles up to a movable cursor, like a live feed"""
+
+    name = "replay"
+
+    def __init__(self, candles: np.ndarray):
+        """
+        Initialize replay provider
+
+        Args:
+            candles: (N, 6) candle array in time order
+        """
+        self.candles = candles
+        self.cursor = 0  # Number of candles "closed" so far
+
+    async def fetch_candles(self, symbol: str = "ETH/USDT", interval: str = "1h", limit: int = 720) -> List[List]:
+        start = max(0, self.cursor - limit)
+        return self.candles[start:self.cursor].tolist()
+
+
+@dataclass
+class ReplayReport:
+    """What a replay produced and how fast"""
+    symbol: str
+    interval: str
+    bars: int  # Bars replayed
+    elapsed_seconds: float
+    bars_per_second: float
+    speedup: Optional[float]  # None = as fast as possible
+    signal_counts: Dict[str, int]
+    latency: Dict[str, Dict[str, float]]  # Stage -> LatencyTracker summary
+    signals: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class ReplayHarness:
+    """
+    Replays candles through MarketDataService, IndicatorEngine and SignalGenerator
+
+    Each step closes one more candle, fetches the latest window through the
+    market data service (as the API does), computes the indicators served by
+    /indicators and generates the /analyze signal. Time is virtual: the
+    market data cache sees the replayed candle's timestamp as "now".
+    """
+
+    def __init__(
+        self,
+        candles: np.ndarray,
+        symbol: str = "ETH/USDT",
+        interval: str = "1h",
+        window: int = 720,
+        speedup: Optional[float] = None,
+        generator: Optional[SignalGenerator] = None
+    ):
+        """
+        Initialize replay harness
+
+        Args:
+            candles: (N, 6) candle array in time order
+            symbol: Symbol the candles belong to
+            interval: Candle interval (sets real-time pacing)
+            window: Candles fetched per step (the API uses 720)
+            speedup: Replay this many times faster than real time (None = no pacing)
+            generator: SignalGenerator under test (default: one with a backtest cache)
+        """
+        self.symbol = symbol
+        self.interval = interval
+        self.window = window
+        self.speedup = speedup
+        self.provider = ReplayProvider(candles)
+        self.generator = generator or SignalGenerator(backtest_cache=BacktestCache())
+        self._now = 0.0
+        # Every step is a new bar, so always refetch rather than serve cached candles
+        self.market_data = MarketDataService(
+            self.provider, fresh_ttl=0.0, max_stale=0.0, clock=lambda: self._now
+        )
+
+    async def run(self, warmup: int = 50, limit: Optional[int] = None) -> ReplayReport:
+        """
+        Replay the candles
+
+        Args:
+            warmup: Candles available before the first step
+            limit: Maximum number of steps (default: all remaining candles)
+
+        Returns:
+            ReplayReport
+        """
+        candles = self.provider.candles
+        last = len(candles) if limit is None else min(len(candles), warmup + limit)
+        trackers = {stage: LatencyTracker(window=max(last - warmup, 1)) for stage in STAGES}
+        signals = []
+        bar_seconds = interval_to_ms(self.interval) / 1000
+
+        started = time.perf_counter()
+        for step, cursor in enumerate(range(warmup + 1, last + 1)):
+            if self.speedup:
+                # Pace to a schedule so processing time does not accumulate as drift
+                delay = started + step * bar_seconds / self.speedup - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            self.provider.cursor = cursor
+            self._now = candles[cursor - 1, 0] / 1000
+
+            t0 = time.perf_counter()
+            snapshot = await self.market_data.get_candles(self.symbol, self.interval, self.window)
+            t1 = time.perf_counter()
+            indicators = latest_values(
+                IndicatorEngine(snapshot.candles).compute(["rsi", "bollinger", "macd", "atr"])
+            )
+            t2 = time.perf_counter()
+            signal = self.generator.generate_signal(snapshot.candles, cache_key=(self.symbol, self.interval))
+            t3 = time.perf_counter()
+
+            for stage, seconds in zip(STAGES, (t1 - t0, t2 - t1, t3 - t2, t3 - t0)):
+                trackers[stage].record(seconds)
+            signals.append({
+                "timestamp": int(candles[cursor - 1, 0]),
+                "price": float(candles[cursor - 1, 4]),
+                "signal": signal.signal,
+                "confidence": signal.confidence,
+                "win_rate": signal.win_rate,
+                "rsi": indicators.get("rsi"),
+            })
+
+        elapsed = time.perf_counter() - started
+        counts: Dict[str, int] = {}
+        for record in signals:
+            counts[record["signal"]] = counts.get(record["signal"], 0) + 1
+
+        return ReplayReport(
+            symbol=self.symbol,
+            interval=self.interval,
+            bars=len(signals),
+            elapsed_seconds=round(elapsed, 6),
+            bars_per_second=round(len(signals) / elapsed, 3) if elapsed > 0 else 0.0,
+            speedup=self.speedup,
+            signal_counts=counts,
+            latency={stage: tracker.summary() for stage, tracker in trackers.items()},
+            signals=signals,
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Replay recorded candles through the signal pipeline")
+    parser.add_argument("path", nargs="?", help="CSV or .npz candle file")
+    parser.add_argument("--store", help="Read candles from this CandleStore directory instead of a file")
+    parser.add_argument("--symbol", default="ETH/USDT")
+    parser.add_argument("--interval", default="1h")
+    parser.add_argument("--window", type=int, default=720, help="Candles fetched per step")
+    parser.add_argument("--warmup", type=int, default=50, help="Candles available before the first step")
+    parser.add_argument("--limit", type=int, help="Maximum number of steps")
+    parser.add_argument("--speedup", type=float, help="Times faster than real time (default: unpaced)")
+    parser.add_argument("--output", help="Write the full report (including every signal) as JSON")
+    args = parser.parse_args(argv)
+
+    if args.store:
+        candles = CandleStore(args.store).load(args.symbol, args.interval)
+    elif args.path:
+        candles = load_candle_file(args.path)
+    else:
+        parser.error("a candle file or --store is required")
+    if len(candles) <= args.warmup:
+        parser.error(f"need more than {args.warmup} candles, got {len(candles)}")
+
+    harness = ReplayHarness(candles, args.symbol, args.interval, args.window, args.speedup)
+    report = asyncio.run(harness.run(warmup=args.warmup, limit=args.limit))
+
+    summary = asdict(report)
+    summary.pop("signals")
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(asdict(report), f)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Resilience Primitives
+Circuit breaker guarding calls to upstream market data providers
+"""
+
+import time
+from typing import Any, Awaitable, Callable
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Three-state circuit breaker
+
+    - CLOSED: calls pass through; consecutive failures are counted
+    - OPEN: calls are rejected immediately until reset_timeout elapses
+    - HALF_OPEN: a limited number of probe calls are let through; a success
+      closes the circuit, a failure re-opens it
+    """
+
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize circuit breaker
+
+        Args:
+            failure_threshold: Consecutive failures before the circuit opens
+            reset_timeout: Seconds to stay open before allowing probes
+            half_open_max_calls: Concurrent probe calls allowed while half-open
+            clock: Monotonic time source (injectable for tests)
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        if half_open_max_calls < 1:
+            raise ValueError("half_open_max_calls must be at least 1")
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving OPEN -> HALF_OPEN once the timeout elapsed"""
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probes_in_flight = 0
+        return self._state
+
+    @property
+    def failures(self) -> int:
+        """Consecutive failures recorded while closed"""
+        return self._failures
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may proceed, reserving a probe slot when half-open
+
+        Returns:
+            True if the caller may contact the upstream
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and self._probes_in_flight < self.half_open_max_calls:
+            self._probes_in_flight += 1
+            return True
+        return False
+
+    def record_success(self):
+        """Record a successful call and close the circuit"""
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probes_in_flight = 0
+
+    def record_failure(self):
+        """Record a failed call, opening the circuit when the threshold is hit"""
+        if self._state == self.HALF_OPEN:
+            self._trip()
+            return
+
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            self._trip()
+
+    def _trip(self):
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._probes_in_flight = 0
+
+    def _release_probe(self):
+        if self._state == self.HALF_OPEN and self._probes_in_flight > 0:
+            self._probes_in_flight -= 1
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Run an async callable through the breaker
+
+        Raises:
+            CircuitOpenError: If the circuit rejects the call
+        """
+        if not self.allow_request():
+            raise CircuitOpenError("Circuit open: upstream temporarily disabled")
+
+        try:
+            result = await func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            # Cancellation says nothing about upstream health; free the probe slot
+            self._release_probe()
+            raise
+
+        self.record_success()
+        return result
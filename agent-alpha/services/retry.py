@@ -0,0 +1,153 @@
+"""
+Retry Policy
+Retries transient upstream failures with jittered exponential backoff,
+honoring Retry-After and an overall deadline
+"""
+
+import asyncio
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .rate_limit import RateLimiter
+
+
+# HTTP statuses worth another attempt
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class RetryableError(Exception):
+    """A transient upstream failure (throttling, 5xx, connection or timeout)"""
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after  # Seconds the upstream asked us to wait
+
+
+def parse_retry_after(value: Optional[str], now: Callable[[], float] = time.time) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)
+
+    Returns:
+        Non-negative seconds, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - now())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Runs an async call, retrying RetryableError
+
+    Waits follow "full jitter" exponential backoff: a random delay up to
+    base_delay * 2**retry, capped at max_delay. When the upstream sends
+    Retry-After, that wait is honored (plus a little jitter so callers do
+    not return in lockstep) and the shared rate limiter is paused for the
+    same time, so other requests to the upstream hold off too instead of
+    adding to the congestion. Every attempt takes a limiter slot. No retry
+    is started that could not finish before the overall deadline; the last
+    error is raised instead.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        deadline: float = 20.0,
+        limiter: Optional[RateLimiter] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        jitter: Callable[[], float] = random.random
+    ):
+        """
+        Initialize retry policy
+
+        Args:
+            max_attempts: Attempts per call, including the first
+            base_delay: Backoff scale in seconds
+            max_delay: Longest single backoff wait
+            deadline: Seconds from the first attempt after which no retry starts
+            limiter: Rate limiter shared by everything calling this upstream
+            clock: Monotonic time source (injectable for tests)
+            sleep: Async sleep (injectable for tests)
+            jitter: Uniform [0, 1) source (injectable for tests)
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.limiter = limiter
+        self._clock = clock
+        self._sleep = sleep
+        self._jitter = jitter
+
+        self.stats: Dict[str, float] = {
+            "calls": 0,
+            "attempts": 0,
+            "retries": 0,
+            "throttled": 0,  # Failures that carried Retry-After or status 429
+            "gave_up": 0,  # Calls that failed after retrying or hitting the deadline
+            "wait_seconds": 0.0,
+        }
+
+    @classmethod
+    def from_env(cls, limiter: Optional[RateLimiter] = None) -> "RetryPolicy":
+        """Policy configured by RETRY_MAX_ATTEMPTS, RETRY_BASE_DELAY and RETRY_DEADLINE"""
+        return cls(
+            max_attempts=int(os.getenv('RETRY_MAX_ATTEMPTS', '4')),
+            base_delay=float(os.getenv('RETRY_BASE_DELAY', '0.5')),
+            deadline=float(os.getenv('RETRY_DEADLINE', '20')),
+            limiter=limiter,
+        )
+
+    def backoff(self, retry: int, error: RetryableError) -> float:
+        """Seconds to wait before retry number `retry` (0-based)"""
+        jitter = self._jitter()
+        if error.retry_after is not None:
+            return error.retry_after + jitter * self.base_delay
+        return jitter * min(self.max_delay, self.base_delay * 2 ** retry)
+
+    async def call(self, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Call fn(*args, **kwargs), retrying transient failures
+
+        Raises:
+            RetryableError: The last failure, once attempts or the deadline run out
+            Exception: Any non-retryable error, immediately
+        """
+        self.stats["calls"] += 1
+        give_up_at = self._clock() + self.deadline
+        for attempt in range(self.max_attempts):
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            self.stats["attempts"] += 1
+            try:
+                return await fn(*args, **kwargs)
+            except RetryableError as e:
+                throttled = e.retry_after is not None or e.status == 429
+                if throttled:
+                    self.stats["throttled"] += 1
+                wait = self.backoff(attempt, e)
+                if attempt + 1 >= self.max_attempts or self._clock() + wait > give_up_at:
+                    self.stats["gave_up"] += 1
+                    raise
+                if throttled and e.retry_after and self.limiter is not None:
+                    self.limiter.pause(e.retry_after)
+                self.stats["retries"] += 1
+                self.stats["wait_seconds"] += wait
+                await self._sleep(wait)
@@ -0,0 +1,120 @@
+"""
+Candle Ring Buffer
+Fixed-capacity OHLCV window with O(1) append and zero-copy column views
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .candle_store import COLUMNS, candles_to_array
+
+
+class CandleRing:
+    """
+    Last `capacity` candles stored column by column
+
+    Each column is kept twice, back to back (a mirrored ring): every value
+    is written at its slot and at slot + capacity. The newest n values of a
+    column are then always one contiguous slice, so views for indicator
+    functions never need a copy, and appending stays O(1) once the buffer
+    is full (the oldest candle is overwritten).
+
+    Views share memory with the buffer. They stay correct until `capacity`
+    further candles are appended; copy them to keep them longer.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float64):
+        """
+        Initialize ring buffer
+
+        Args:
+            capacity: Maximum number of candles held
+            dtype: Storage dtype for every column
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._data = np.zeros((len(COLUMNS), 2 * capacity), dtype=dtype)
+        self._index = {name: i for i, name in enumerate(COLUMNS)}
+        self._next = 0  # Slot the next candle is written to
+        self._size = 0
+        self.appended = 0  # Candles appended over the buffer's lifetime
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def full(self) -> bool:
+        return self._size == self.capacity
+
+    def append(self, candle: Sequence[float]):
+        """
+        Add one [timestamp, open, high, low, close, volume] candle,
+        evicting the oldest when full
+        """
+        slot = self._next
+        values = np.asarray(candle, dtype=self._data.dtype)[:len(COLUMNS)]
+        self._data[:, slot] = values
+        self._data[:, slot + self.capacity] = values
+        self._advance(1)
+
+    def extend(self, candles):
+        """Add candles in order (only the last `capacity` are kept)"""
+        data = candles_to_array(candles)[-self.capacity:].T
+        count = data.shape[1]
+        if count == 0:
+            return
+        self.appended += len(candles) - count
+        first = min(count, self.capacity - self._next)
+        for offset in (0, self.capacity):
+            self._data[:, offset + self._next:offset + self._next + first] = data[:, :first]
+            self._data[:, offset:offset + count - first] = data[:, first:]
+        self._advance(count)
+
+    def column(self, name: str, n: Optional[int] = None) -> np.ndarray:
+        """
+        The newest n values of a column, oldest first, as a read-only view
+
+        Args:
+            name: One of timestamp, open, high, low, close, volume
+            n: Number of values (default: everything held)
+        """
+        n = self._size if n is None else min(n, self._size)
+        end = self._next + self.capacity
+        view = self._data[self._index[name], end - n:end]
+        view.flags.writeable = False
+        return view
+
+    def columns(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Views of every column, in the form IndicatorEngine(columns=...) takes"""
+        return {name: self.column(name, n) for name in COLUMNS}
+
+    def latest(self, name: str = "close") -> float:
+        if not self._size:
+            raise IndexError("ring buffer is empty")
+        return float(self._data[self._index[name], self._next + self.capacity - 1])
+
+    def to_array(self, n: Optional[int] = None) -> np.ndarray:
+        """Copy of the newest n candles as an (n, 6) array"""
+        return np.column_stack([self.column(name, n) for name in COLUMNS])
+
+    def drop_oldest(self, count: int):
+        """Forget the oldest `count` candles (e.g. when a window slides forward)"""
+        self._size -= min(max(count, 0), self._size)
+
+    def drop_newest(self, count: int):
+        """Forget the newest `count` candles (e.g. a revised forming candle)"""
+        count = min(max(count, 0), self._size)
+        self._next = (self._next - count) % self.capacity
+        self._size -= count
+
+    def clear(self):
+        self._next = 0
+        self._size = 0
+        self.appended = 0
+
+    def _advance(self, count: int):
+        self._next = (self._next + count) % self.capacity
+        self._size = min(self._size + count, self.capacity)
+        self.appended += count
@@ -0,0 +1,292 @@
+"""
+Universe Scanner
+Runs the signal pipeline over many symbols concurrently and keeps the
+strongest setups, within a latency budget
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .http_cache import candle_fingerprint
+from .market_data import CandleSnapshot, MarketDataService
+from .memory_cache import SizedCache
+from .signals import SignalGenerator, TradingSignal
+from .universe import align_candles, compute_universe_indicators, universe_signal_masks
+
+
+@dataclass
+class ScanResult:
+    """Signal for one symbol"""
+    symbol: str
+    signal: str = "HOLD"
+    confidence: float = 0.0
+    win_rate: float = 0.0
+    price: Optional[float] = None
+    reasoning: str = ""
+    stale: bool = False
+    error: Optional[str] = None
+    elapsed_seconds: float = 0.0
+    evaluated: bool = True  # False: candles fetched, signal not scored yet
+
+
+@dataclass
+class ScanReport:
+    """Top setups of a scan and what it covered"""
+    interval: str
+    top: List[ScanResult]  # Highest confidence first, BUY_CALL / BUY_PUT only
+    scanned: int  # Symbols requested
+    completed: int
+    failed: int
+    timed_out: List[str] = field(default_factory=list)  # Unfinished when the budget ran out
+    elapsed_seconds: float = 0.0
+
+
+class UniverseScanner:
+    """
+    Ranks a universe of symbols by signal confidence
+
+    Candles come through the MarketDataService, so cached histories are
+    reused and concurrent scans share upstream fetches. At most
+    `concurrency` fetches run at once. When the budget runs out, unfinished
+    fetches are cancelled and the scan evaluates what it has. Their upstream
+    fetches are shielded by the MarketDataService and keep running, so they
+    warm the cache for the next scan.
+
+    The fetched symbols are evaluated together: their candles are aligned
+    on one timestamp index, and RSI, Bollinger Bands and the signal masks
+    are computed for the whole universe in one pass. Only symbols with a
+    setup on their latest bar are backtested (through the generator's
+    backtest cache) and scored; the rest are HOLD. Signals are memoized per
+    symbol until its candles change. The best `top_k` setups are kept in a
+    bounded min-heap.
+
+    Streaming (`on_result`) does not wait for that pass where it can avoid
+    it: a symbol whose memoized signal still matches its candles is sent as
+    soon as its fetch completes. Any other symbol is sent twice, first as a
+    provisional result (price and staleness, `evaluated=False`) when its
+    fetch completes, then with its signal once the universe is evaluated.
+    """
+
+    def __init__(
+        self,
+        market_data: MarketDataService,
+        generator: SignalGenerator,
+        limit: int = 720,
+        concurrency: int = 8,
+        cache: Optional[SizedCache] = None
+    ):
+        """
+        Initialize scanner
+
+        Args:
+            market_data: Candle source (with its stale-while-revalidate cache)
+            generator: Signal generator (its backtest cache is reused per symbol)
+            limit: Candles per symbol
+            concurrency: Symbols fetched at once
+            cache: Where signals are memoized (default: a private SizedCache)
+        """
+        self.market_data = market_data
+        self.generator = generator
+        self.limit = limit
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._cache = cache if cache is not None else SizedCache(max_bytes=16 * 1024 * 1024)
+
+    async def scan(
+        self,
+        symbols: List[str],
+        interval: str = "1h",
+        top_k: int = 10,
+        budget: float = 5.0,
+        on_result: Optional[Callable[[ScanResult], None]] = None
+    ) -> ScanReport:
+        """
+        Scan symbols and keep the top_k by confidence
+
+        Args:
+            symbols: Trading pairs
+            interval: Candle interval
+            top_k: Setups to keep
+            budget: Seconds after which unfinished fetches are dropped
+            on_result: Called with each symbol's result (e.g. to stream it)
+                as its fetch completes: failures, memoized signals, and
+                provisional results (evaluated=False) for the rest, whose
+                signals follow once the universe has been evaluated
+
+        Returns:
+            ScanReport
+        """
+        started = time.perf_counter()
+        deadline = started + budget
+        tasks = {
+            asyncio.ensure_future(self._fetch(symbol, interval)): symbol
+            for symbol in dict.fromkeys(symbols)
+        }
+        fetched: Dict[str, Tuple[CandleSnapshot, float]] = {}  # In completion order
+        streamed = set()  # Symbols whose final result has been sent
+        failed = 0
+
+        pending = set(tasks)
+        try:
+            while pending:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    symbol = tasks[task]
+                    error = task.exception()
+                    if error is None:
+                        fetched[symbol] = snapshot, elapsed = task.result()
+                        if on_result is not None:
+                            signal = self._memoized(symbol, interval, snapshot)
+                            if signal is not None:
+                                streamed.add(symbol)
+                            on_result(self._result(symbol, snapshot, signal, elapsed))
+                        continue
+                    failed += 1
+                    if on_result is not None:
+                        on_result(ScanResult(symbol=symbol, error=str(error) or type(error).__name__))
+        finally:
+            for task in pending:
+                task.cancel()
+
+        heap: list = []  # (confidence, tiebreak, result); the weakest kept setup on top
+        order = itertools.count()
+        results = self.evaluate({symbol: snapshot for symbol, (snapshot, _) in fetched.items()}, interval)
+        for result in results:
+            result.elapsed_seconds = fetched[result.symbol][1]
+            if on_result is not None and result.symbol not in streamed:
+                on_result(result)
+            if result.signal == "HOLD" or top_k <= 0:
+                continue
+            # Earlier results win ties
+            entry = (result.confidence, -next(order), result)
+            if len(heap) < top_k:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+
+        return ScanReport(
+            interval=interval,
+            top=[entry[2] for entry in sorted(heap, key=lambda e: e[:2], reverse=True)],
+            scanned=len(tasks),
+            completed=len(results),
+            failed=failed,
+            timed_out=sorted(tasks[task] for task in pending),
+            elapsed_seconds=round(time.perf_counter() - started, 3),
+        )
+
+    async def _fetch(self, symbol: str, interval: str) -> Tuple[CandleSnapshot, float]:
+        """Candles for one symbol and the seconds the fetch took"""
+        started = time.perf_counter()
+        async with self._semaphore:
+            snapshot = await self.market_data.get_candles(symbol, interval, self.limit)
+        return snapshot, round(time.perf_counter() - started, 3)
+
+    def evaluate(self, snapshots: Dict[str, CandleSnapshot], interval: str = "1h") -> List[ScanResult]:
+        """
+        Signals for many symbols, computing indicators for all of them at once
+
+        Args:
+            snapshots: Symbol -> candles from the MarketDataService
+            interval: Candle interval
+
+        Returns:
+            One ScanResult per symbol, in the order given
+        """
+        signals: Dict[str, Union[TradingSignal, Exception]] = {}
+        changed = {}
+        for symbol, snapshot in snapshots.items():
+            cached = self._memoized(symbol, interval, snapshot)
+            if cached is not None:
+                signals[symbol] = cached
+            else:
+                changed[symbol] = snapshot.candles
+
+        if changed:
+            for symbol, signal in self._signals(changed, interval).items():
+                signals[symbol] = signal
+                if isinstance(signal, TradingSignal):
+                    fingerprint = candle_fingerprint(snapshots[symbol].candles)
+                    self._cache.put((symbol, interval, "scan-signal"), (fingerprint, signal))
+
+        return [self._result(symbol, snapshot, signals[symbol]) for symbol, snapshot in snapshots.items()]
+
+    def _memoized(self, symbol: str, interval: str, snapshot: CandleSnapshot) -> Optional[TradingSignal]:
+        """The memoized signal for symbol if its candles have not changed since"""
+        cached = self._cache.get((symbol, interval, "scan-signal"))
+        if cached is not None and cached[0] == candle_fingerprint(snapshot.candles):
+            return cached[1]
+        return None
+
+    @staticmethod
+    def _result(
+        symbol: str,
+        snapshot: CandleSnapshot,
+        signal: Union[TradingSignal, Exception, None],
+        elapsed: float = 0.0
+    ) -> ScanResult:
+        """ScanResult for a symbol's candles and signal (None: not evaluated yet)"""
+        if isinstance(signal, Exception):
+            return ScanResult(symbol=symbol, error=str(signal) or type(signal).__name__, elapsed_seconds=elapsed)
+        candles = snapshot.candles
+        result = ScanResult(
+            symbol=symbol,
+            price=float(candles[-1][4]) if len(candles) else None,
+            stale=snapshot.stale,
+            elapsed_seconds=elapsed,
+        )
+        if signal is None:
+            result.evaluated = False
+            result.reasoning = "Candles fetched; awaiting universe evaluation"
+        else:
+            result.signal = signal.signal
+            result.confidence = signal.confidence
+            result.win_rate = signal.win_rate
+            result.reasoning = signal.reasoning
+        return result
+
+    def _signals(
+        self,
+        candles_by_symbol: Dict[str, List[List]],
+        interval: str
+    ) -> Dict[str, Union[TradingSignal, Exception]]:
+        """Latest-bar signal (or the error scoring it) per symbol from one universe-wide indicator pass"""
+        aligned = align_candles(candles_by_symbol)
+        indicators = compute_universe_indicators(aligned)
+        masks = universe_signal_masks(aligned, indicators, self.generator)
+
+        # Each symbol's latest bar (its candles may end earlier than the index)
+        last = aligned.last_bar
+        setup = np.zeros(len(last), dtype=bool)
+        has_bars = last >= 0
+        setup[has_bars] = (masks["buy_call"] | masks["buy_put"])[has_bars, last[has_bars]]
+
+        signals = {}
+        for row, symbol in enumerate(aligned.symbols):
+            if not setup[row]:
+                signals[symbol] = TradingSignal(
+                    signal="HOLD", confidence=0, win_rate=0,
+                    reasoning="No setup on the latest bar"
+                )
+                continue
+            try:
+                signals[symbol] = self.generator.signal_from_indicators(
+                    candles_by_symbol[symbol],
+                    float(indicators["rsi"][row, last[row]]),
+                    float(indicators["bb_upper"][row, last[row]]),
+                    float(indicators["bb_middle"][row, last[row]]),
+                    float(indicators["bb_lower"][row, last[row]]),
+                    cache_key=(symbol, interval)
+                )
+            except Exception as e:
+                signals[symbol] = e
+        return signals
@@ -0,0 +1,255 @@
+"""
+Shared Candle Cache
+Host-wide candle and signal cache shared by all uvicorn workers through
+memory-mapped files, with one refresher per key
+"""
+
+import asyncio
+import errno
+import fcntl
+import json
+import os
+import struct
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .candle_store import candles_to_array
+from .providers import MarketDataProvider
+
+
+# File layout: magic, fetched_at (unix seconds), row count, then rows * 6 float64
+_MAGIC = b"AACNDL01"
+_HEADER = struct.Struct("<8sdq")
+
+
+def default_directory() -> str:
+    """tmpfs-backed directory when available, so segments live in RAM"""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "agent-alpha")
+
+
+@dataclass
+class SharedEntry:
+    """Candles read from the shared cache"""
+    candles: np.ndarray  # Read-only (N, 6) view of the shared segment
+    fetched_at: float
+
+
+class SharedCandleCache:
+    """
+    Candle windows and small JSON payloads shared between processes
+
+    Each (symbol, interval, limit) window is one file of raw float64 rows.
+    Writers build a new file and rename it over the old one, so readers
+    always see a complete window. Readers memory-map the file read-only:
+    every worker on the host shares the same physical pages and gets the
+    candles as an array view without copying. A replaced file stays valid
+    for readers still holding views of it until they drop them.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Initialize shared cache
+
+        Args:
+            directory: Directory for segments and locks (default: under /dev/shm)
+        """
+        self.directory = directory or default_directory()
+        os.makedirs(self.directory, exist_ok=True)
+        # Path -> (inode, entry): reuse the mapping until the file is replaced
+        self._mapped: Dict[str, Tuple[int, SharedEntry]] = {}
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name.replace("/", "_"))
+
+    @staticmethod
+    def candle_name(symbol: str, interval: str, limit: int) -> str:
+        return f"{symbol}-{interval}-{limit}.candles"
+
+    def read(self, symbol: str, interval: str, limit: int) -> Optional[SharedEntry]:
+        """
+        Map the shared window for a key
+
+        Returns:
+            SharedEntry, or None if no worker has published the key yet
+        """
+        path = self.path(self.candle_name(symbol, interval, limit))
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return None
+        with f:
+            inode = os.fstat(f.fileno()).st_ino
+            cached = self._mapped.get(path)
+            if cached is not None and cached[0] == inode:
+                return cached[1]
+
+            magic, fetched_at, rows = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC:
+                return None
+            candles = np.asarray(np.memmap(
+                f, dtype=np.float64, mode="r", offset=_HEADER.size, shape=(rows, 6)
+            ))
+        entry = SharedEntry(candles=candles, fetched_at=fetched_at)
+        self._mapped[path] = (inode, entry)
+        return entry
+
+    def publish(self, symbol: str, interval: str, limit: int, candles, fetched_at: float) -> SharedEntry:
+        """
+        Atomically replace the shared window for a key
+
+        Returns:
+            The published window, mapped from shared memory
+        """
+        data = np.ascontiguousarray(candles_to_array(candles), dtype=np.float64)
+        path = self.path(self.candle_name(symbol, interval, limit))
+        self._write(path, _HEADER.pack(_MAGIC, fetched_at, len(data)) + data.tobytes())
+        return self.read(symbol, interval, limit)
+
+    def read_json(self, name: str) -> Optional[Any]:
+        try:
+            with open(self.path(f"{name}.json")) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def write_json(self, name: str, payload: Any):
+        self._write(self.path(f"{name}.json"), json.dumps(payload).encode())
+
+    def try_lock(self, name: str) -> Optional[int]:
+        """
+        Take the host-wide lock for a key without blocking
+
+        Returns:
+            File descriptor holding the lock, or None if another holder has it
+        """
+        fd = os.open(self.path(f"{name}.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return fd
+        except OSError as e:
+            os.close(fd)
+            if e.errno in (errno.EAGAIN, errno.EACCES):
+                return None
+            raise
+
+    @staticmethod
+    def unlock(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+    def _write(self, path: str, payload: bytes):
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "wb") as f:
+            f.write(payload)
+        os.replace(temp, path)
+
+
+class SharedProvider(MarketDataProvider):
+    """
+    Provider that shares upstream results between all workers on a host
+
+    A fetch is answered from the shared cache when another worker refreshed
+    the key within ttl. Otherwise the worker that takes the key's lock is
+    the refresher: it fetches upstream and publishes the result, while
+    workers waiting on the lock pick up what it published. Each key is
+    therefore fetched upstream at most once per ttl per host, however many
+    workers run. Candles come back as read-only array views of shared
+    memory.
+    """
+
+    name = "shared"
+
+    def __init__(
+        self,
+        source: MarketDataProvider,
+        cache: SharedCandleCache,
+        ttl: float = 60.0,
+        lock_timeout: float = 30.0,
+        poll_interval: float = 0.01,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize shared provider
+
+        Args:
+            source: Provider used by the refresher
+            cache: Host-wide shared cache
+            ttl: Seconds a published window is served to other workers
+            lock_timeout: Seconds to wait on another worker's refresh before fetching directly
+            poll_interval: Seconds between lock attempts
+            clock: Wall-clock time source (injectable for tests)
+        """
+        self.source = source
+        self.cache = cache
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._clock = clock
+
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "shared_hits": 0,  # Served from a window another worker published
+            "lock_waits": 0,  # Had to wait for another worker's refresh
+            "upstream_fetches": 0,
+        }
+
+    async def fetch_candles(
+        self,
+        symbol: str = "ETH/USDT",
+        interval: str = "1h",
+        limit: int = 720
+    ) -> np.ndarray:
+        self.stats["requests"] += 1
+        fresh = self._fresh(symbol, interval, limit)
+        if fresh is not None:
+            self.stats["shared_hits"] += 1
+            return fresh
+
+        name = self.cache.candle_name(symbol, interval, limit)
+        fd = self.cache.try_lock(name)
+        if fd is None:
+            self.stats["lock_waits"] += 1
+            deadline = self._clock() + self.lock_timeout
+            while fd is None and self._clock() < deadline:
+                await asyncio.sleep(self.poll_interval)
+                fresh = self._fresh(symbol, interval, limit)
+                if fresh is not None:
+                    self.stats["shared_hits"] += 1
+                    return fresh
+                fd = self.cache.try_lock(name)
+
+        try:
+            if fd is not None:
+                # The previous holder may have published while we took the lock
+                fresh = self._fresh(symbol, interval, limit)
+                if fresh is not None:
+                    self.stats["shared_hits"] += 1
+                    return fresh
+            candles = await self.source.fetch_candles(symbol, interval, limit)
+            self.stats["upstream_fetches"] += 1
+            if len(candles) == 0:
+                return candles
+            return self.cache.publish(symbol, interval, limit, candles, self._clock()).candles
+        finally:
+            if fd is not None:
+                self.cache.unlock(fd)
+
+    def _fresh(self, symbol: str, interval: str, limit: int) -> Optional[np.ndarray]:
+        entry = self.cache.read(symbol, interval, limit)
+        if entry is not None and self._clock() - entry.fetched_at < self.ttl:
+            return entry.candles
+        return None
+
+    def granularity_ms(self, interval: str = "1h", limit: int = 720) -> Optional[int]:
+        return self.source.granularity_ms(interval, limit)
+
+    def upstream_stats(self) -> Dict[str, Any]:
+        return self.source.upstream_stats()
+
+    async def close(self):
+        await self.source.close()
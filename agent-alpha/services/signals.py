@@ -3,9 +3,13 @@ Signal Generation Engine
 Implements trading strategy and backtesting for signal generation
 """
 
+import numpy as np
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from .indicators import calculate_rsi, calculate_bollinger_bands, get_price_position
+from .indicator_engine import IndicatorEngine
+from .bootstrap import bootstrap_win_rate
+from .exits import ExitResult, ExitRules, find_exits
 
 
 @dataclass
@@ -15,6 +19,18 @@ class TradingSignal:
     confidence: float  # 0-100
     win_rate: float  # Historical win rate percentage
     reasoning: str
+    win_rate_lower: float = 0.0  # Bootstrap confidence interval for win_rate
+    win_rate_upper: float = 100.0
+    total_signals: int = 0  # Backtest signals behind win_rate
+
+
+@dataclass
+class SignalHistory:
+    """Signal of every bar in a candle history"""
+    timestamps: np.ndarray
+    closes: np.ndarray
+    rsi: np.ndarray  # NaN while warming up
+    signals: np.ndarray  # "BUY_CALL", "BUY_PUT" or "HOLD" per bar
 
 
 class SignalGenerator:
@@ -32,16 +48,47 @@ class SignalGenerator:
     RSI_OVERBOUGHT = 70
     MIN_CONFIDENCE_THRESHOLD = 60  # Minimum confidence to recommend trade
     BACKTEST_LOOKAHEAD = 24  # Hours to look ahead for win/loss determination
+    BACKTEST_MIN_LOOKBACK = 50  # Bars of history before the backtest starts
+    BACKTEST_PROFIT_THRESHOLD = 0.01  # Move required within the lookahead to count a win
+    BOOTSTRAP_RESAMPLES = 5000
+    BOOTSTRAP_CONFIDENCE = 0.95
+    BOOTSTRAP_SEED = 42  # Fixed so identical candles give identical intervals
     
-    def __init__(self):
-        pass
+    def __init__(self, backtest_cache=None, exit_rules: Optional[ExitRules] = None):
+        """
+        Initialize signal generator
+        
+        Args:
+            backtest_cache: Optional BacktestCache used when generate_signal gets a cache_key
+            exit_rules: How backtested signals are closed (default: take profit at
+                BACKTEST_PROFIT_THRESHOLD within BACKTEST_LOOKAHEAD bars)
+        """
+        self.backtest_cache = backtest_cache
+        self.exit_rules = exit_rules or ExitRules(
+            take_profit=self.BACKTEST_PROFIT_THRESHOLD,
+            max_bars=self.BACKTEST_LOOKAHEAD
+        )
     
-    def generate_signal(self, candles: List[List]) -> TradingSignal:
+    @property
+    def params(self) -> Tuple:
+        """Strategy parameters that determine this generator's output"""
+        return (
+            self.RSI_OVERSOLD,
+            self.RSI_OVERBOUGHT,
+            self.MIN_CONFIDENCE_THRESHOLD,
+            self.exit_rules,
+        )
+    
+    def generate_signal(self, candles: List[List], cache_key: Optional[Tuple] = None) -> TradingSignal:
         """
         Generate trading signal based on current market conditions and backtesting
         
         Args:
             candles: List of [timestamp, open, high, low, close, volume]
+            cache_key: Identifies the candle history (e.g. (symbol, interval)). With a
+                backtest cache, the backtest reuses the cached state for the key
+                and only evaluates bars that changed, instead of rescanning the
+                window
         
         Returns:
             TradingSignal with signal, confidence, win_rate, and reasoning
@@ -60,10 +107,50 @@ class SignalGenerator:
         # Calculate current indicators
         current_rsi = calculate_rsi(closes, period=14)
         bb_upper, bb_middle, bb_lower = calculate_bollinger_bands(closes, period=20, std_dev=2)
-        current_price = closes[-1]
+        return self.signal_from_indicators(
+            candles, current_rsi, bb_upper, bb_middle, bb_lower, cache_key=cache_key
+        )
+    
+    def signal_from_indicators(
+        self,
+        candles: List[List],
+        current_rsi: float,
+        bb_upper: float,
+        bb_middle: float,
+        bb_lower: float,
+        cache_key: Optional[Tuple] = None
+    ) -> TradingSignal:
+        """
+        Trading signal for the last candle from already computed indicators
         
-        # Run backtest to get win rate
-        win_rate, total_signals = self._backtest_strategy(candles)
+        generate_signal without the indicator step, for callers that compute
+        RSI and Bollinger Bands for many symbols at once (e.g. a universe scan).
+        The indicators must be those of the last candle (RSI 14, BB 20 / 2).
+        
+        Returns:
+            TradingSignal with signal, confidence, win_rate, and reasoning
+        """
+        if len(candles) < 100:
+            return TradingSignal(
+                signal="HOLD",
+                confidence=0,
+                win_rate=0,
+                reasoning="Insufficient data for analysis"
+            )
+        current_price = candles[-1][4]
+        
+        # Run backtest to get per-signal outcomes and a win rate interval
+        if self.backtest_cache is not None and cache_key is not None:
+            outcomes = self.backtest_cache.outcomes(cache_key, candles, self)
+        else:
+            outcomes = self._backtest_outcomes(candles)
+        win_rate, total_signals = self._summarize_outcomes(outcomes)
+        interval = bootstrap_win_rate(
+            outcomes,
+            n_resamples=self.BOOTSTRAP_RESAMPLES,
+            confidence=self.BOOTSTRAP_CONFIDENCE,
+            seed=self.BOOTSTRAP_SEED
+        )
         
         # Determine signal based on strategy
         signal, reasoning = self._evaluate_conditions(
@@ -71,19 +158,44 @@ class SignalGenerator:
         )
         
         # Calculate confidence based on:
-        # 1. Win rate from backtesting
+        # 1. Win rate from backtesting (lower bound of its confidence interval)
         # 2. Strength of the signal (how extreme RSI and price position are)
         confidence = self._calculate_confidence(
-            signal, current_rsi, current_price, bb_upper, bb_lower, win_rate
+            signal, current_rsi, current_price, bb_upper, bb_lower, win_rate,
+            win_rate_lower=interval.lower
         )
         
         return TradingSignal(
             signal=signal,
             confidence=round(confidence, 1),
             win_rate=round(win_rate, 1),
-            reasoning=reasoning
+            reasoning=reasoning,
+            win_rate_lower=round(interval.lower, 1),
+            win_rate_upper=round(interval.upper, 1),
+            total_signals=total_signals
         )
     
+    def signal_masks(
+        self,
+        prices: np.ndarray,
+        rsi: np.ndarray,
+        bb_upper: np.ndarray,
+        bb_lower: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized BUY_CALL / BUY_PUT conditions over indicator arrays
+        
+        Mirrors _evaluate_conditions element-wise for arrays of any shape.
+        NaN inputs (warm-up or missing bars) never signal.
+        
+        Returns:
+            Tuple of (buy_call_mask, buy_put_mask)
+        """
+        with np.errstate(invalid="ignore"):
+            buy_call = (prices <= bb_lower) & (rsi < self.RSI_OVERSOLD)
+            buy_put = (prices >= bb_upper) & (rsi > self.RSI_OVERBOUGHT) & ~buy_call
+        return buy_call, buy_put
+    
     def _evaluate_conditions(
         self,
         price: float,
@@ -135,6 +247,46 @@ class SignalGenerator:
             f"No clear trading opportunity."
         )
     
+    def historical_signals(self, candles: List[List]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Signal masks for every bar of a candle history
+        
+        Bar i uses indicators computed on closes[:i+1]. Bars before
+        BACKTEST_MIN_LOOKBACK never signal, matching the backtest.
+        
+        Returns:
+            Tuple of (closes, buy_call mask, buy_put mask)
+        """
+        engine, _, buy_call, buy_put = self._historical_masks(candles)
+        return engine.columns["close"], buy_call, buy_put
+    
+    def signal_history(self, candles: List[List]) -> SignalHistory:
+        """
+        BUY_CALL / BUY_PUT / HOLD for every bar, from the same masks the backtest uses
+        
+        Bar i carries the signal _evaluate_conditions gives with indicators
+        computed on closes[:i+1], so markers drawn from it are exactly the
+        entries behind the backtested win rate.
+        """
+        engine, rsi, buy_call, buy_put = self._historical_masks(candles)
+        return SignalHistory(
+            timestamps=engine.columns["timestamp"],
+            closes=engine.columns["close"],
+            rsi=rsi,
+            signals=np.where(buy_call, "BUY_CALL", np.where(buy_put, "BUY_PUT", "HOLD")),
+        )
+    
+    def _historical_masks(self, candles: List[List]) -> Tuple[IndicatorEngine, np.ndarray, np.ndarray, np.ndarray]:
+        engine = IndicatorEngine(candles)
+        series = engine.compute(["rsi", "bollinger"])
+        
+        buy_call, buy_put = self.signal_masks(
+            engine.columns["close"], series["rsi"], series["bb_upper"], series["bb_lower"]
+        )
+        buy_call[:self.BACKTEST_MIN_LOOKBACK] = False
+        buy_put[:self.BACKTEST_MIN_LOOKBACK] = False
+        return engine, series["rsi"], buy_call, buy_put
+    
     def _backtest_strategy(self, candles: List[List]) -> Tuple[float, int]:
         """
         Backtest the strategy on historical data
@@ -142,46 +294,56 @@ class SignalGenerator:
         Returns:
             Tuple of (win_rate_percentage, total_signals_generated)
         """
-        closes = [c[4] for c in candles]
-        wins = 0
-        total_signals = 0
-        
-        # Need enough data for indicators and lookahead
-        min_lookback = 50  # For indicators
-        
-        for i in range(min_lookback, len(candles) - self.BACKTEST_LOOKAHEAD):
-            historical_closes = closes[:i+1]
-            
-            try:
-                rsi = calculate_rsi(historical_closes, period=14)
-                bb_upper, bb_middle, bb_lower = calculate_bollinger_bands(historical_closes, period=20, std_dev=2)
-                price = historical_closes[-1]
-                
-                # Check for BUY_CALL signal
-                if price <= bb_lower and rsi < self.RSI_OVERSOLD:
-                    total_signals += 1
-                    # Check if price went up within lookahead period
-                    future_closes = closes[i+1:i+1+self.BACKTEST_LOOKAHEAD]
-                    if max(future_closes) > price * 1.01:  # 1% profit threshold
-                        wins += 1
-                
-                # Check for BUY_PUT signal
-                elif price >= bb_upper and rsi > self.RSI_OVERBOUGHT:
-                    total_signals += 1
-                    # Check if price went down within lookahead period
-                    future_closes = closes[i+1:i+1+self.BACKTEST_LOOKAHEAD]
-                    if min(future_closes) < price * 0.99:  # 1% profit threshold
-                        wins += 1
-                        
-            except ValueError:
-                continue
-        
+        return self._summarize_outcomes(self._backtest_outcomes(candles))
+    
+    def _summarize_outcomes(self, outcomes: np.ndarray) -> Tuple[float, int]:
+        """Win rate percentage and signal count from per-signal outcomes"""
+        total_signals = len(outcomes)
         if total_signals == 0:
             return 50.0, 0  # Default 50% if no signals
         
-        win_rate = (wins / total_signals) * 100
+        win_rate = (int(outcomes.sum()) / total_signals) * 100
         return win_rate, total_signals
     
+    def _backtest_outcomes(self, candles: List[List]) -> np.ndarray:
+        """
+        Evaluate every historical signal in one vectorized pass
+        
+        A bar i in [BACKTEST_MIN_LOOKBACK, len - max_bars) signals when its
+        indicators (computed on closes[:i+1]) meet the BUY_CALL or BUY_PUT rules.
+        A signal wins when its exit rules hit the take-profit before the
+        stop-loss or time exit. With the default rules a BUY_CALL wins if any
+        of the next BACKTEST_LOOKAHEAD closes rises more than
+        BACKTEST_PROFIT_THRESHOLD above the signal price; a BUY_PUT wins if
+        one falls that far below it.
+        
+        Returns:
+            Boolean array of outcomes (True = win), one per signal, in time order
+        """
+        return self.backtest_exits(candles).wins
+    
+    def backtest_exits(self, candles: List[List]) -> ExitResult:
+        """
+        Exit bar, reason and return of every backtested signal, in time order
+        
+        Only signals whose whole holding window lies inside the candles are
+        included, so every result is settled.
+        """
+        end = len(candles) - self.exit_rules.max_bars
+        if end <= self.BACKTEST_MIN_LOOKBACK:
+            return find_exits(np.zeros(0), np.zeros(0, dtype=int), np.zeros(0), self.exit_rules)
+        
+        closes, buy_call, buy_put = self.historical_signals(candles)
+        direction = buy_call.astype(np.int8) - buy_put.astype(np.int8)
+        direction[end:] = 0
+        entries = np.flatnonzero(direction)
+        
+        data = np.asarray(candles, dtype=float)
+        return find_exits(
+            closes, entries, direction[entries], self.exit_rules,
+            highs=data[:, 2], lows=data[:, 3]
+        )
+    
     def _calculate_confidence(
         self,
         signal: str,
@@ -189,13 +351,15 @@ class SignalGenerator:
         price: float,
         bb_upper: float,
         bb_lower: float,
-        win_rate: float
+        win_rate: float,
+        win_rate_lower: Optional[float] = None
     ) -> float:
         """
         Calculate confidence score based on multiple factors
         
         Confidence is weighted:
-        - 50% from historical win rate
+        - 50% from historical win rate (the lower bound of its bootstrap
+          interval when given, so few backtest signals earn little credit)
         - 30% from RSI extremity
         - 20% from Bollinger Band position
         """
@@ -203,7 +367,7 @@ class SignalGenerator:
             return 0.0
         
         # Win rate component (50%)
-        win_rate_score = win_rate * 0.5
+        win_rate_score = (win_rate if win_rate_lower is None else win_rate_lower) * 0.5
         
         # RSI extremity component (30%)
         if signal == "BUY_CALL":
@@ -0,0 +1,133 @@
+"""
+Universe Matrix Computation
+Aligns many symbols' candles on a shared timestamp index and computes
+indicators and signal masks for all of them at once
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .indicators import calculate_rsi_matrix, calculate_bollinger_bands_matrix
+from .signals import SignalGenerator
+
+
+@dataclass
+class AlignedCandles:
+    """OHLCV matrices of shape (symbols x time) on a common timestamp index"""
+    symbols: List[str]
+    timestamps: np.ndarray  # (time,)
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @property
+    def present(self) -> np.ndarray:
+        """Boolean (symbols x time) mask of bars each symbol actually has"""
+        return ~np.isnan(self.close)
+
+    @property
+    def last_bar(self) -> np.ndarray:
+        """Column of each symbol's latest bar (-1 for a symbol without candles)"""
+        present = self.present
+        if present.shape[1] == 0:
+            return np.full(len(self.symbols), -1)
+        last = present.shape[1] - 1 - np.argmax(present[:, ::-1], axis=1)
+        return np.where(present.any(axis=1), last, -1)
+
+
+def align_candles(candles_by_symbol: Dict[str, List[List]]) -> AlignedCandles:
+    """
+    Align per-symbol candles on the union of their timestamps
+
+    Bars a symbol does not have are NaN. Duplicate timestamps within a
+    symbol keep the last candle.
+
+    Args:
+        candles_by_symbol: Symbol -> list of [timestamp, open, high, low, close, volume]
+
+    Returns:
+        AlignedCandles
+    """
+    symbols = list(candles_by_symbol)
+    arrays = [
+        np.asarray(candles_by_symbol[s], dtype=float).reshape(-1, 6)
+        if len(candles_by_symbol[s]) else np.empty((0, 6))
+        for s in symbols
+    ]
+
+    timestamps = np.unique(np.concatenate([a[:, 0] for a in arrays])) if arrays else np.empty(0)
+    matrices = np.full((5, len(symbols), len(timestamps)), np.nan)
+    for row, data in enumerate(arrays):
+        columns = np.searchsorted(timestamps, data[:, 0])
+        matrices[:, row, columns] = data[:, 1:6].T
+
+    return AlignedCandles(symbols, timestamps, *matrices)
+
+
+def compute_universe_indicators(
+    aligned: AlignedCandles,
+    rsi_period: int = 14,
+    bb_period: int = 20,
+    bb_std_dev: float = 2.0
+) -> Dict[str, np.ndarray]:
+    """
+    RSI and Bollinger Band matrices for every symbol at once
+
+    Each symbol's bars are packed contiguously (right-aligned) before
+    computing, so a missing bar is skipped rather than treated as a flat
+    price, and results match running the indicators on that symbol's own
+    candles. Values at missing bars are NaN.
+
+    Args:
+        aligned: Output of align_candles
+        rsi_period: RSI period
+        bb_period: Bollinger Band period
+        bb_std_dev: Bollinger Band standard deviation multiplier
+
+    Returns:
+        Dict with rsi, bb_upper, bb_middle, bb_lower matrices (symbols x time)
+    """
+    present = aligned.present
+    # Stable sort puts missing bars first and keeps each symbol's bars in order
+    order = np.argsort(present, axis=1, kind="stable")
+    packed = np.take_along_axis(aligned.close, order, axis=1)
+
+    packed_series = {"rsi": calculate_rsi_matrix(packed, rsi_period)}
+    upper, middle, lower = calculate_bollinger_bands_matrix(packed, bb_period, bb_std_dev)
+    packed_series.update(bb_upper=upper, bb_middle=middle, bb_lower=lower)
+
+    result = {}
+    for name, values in packed_series.items():
+        unpacked = np.empty_like(values)
+        np.put_along_axis(unpacked, order, values, axis=1)
+        unpacked[~present] = np.nan
+        result[name] = unpacked
+    return result
+
+
+def universe_signal_masks(
+    aligned: AlignedCandles,
+    indicators: Optional[Dict[str, np.ndarray]] = None,
+    generator: Optional[SignalGenerator] = None
+) -> Dict[str, np.ndarray]:
+    """
+    BUY_CALL / BUY_PUT masks (symbols x time) for the whole universe
+
+    Args:
+        aligned: Output of align_candles
+        indicators: Output of compute_universe_indicators (computed if omitted)
+        generator: SignalGenerator providing the strategy thresholds
+
+    Returns:
+        Dict with buy_call and buy_put boolean matrices
+    """
+    indicators = indicators or compute_universe_indicators(aligned)
+    generator = generator or SignalGenerator()
+    buy_call, buy_put = generator.signal_masks(
+        aligned.close, indicators["rsi"], indicators["bb_upper"], indicators["bb_lower"]
+    )
+    return {"buy_call": buy_call, "buy_put": buy_put}
@@ -0,0 +1,169 @@
+"""
+Tests for the Historical Backfill
+"""
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from aiohttp.test_utils import TestServer
+
+from services.backfill import Backfiller, parse_time
+from services.candle_store import CandleStore
+from services.fake_upstream import FakeUpstream, FakeUpstreamConfig
+from services.providers import BinanceProvider, CoinGeckoProvider, MarketDataProvider
+from services.rate_limit import RateLimiter
+
+
+HOUR = 3600000
+NOW_MS = 1_700_000_000_000 - 1_700_000_000_000 % HOUR
+
+
+class RangeSource(MarketDataProvider):
+    """Serves a fixed hourly history in pages; can fail after a number of pages"""
+
+    name = "range"
+
+    def __init__(self, first=0, last=NOW_MS, fail_after=None):
+        self.first = first
+        self.last = last
+        self.fail_after = fail_after
+        self.calls = 0
+
+    async def fetch_candles_since(self, symbol, interval, since, limit=1000):
+        self.calls += 1
+        if self.fail_after is not None and self.calls > self.fail_after:
+            raise Exception("CoinGecko API error: 500")
+        start = max(since + (-since) % HOUR, self.first)
+        timestamps = np.arange(start, min(self.last, start + limit * HOUR), HOUR)
+        return [[int(t), 1.0, 2.0, 0.5, 1.0 + t / HOUR, 10.0] for t in timestamps]
+
+
+def _expected(first, end):
+    return np.arange(first, end, HOUR)
+
+
+class TestBackfiller:
+    """Tests for paging, resume and concurrency"""
+
+    async def test_downloads_closed_candles_for_every_pair(self, tmp_path):
+        store = CandleStore(str(tmp_path))
+        start, end = NOW_MS - 2500 * HOUR, NOW_MS
+        backfiller = Backfiller(RangeSource(last=NOW_MS + HOUR), store, start=start, end=end, concurrency=3)
+        report = await backfiller.run(["ETH/USDT", "BTC/USDT"], ["1h"])
+
+        for symbol in ("ETH/USDT", "BTC/USDT"):
+            stored = store.load(symbol, "1h")
+            # The candle opening at end has not closed and is not stored
+            assert np.array_equal(stored[:, 0], _expected(start, end))
+        assert report.candles == 5000
+        assert report.requests == 6
+        assert report.candles_per_second > 0
+        assert all(result.error is None for result in report.results)
+
+    async def test_resumes_after_interruption(self, tmp_path):
+        store = CandleStore(str(tmp_path))
+        start = NOW_MS - 3500 * HOUR
+
+        failing = Backfiller(RangeSource(fail_after=2), store, start=start, end=NOW_MS, flush_rows=1000)
+        first = (await failing.run(["ETH/USDT"], ["1h"])).results[0]
+        assert first.error is not None
+        assert first.stored == 2000  # Pages fetched before the failure were kept
+
+        source = RangeSource()
+        second = (await Backfiller(source, store, start=start, end=NOW_MS).run(["ETH/USDT"], ["1h"])).results[0]
+        assert second.resumed_from == start + 2000 * HOUR
+        assert second.candles == 1500
+        assert source.calls == 2
+        assert np.array_equal(store.load("ETH/USDT", "1h")[:, 0], _expected(start, NOW_MS))
+
+        # Nothing new: no candles downloaded
+        third = (await Backfiller(RangeSource(), store, start=start, end=NOW_MS).run(["ETH/USDT"], ["1h"])).results[0]
+        assert third.candles == 0
+        assert third.stored == 3500
+
+    async def test_earlier_start_fills_head_gap(self, tmp_path):
+        store = CandleStore(str(tmp_path))
+        start = NOW_MS - 3000 * HOUR
+        await Backfiller(RangeSource(), store, start=start + 1200 * HOUR, end=NOW_MS - 500 * HOUR).run(
+            ["ETH/USDT"], ["1h"]
+        )
+
+        result = (await Backfiller(RangeSource(), store, start=start, end=NOW_MS).run(["ETH/USDT"], ["1h"])).results[0]
+        assert result.candles == 1200 + 500
+        assert result.resumed_from == NOW_MS - 500 * HOUR
+        assert np.array_equal(store.load("ETH/USDT", "1h")[:, 0], _expected(start, NOW_MS))
+
+    async def test_interrupted_head_fill_leaves_no_hole(self, tmp_path):
+        store = CandleStore(str(tmp_path))
+        start = NOW_MS - 4000 * HOUR
+        await Backfiller(RangeSource(), store, start=NOW_MS - 1000 * HOUR, end=NOW_MS).run(["ETH/USDT"], ["1h"])
+
+        failing = Backfiller(RangeSource(fail_after=1), store, start=start, end=NOW_MS, flush_rows=500)
+        assert (await failing.run(["ETH/USDT"], ["1h"])).results[0].error is not None
+        assert len(store.load("ETH/USDT", "1h")) == 2000
+
+        result = (await Backfiller(RangeSource(), store, start=start, end=NOW_MS).run(["ETH/USDT"], ["1h"])).results[0]
+        assert result.error is None
+        assert result.candles == 2000
+        assert np.array_equal(store.load("ETH/USDT", "1h")[:, 0], _expected(start, NOW_MS))
+
+    async def test_history_starting_after_start(self, tmp_path):
+        store = CandleStore(str(tmp_path))
+        listed = NOW_MS - 100 * HOUR
+        backfiller = Backfiller(RangeSource(first=listed), store, start=0, end=NOW_MS)
+        await backfiller.run(["NEW/USDT"], ["1h"])
+        assert np.array_equal(store.load("NEW/USDT", "1h")[:, 0], _expected(listed, NOW_MS))
+
+    async def test_unsupported_provider_reports_error(self, tmp_path):
+        backfiller = Backfiller(CoinGeckoProvider(), CandleStore(str(tmp_path)), start=0, end=NOW_MS)
+        result = (await backfiller.run(["ETH/USDT"], ["1h"])).results[0]
+        assert "NotImplementedError" in result.error
+        assert result.stored == 0
+
+    async def test_binance_through_fake_upstream(self, tmp_path):
+        fake = FakeUpstream(FakeUpstreamConfig(seed=1), clock=lambda: NOW_MS / 1000)
+        async with TestServer(fake.app) as server:
+            provider = BinanceProvider(base_url=str(server.make_url("")).rstrip("/"))
+            store = CandleStore(str(tmp_path))
+            try:
+                report = await Backfiller(
+                    provider, store, start=NOW_MS - 1500 * HOUR, end=NOW_MS
+                ).run(["ETH/USDT", "BTC/USDT"], ["1h"])
+            finally:
+                await provider.close()
+
+        assert all(result.error is None for result in report.results)
+        assert len(store.load("ETH/USDT", "1h")) == 1500
+        assert fake.stats[("/api/v3/klines", 200)] == 4
+
+
+class TestRateLimiter:
+    """Tests for request spacing"""
+
+    def test_spacing_and_burst(self):
+        now = [0.0]
+        limiter = RateLimiter(rate=10, burst=3, clock=lambda: now[0])
+        waits = [limiter.reserve() for _ in range(6)]
+        assert waits == pytest.approx([0, 0, 0, 0.1, 0.2, 0.3])
+
+        now[0] = 10.0  # Idle long enough to refill the burst
+        assert limiter.reserve() == 0
+        assert limiter.stats["waited"] == 3
+
+    async def test_limits_backfill_request_rate(self, tmp_path):
+        limiter = RateLimiter(rate=200, burst=1)
+        backfiller = Backfiller(
+            RangeSource(), CandleStore(str(tmp_path)), start=NOW_MS - 2000 * HOUR, end=NOW_MS,
+            limiter=limiter, page_size=100, concurrency=4
+        )
+        report = await backfiller.run(["A/USDT", "B/USDT"], ["1h"])
+        assert report.requests == 40
+        assert report.elapsed_seconds >= 39 / 200
+        assert report.requests_per_second <= 200 * 1.05
+
+
+def test_parse_time():
+    assert parse_time("1700000000000") == 1_700_000_000_000
+    assert parse_time("2024-01-01") == 1_704_067_200_000
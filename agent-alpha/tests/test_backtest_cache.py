@@ -0,0 +1,137 @@
+"""
+Tests for the Incremental Backtest Cache
+"""
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from services.backtest_cache import BacktestCache, IncrementalBacktest
+from services.signals import SignalGenerator
+
+
+def _create_candles(prices: list, start: int = 0) -> list:
+    """Helper to create candle data from prices"""
+    return [
+        [(start + i) * 3600000, p, p + 1, p - 1, float(p), 1000]
+        for i, p in enumerate(prices)
+    ]
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(2)
+    return list(100 + 10 * np.sin(np.arange(600) * 0.15) + rng.uniform(-1, 1, 600))
+
+
+@pytest.fixture
+def generator():
+    return SignalGenerator()
+
+
+class TestIncrementalBacktest:
+    """Incremental results should equal a full rescan of the served window"""
+
+    def test_appending_candles_matches_full_rescan(self, prices, generator):
+        candles = _create_candles(prices)
+        state = IncrementalBacktest(generator)
+        state.update(candles[:300])
+
+        for end in range(301, 600, 3):
+            state.update(candles[:end])
+            expected = generator._backtest_outcomes(candles[:end])
+            assert np.array_equal(state.outcomes, expected)
+            assert (state.wins, state.total) == (int(expected.sum()), len(expected))
+
+    def test_sliding_window_describes_served_window(self, prices, generator):
+        """Bars that slide off the front should no longer count"""
+        candles = _create_candles(prices)
+        state = IncrementalBacktest(generator)
+        state.update(candles[:400])
+        state.update(candles[100:450])
+
+        expected = generator._backtest_outcomes(candles[100:450])
+        assert len(state) == 350
+        assert np.array_equal(state.outcomes, expected)
+        assert (state.wins, state.total) == (int(expected.sum()), len(expected))
+
+    def test_many_slides_match_full_rescan(self, generator):
+        rng = np.random.default_rng(5)
+        prices = list(100 + 10 * np.sin(np.arange(2000) * 0.15) + rng.uniform(-1, 1, 2000))
+        candles = _create_candles(prices)
+        state = IncrementalBacktest(generator)
+        window = 300
+
+        for end in range(window, 2000, 7):
+            start = end - window
+            served = [list(c) for c in candles[start:end]]
+            served[-1][4] += 0.5  # Forming candle, revised on the next slide
+            state.update(served)
+
+            expected = generator._backtest_outcomes(served)
+            assert len(state) == window
+            assert np.array_equal(state.outcomes, expected)
+            assert (state.wins, state.total) == (int(expected.sum()), len(expected))
+        assert state.ring.capacity == window
+
+    def test_new_candle_only_evaluates_new_bars(self, prices, generator):
+        candles = _create_candles(prices)
+        state = IncrementalBacktest(generator)
+        state.update(candles[:500])
+
+        assert state.update(candles[:502]) == 2
+        assert state.update(candles[:502]) == 0
+
+    def test_revised_last_candle_rewinds(self, prices, generator):
+        candles = _create_candles(prices)
+        state = IncrementalBacktest(generator)
+        state.update(candles[:500])
+
+        revised = [list(c) for c in candles[:500]]
+        revised[-1][4] += 5.0
+        assert state.update(revised) == 1
+        assert np.array_equal(state.outcomes, generator._backtest_outcomes(revised))
+
+    def test_non_overlapping_window_resets(self, prices, generator):
+        candles = _create_candles(prices)
+        state = IncrementalBacktest(generator)
+        state.update(candles[:200])
+        state.update(candles[300:])
+
+        assert len(state) == 300
+        assert np.array_equal(state.outcomes, generator._backtest_outcomes(candles[300:]))
+
+
+class TestBacktestCache:
+    """Tests for keyed caching and generator integration"""
+
+    def test_keys_include_strategy_params(self, prices, generator):
+        cache = BacktestCache()
+        candles = _create_candles(prices)
+        cache.outcomes(("ETH/USDT", "1h"), candles, generator)
+
+        other = SignalGenerator()
+        other.RSI_OVERSOLD = 25
+        cache.outcomes(("ETH/USDT", "1h"), candles, other)
+
+        assert len(cache) == 2
+
+    def test_lru_eviction(self, prices, generator):
+        cache = BacktestCache(max_entries=1)
+        candles = _create_candles(prices[:200])
+        cache.outcomes(("ETH/USDT", "1h"), candles, generator)
+        cache.outcomes(("BTC/USDT", "1h"), candles, generator)
+
+        assert len(cache) == 1
+        assert cache.stats["evictions"] == 1
+
+    def test_generator_uses_cache(self, prices):
+        candles = _create_candles(prices)
+        cached = SignalGenerator(backtest_cache=BacktestCache())
+        plain = SignalGenerator()
+
+        for end in (400, 401, 420):
+            assert cached.generate_signal(candles[:end], cache_key=("ETH/USDT", "1h")) == \
+                plain.generate_signal(candles[:end])
+        assert cached.backtest_cache.stats["bars_evaluated"] == 420
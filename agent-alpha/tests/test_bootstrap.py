@@ -0,0 +1,73 @@
+"""
+Tests for Bootstrap Win Rate Intervals
+"""
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from services.bootstrap import bootstrap_win_rate
+from services.signals import SignalGenerator
+
+
+class TestBootstrapWinRate:
+    """Tests for interval computation"""
+
+    def test_interval_contains_point_estimate(self):
+        outcomes = np.array([True] * 60 + [False] * 40)
+        interval = bootstrap_win_rate(outcomes, seed=1)
+
+        assert interval.win_rate == 60.0
+        assert interval.lower < 60.0 < interval.upper
+        assert interval.samples == 100
+
+    def test_single_win_is_not_certain(self):
+        """One winning signal should not produce a 100% lower bound"""
+        interval = bootstrap_win_rate(np.array([True]), seed=1)
+
+        assert interval.win_rate == 100.0
+        assert interval.lower < 50.0
+
+    def test_no_outcomes_gives_uninformative_interval(self):
+        interval = bootstrap_win_rate(np.array([], dtype=bool), seed=1)
+
+        assert interval.samples == 0
+        assert interval.lower == 0.0 and interval.upper == 100.0
+
+    def test_interval_narrows_with_more_samples(self):
+        small = bootstrap_win_rate(np.array([True, False] * 5), seed=1)
+        large = bootstrap_win_rate(np.array([True, False] * 500), seed=1)
+
+        assert (large.upper - large.lower) < (small.upper - small.lower)
+
+    def test_seed_makes_interval_reproducible(self):
+        outcomes = np.array([True, False, True])
+        assert bootstrap_win_rate(outcomes, seed=7) == bootstrap_win_rate(outcomes, seed=7)
+
+    def test_invalid_confidence_raises(self):
+        with pytest.raises(ValueError):
+            bootstrap_win_rate(np.array([True]), confidence=1.5)
+
+
+class TestSignalConfidenceUsesInterval:
+    """Tests for feeding the interval into confidence"""
+
+    def test_lower_bound_replaces_point_win_rate(self):
+        generator = SignalGenerator()
+        args = ("BUY_CALL", 20.0, 95.0, 110.0, 96.0, 100.0)
+
+        optimistic = generator._calculate_confidence(*args)
+        conservative = generator._calculate_confidence(*args, win_rate_lower=30.0)
+
+        assert conservative == pytest.approx(optimistic - 35.0)
+
+    def test_signal_reports_interval(self):
+        generator = SignalGenerator()
+        prices = [100 + 10 * np.sin(i * 0.1) for i in range(300)]
+        candles = [[i * 3600000, p, p + 1, p - 1, p, 1000] for i, p in enumerate(prices)]
+
+        signal = generator.generate_signal(candles)
+
+        assert 0 <= signal.win_rate_lower <= signal.win_rate_upper <= 100
+        assert signal.total_signals >= 0
@@ -0,0 +1,44 @@
+"""
+Tests for the Local Candle Store
+"""
+
+import numpy as np
+import sys
+sys.path.insert(0, '..')
+
+from services.candle_store import CandleStore
+
+
+def _candles(start, count, price=100.0):
+    return [[(start + i) * 3600000, price, price + 1, price - 1, price + i, 10.0] for i in range(count)]
+
+
+class TestCandleStore:
+    """Tests for columnar candle storage"""
+
+    def test_round_trip(self, tmp_path):
+        store = CandleStore(str(tmp_path))
+        store.write("ETH/USDT", "1h", _candles(0, 5))
+
+        loaded = store.load("ETH/USDT", "1h")
+        assert loaded.shape == (5, 6)
+        assert np.array_equal(loaded, np.asarray(_candles(0, 5), dtype=float))
+
+    def test_merge_dedupes_and_sorts(self, tmp_path):
+        store = CandleStore(str(tmp_path))
+        store.write("ETH/USDT", "1h", _candles(3, 5))
+        count = store.write("ETH/USDT", "1h", _candles(0, 5, price=200.0))
+
+        loaded = store.load("ETH/USDT", "1h")
+        assert count == 8
+        assert np.all(np.diff(loaded[:, 0]) > 0)
+        # Overlapping timestamps take the newly written candles
+        assert loaded[3, 1] == 200.0 and loaded[5, 1] == 100.0
+
+    def test_missing_and_entries(self, tmp_path):
+        store = CandleStore(str(tmp_path))
+        assert store.load("BTC/USDT", "1h").shape == (0, 6)
+
+        store.write("ETH/USDT", "1h", _candles(0, 2))
+        store.write("ETH/USDT", "4h", _candles(0, 2))
+        assert store.entries() == [("ETH/USDT", "1h"), ("ETH/USDT", "4h")]
@@ -0,0 +1,110 @@
+"""
+Tests for Response Compression
+"""
+
+import gzip
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from services import compression
+from services.compression import CompressedBodies, compress, negotiate
+from services.memory_cache import SizedCache
+
+
+BODY = b'{"candles": [' + b",".join(b"[1700000000000, 100.5, 101.0, 99.5, 100.25, 10.0]" for _ in range(200)) + b"]}"
+
+
+class Renderer:
+    def __init__(self, body=BODY):
+        self.body = body
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.body
+
+
+class TestNegotiate:
+    """Tests for Accept-Encoding parsing"""
+
+    def test_prefers_first_candidate_on_ties(self):
+        assert negotiate("gzip, br", ["br", "gzip"]) == "br"
+        assert negotiate("gzip", ["br", "gzip"]) == "gzip"
+
+    def test_q_values(self):
+        assert negotiate("br;q=0.5, gzip;q=0.8", ["br", "gzip"]) == "gzip"
+        assert negotiate("gzip;q=0, *", ["br", "gzip"]) == "br"
+        assert negotiate("gzip;q=0", ["gzip"]) == "identity"
+        assert negotiate("*;q=0", ["br", "gzip"]) == "identity"
+
+    def test_missing_or_unknown(self):
+        assert negotiate(None) == "identity"
+        assert negotiate("deflate, zstd", ["br", "gzip"]) == "identity"
+
+    def test_brotli_is_optional(self, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", None)
+        assert compression.available_encodings() == ["gzip"]
+        assert negotiate("br, gzip") == "gzip"
+
+
+def test_gzip_round_trip_is_deterministic():
+    assert gzip.decompress(compress(BODY, "gzip")) == BODY
+    assert compress(BODY, "gzip") == compress(BODY, "gzip")
+    assert compress(BODY, "identity") is BODY
+    with pytest.raises(ValueError):
+        compress(BODY, "zstd")
+
+
+class TestCompressedBodies:
+    """Tests for serialized bodies cached by ETag"""
+
+    def test_repeat_requests_skip_render_and_compress(self):
+        bodies = CompressedBodies(SizedCache())
+        render = Renderer()
+
+        body, encoding = bodies.get(("ETH/USDT", "1h", "candles"), 'W/"a"', "gzip", render)
+        assert encoding == "gzip"
+        assert gzip.decompress(body) == BODY
+        assert len(body) < len(BODY) / 4
+
+        for _ in range(5):
+            again, _ = bodies.get(("ETH/USDT", "1h", "candles"), 'W/"a"', "gzip", render)
+            assert again is body
+        assert render.calls == 1
+        assert bodies.stats["compressions"] == 1
+        assert bodies.stats["hits"] == 5
+
+    def test_each_encoding_is_kept(self):
+        bodies = CompressedBodies(SizedCache())
+        render = Renderer()
+        key = ("ETH/USDT", "1h", "candles")
+
+        assert bodies.get(key, 'W/"a"', "identity", render) == (BODY, "identity")
+        bodies.get(key, 'W/"a"', "gzip", render)
+        assert bodies.get(key, 'W/"a"', "identity", render)[0] is BODY
+        bodies.get(key, 'W/"a"', "gzip", render)
+        assert render.calls == 1
+        assert bodies.stats["compressions"] == 1
+
+    def test_new_etag_replaces_entry(self):
+        cache = SizedCache()
+        bodies = CompressedBodies(cache)
+        key = ("ETH/USDT", "1h", "candles")
+        bodies.get(key, 'W/"a"', "gzip", Renderer())
+
+        newer = Renderer(BODY + b" ")
+        body, _ = bodies.get(key, 'W/"b"', "gzip", newer)
+        assert gzip.decompress(body) == BODY + b" "
+        assert newer.calls == 1
+        assert cache.stats()["entries"] == 1
+
+    def test_small_bodies_are_not_compressed(self):
+        bodies = CompressedBodies(SizedCache())
+        assert bodies.get(("ETH/USDT", "x"), 'W/"a"', "gzip", Renderer(b"{}")) == (b"{}", "identity")
+        assert bodies.stats["compressions"] == 0
+
+    def test_counts_against_cache_budget(self):
+        cache = SizedCache()
+        CompressedBodies(cache).get(("ETH/USDT", "1h", "candles"), 'W/"a"', "gzip", Renderer())
+        assert cache.stats()["resident_bytes"] > len(BODY)
@@ -0,0 +1,136 @@
+"""
+Tests for the Exit Rule Engine
+"""
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from services.exits import (
+    ExitRules, find_exits, EXIT_OPEN, EXIT_TAKE_PROFIT, EXIT_STOP_LOSS, EXIT_TIME
+)
+from services.backtest_cache import IncrementalBacktest
+from services.signals import SignalGenerator
+
+
+def _loop_exits(closes, highs, lows, entries, directions, rules):
+    """Reference implementation: walk each signal's window bar by bar"""
+    if rules.trigger == "close":
+        highs = lows = closes
+    results = []
+    for entry, direction in zip(entries, directions):
+        price = closes[entry]
+        outcome = (-1, EXIT_OPEN)
+        for bar in range(entry + 1, min(entry + rules.max_bars + 1, len(closes))):
+            fav = highs[bar] if direction == 1 else lows[bar]
+            adv = lows[bar] if direction == 1 else highs[bar]
+            if rules.stop_loss is not None and (
+                adv < price * (1 - rules.stop_loss) if direction == 1 else adv > price * (1 + rules.stop_loss)
+            ):
+                outcome = (bar, EXIT_STOP_LOSS)
+                break
+            if rules.take_profit is not None and (
+                fav > price * (1 + rules.take_profit) if direction == 1 else fav < price * (1 - rules.take_profit)
+            ):
+                outcome = (bar, EXIT_TAKE_PROFIT)
+                break
+        else:
+            if entry + rules.max_bars < len(closes):
+                outcome = (entry + rules.max_bars, EXIT_TIME)
+        results.append(outcome)
+    return results
+
+
+class TestFindExits:
+    """Tests for first-hit detection"""
+
+    def test_take_profit_first(self):
+        closes = np.array([100, 100.5, 102, 98, 97.0])
+        exits = find_exits(closes, [0], [1], ExitRules(take_profit=0.01, stop_loss=0.01, max_bars=4))
+        assert exits.exit_bar.tolist() == [2]
+        assert exits.reasons.tolist() == ["take_profit"]
+        assert exits.returns[0] == pytest.approx(0.02)
+
+    def test_stop_loss_first(self):
+        closes = np.array([100, 98.5, 102, 98, 97.0])
+        exits = find_exits(closes, [0], [1], ExitRules(take_profit=0.01, stop_loss=0.01, max_bars=4))
+        assert exits.exit_bar.tolist() == [1]
+        assert exits.reason.tolist() == [EXIT_STOP_LOSS]
+
+    def test_short_mirrors_barriers(self):
+        closes = np.array([100, 99.5, 98.5, 103.0])
+        exits = find_exits(closes, [0], [-1], ExitRules(take_profit=0.01, stop_loss=0.02, max_bars=3))
+        assert exits.exit_bar.tolist() == [2]
+        assert exits.reason.tolist() == [EXIT_TAKE_PROFIT]
+        assert exits.returns[0] == pytest.approx(0.015)
+
+    def test_time_exit_and_open(self):
+        closes = np.full(6, 100.0)
+        exits = find_exits(closes, [0, 3], [1, 1], ExitRules(max_bars=3))
+        assert exits.reason.tolist() == [EXIT_TIME, EXIT_OPEN]
+        assert exits.exit_bar.tolist() == [3, -1]
+        assert np.isnan(exits.returns[1])
+
+    def test_high_low_trigger_fills_at_barrier(self):
+        closes = np.array([100.0, 100.0, 100.0])
+        highs = np.array([100.0, 103.0, 100.0])
+        lows = np.array([100.0, 99.5, 100.0])
+        rules = ExitRules(take_profit=0.02, stop_loss=0.01, max_bars=2, trigger="high_low")
+
+        exits = find_exits(closes, [0], [1], rules, highs=highs, lows=lows)
+        assert exits.reason.tolist() == [EXIT_TAKE_PROFIT]
+        assert exits.exit_price[0] == pytest.approx(102.0)
+
+        # Both barriers inside one bar: assume the stop came first
+        lows[1] = 98.0
+        exits = find_exits(closes, [0], [1], rules, highs=highs, lows=lows)
+        assert exits.reason.tolist() == [EXIT_STOP_LOSS]
+        assert exits.exit_price[0] == pytest.approx(99.0)
+
+    def test_matches_bar_by_bar_loop(self):
+        rng = np.random.default_rng(9)
+        closes = 100 + np.cumsum(rng.normal(0, 1, 400))
+        highs = closes + rng.uniform(0, 1, 400)
+        lows = closes - rng.uniform(0, 1, 400)
+        entries = np.sort(rng.choice(400, 60, replace=False))
+        directions = rng.choice([-1, 1], 60)
+
+        for rules in [
+            ExitRules(),
+            ExitRules(take_profit=0.02, stop_loss=0.01, max_bars=12),
+            ExitRules(take_profit=None, stop_loss=0.015, max_bars=30, trigger="high_low"),
+        ]:
+            exits = find_exits(closes, entries, directions, rules, highs=highs, lows=lows)
+            expected = _loop_exits(closes, highs, lows, entries, directions, rules)
+            assert list(zip(exits.exit_bar.tolist(), exits.reason.tolist())) == expected
+
+    def test_invalid_rules(self):
+        with pytest.raises(ValueError):
+            ExitRules(trigger="open")
+        with pytest.raises(ValueError):
+            find_exits(np.ones(3), [0], [1], ExitRules(trigger="high_low"))
+
+
+class TestBacktestExitRules:
+    """Tests for exit rules in the strategy backtest"""
+
+    def test_custom_rules_change_params(self):
+        default = SignalGenerator()
+        custom = SignalGenerator(exit_rules=ExitRules(stop_loss=0.01))
+        assert default.params != custom.params
+
+    def test_incremental_backtest_uses_exit_rules(self):
+        rng = np.random.default_rng(4)
+        prices = 100 + 10 * np.sin(np.arange(500) * 0.15) + rng.uniform(-1, 1, 500)
+        candles = [[i * 3600000, p, p + 1, p - 1, float(p), 1000] for i, p in enumerate(prices)]
+        generator = SignalGenerator(
+            exit_rules=ExitRules(take_profit=0.02, stop_loss=0.01, max_bars=12, trigger="high_low")
+        )
+
+        state = IncrementalBacktest(generator)
+        for end in range(300, 500, 7):
+            state.update(candles[:end])
+        state.update(candles)
+
+        assert np.array_equal(state.outcomes, generator._backtest_outcomes(candles))
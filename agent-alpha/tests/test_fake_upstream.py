@@ -0,0 +1,114 @@
+"""
+Tests for the Fake Market Data Upstream
+"""
+
+import aiohttp
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from aiohttp.test_utils import TestServer
+
+from services.fake_upstream import FakeUpstream, FakeUpstreamConfig, synthetic_candles
+from services.providers import CoinGeckoProvider, BinanceProvider
+from services.retry import RetryPolicy
+
+
+HOUR = 3600000
+
+
+@pytest.fixture
+async def upstream():
+    fake = FakeUpstream(FakeUpstreamConfig(seed=1), clock=lambda: 1_700_000_000.0)
+    async with TestServer(fake.app) as server:
+        fake.base_url = str(server.make_url("")).rstrip("/")
+        yield fake
+
+
+class TestSyntheticCandles:
+    """Tests for deterministic candle generation"""
+
+    def test_deterministic_and_consistent(self):
+        timestamps = np.arange(100) * HOUR
+        candles = synthetic_candles("ethereum", timestamps, HOUR)
+
+        assert np.array_equal(candles, synthetic_candles("ethereum", timestamps, HOUR))
+        assert np.all(candles[:, 2] >= np.maximum(candles[:, 1], candles[:, 4]))
+        assert np.all(candles[:, 3] <= np.minimum(candles[:, 1], candles[:, 4]))
+        # Each candle opens at the previous close
+        assert np.allclose(candles[1:, 1], candles[:-1, 4])
+
+
+class TestFakeEndpoints:
+    """Tests for the served endpoints through the real clients"""
+
+    async def test_coingecko_client(self, upstream):
+        provider = CoinGeckoProvider(base_url=upstream.base_url, min_request_interval=0)
+        candles = await provider.fetch_candles("ETH/USDT", "1h", 720)
+        price = await provider.service.fetch_price("BTC/USDT")
+        market = await provider.service.fetch_market_data("SOL")
+
+        assert len(candles) == 180  # 30 days at CoinGecko's 4h granularity
+        assert candles[-1][0] % (4 * HOUR) == 0
+        assert price["price"] > 10000
+        assert market["id"] == "solana"
+
+    async def test_binance_klines_via_ccxt(self, upstream):
+        provider = BinanceProvider(base_url=upstream.base_url)
+        try:
+            candles = await provider.fetch_candles("ETH/USDT", "1h", 500)
+        finally:
+            await provider.close()
+
+        assert len(candles) == 500
+        assert np.all(np.diff([c[0] for c in candles]) == HOUR)
+
+    async def test_klines_start_time(self, upstream):
+        start = (1_700_000_000 * 1000 // HOUR - 10) * HOUR
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{upstream.base_url}/api/v3/klines",
+                                   params={"symbol": "BTCUSDT", "interval": "1h", "startTime": start}) as r:
+                klines = await r.json()
+        assert klines[0][0] == start and len(klines) == 11
+
+
+class TestMisbehaviour:
+    """Tests for injected failures"""
+
+    async def test_errors_and_throttling(self, upstream):
+        upstream.config.error_rate = 0.3
+        upstream.config.throttle_rate = 0.3
+        upstream.config.retry_after = 7
+
+        statuses = []
+        async with aiohttp.ClientSession() as session:
+            for _ in range(200):
+                async with session.get(f"{upstream.base_url}/simple/price", params={"ids": "ethereum"}) as r:
+                    statuses.append(r.status)
+                    if r.status == 429:
+                        assert r.headers["Retry-After"] == "7"
+
+        assert 30 < statuses.count(429) < 90
+        assert 30 < statuses.count(500) < 90
+        assert upstream.stats[("/simple/price", 200)] == statuses.count(200)
+
+    async def test_rate_limit(self, upstream):
+        upstream.config.requests_per_second = 5
+        async with aiohttp.ClientSession() as session:
+            statuses = []
+            for _ in range(8):
+                async with session.get(f"{upstream.base_url}/coins/ethereum/ohlc", params={"days": "1"}) as r:
+                    statuses.append(r.status)
+        assert statuses == [200] * 5 + [429] * 3
+
+    async def test_coingecko_client_raises_on_429(self, upstream):
+        upstream.config.throttle_rate = 1.0
+        upstream.config.retry_after = 0
+        provider = CoinGeckoProvider(
+            base_url=upstream.base_url, min_request_interval=0,
+            retry=RetryPolicy(max_attempts=2, base_delay=0.01)
+        )
+        with pytest.raises(Exception, match="429"):
+            await provider.fetch_candles("ETH/USDT", "1h", 24)
+        assert upstream.stats[("/coins/{coin_id}/ohlc", 429)] == 2  # Retried once, then gave up
@@ -0,0 +1,180 @@
+"""
+Tests for Hedged Market Data Requests
+"""
+
+import asyncio
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from services.hedging import HedgedProvider
+from services.metrics import LatencyTracker
+from services.providers import MarketDataProvider
+
+
+class DelayedProvider(MarketDataProvider):
+    """Provider answering after a fixed delay, optionally with an error"""
+
+    def __init__(self, tag, delay, fail=False):
+        self.tag = tag
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def fetch_candles(self, symbol="ETH/USDT", interval="1h", limit=720):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise Exception(f"{self.tag} failed")
+        return [[0, 1, 2, 0.5, 1.5, self.tag]]
+
+
+class TestHedgedProvider:
+    """Tests for hedge timing and winner selection"""
+
+    async def test_fast_primary_sends_no_hedge(self):
+        primary = DelayedProvider("p", 0.001)
+        secondary = DelayedProvider("s", 0.001)
+        hedged = HedgedProvider(primary, secondary, initial_delay=0.2)
+
+        candles = await hedged.fetch_candles()
+
+        assert candles[0][5] == "p"
+        assert secondary.calls == 0
+        assert hedged.stats["primary_wins"] == 1
+
+    async def test_slow_primary_is_hedged_and_cancelled(self):
+        primary = DelayedProvider("p", 1.0)
+        secondary = DelayedProvider("s", 0.01)
+        hedged = HedgedProvider(primary, secondary, initial_delay=0.05, min_delay=0.01)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        candles = await hedged.fetch_candles()
+        await asyncio.sleep(0)
+
+        assert candles[0][5] == "s"
+        assert loop.time() - started < 0.5
+        assert primary.cancelled == 1
+        assert hedged.stats["hedges_sent"] == 1
+
+    async def test_primary_failure_hedges_immediately(self):
+        primary = DelayedProvider("p", 0.0, fail=True)
+        secondary = DelayedProvider("s", 0.01)
+        hedged = HedgedProvider(primary, secondary, initial_delay=1.0)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        candles = await hedged.fetch_candles()
+
+        assert candles[0][5] == "s"
+        assert loop.time() - started < 0.5
+
+    async def test_both_fail_raises(self):
+        hedged = HedgedProvider(
+            DelayedProvider("p", 0.0, fail=True),
+            DelayedProvider("s", 0.0, fail=True),
+            initial_delay=0.01
+        )
+
+        with pytest.raises(Exception, match="p failed"):
+            await hedged.fetch_candles()
+
+    async def test_hedge_delay_tracks_primary_percentile(self):
+        hedged = HedgedProvider(DelayedProvider("p", 0), DelayedProvider("s", 0),
+                                hedge_percentile=90, min_delay=0.0, max_delay=10.0)
+        for ms in range(1, 101):
+            hedged.latency.record(ms / 1000)
+
+        assert hedged.hedge_delay() == pytest.approx(0.0901, abs=1e-4)
+
+
+HOUR = 3600000
+
+
+class SteppedProvider(DelayedProvider):
+    """Answers with `count` hourly-or-coarser candles; granularity may be left to the upstream"""
+
+    def __init__(self, tag, delay, step, count=48, declared=True):
+        super().__init__(tag, delay)
+        self.step = step
+        self.count = count
+        self.declared = declared
+
+    def granularity_ms(self, interval="1h", limit=720):
+        return self.step if self.declared else None
+
+    async def fetch_candles(self, symbol="ETH/USDT", interval="1h", limit=720):
+        await super().fetch_candles(symbol, interval, limit)
+        return [[i * self.step, i, i + 0.5, i - 0.5, i + 0.25, 1.0] for i in range(self.count)]
+
+
+class TestHedgeGranularity:
+    """Backup candles must match the primary's spacing"""
+
+    async def test_cancelled_primary_latency_is_recorded(self):
+        hedged = HedgedProvider(DelayedProvider("p", 1.0), DelayedProvider("s", 0.01),
+                                initial_delay=0.05, min_delay=0.01)
+        await hedged.fetch_candles()
+        await asyncio.sleep(0)
+
+        assert len(hedged.latency) == 1
+        assert hedged.latency.percentile(50) >= 0.05
+
+    async def test_finer_backup_is_resampled(self):
+        primary = SteppedProvider("p", 1.0, 4 * HOUR)
+        secondary = SteppedProvider("s", 0.0, HOUR, count=10)
+        hedged = HedgedProvider(primary, secondary, initial_delay=0.01, min_delay=0.01)
+
+        candles = await hedged.fetch_candles()
+
+        assert [c[0] for c in candles] == [0, 4 * HOUR, 8 * HOUR]
+        assert candles[0] == [0, 0.0, 3.5, -0.5, 3.25, 4.0]
+        assert candles[2][4] == 9.25  # Partial last bar closes at its last candle
+        assert isinstance(candles[0][0], int)
+        assert hedged.stats["backups_resampled"] == 1
+
+    async def test_coarser_backup_is_rejected(self):
+        primary = SteppedProvider("p", 0.1, HOUR)
+        secondary = SteppedProvider("s", 0.0, 4 * HOUR)
+        hedged = HedgedProvider(primary, secondary, initial_delay=0.01, min_delay=0.01)
+
+        candles = await hedged.fetch_candles()
+
+        assert candles[1][0] == HOUR
+        assert hedged.stats["backups_rejected"] == 1
+        assert hedged.stats["primary_wins"] == 1
+
+    async def test_hedges_once_primary_spacing_is_observed(self):
+        primary = SteppedProvider("p", 0.1, 4 * HOUR, declared=False)
+        secondary = SteppedProvider("s", 0.0, HOUR)
+        hedged = HedgedProvider(primary, secondary, min_delay=0.01, max_delay=0.01)
+
+        await hedged.fetch_candles()
+        assert secondary.calls == 0
+
+        candles = await hedged.fetch_candles()
+        assert secondary.calls == 1
+        assert candles[1][0] - candles[0][0] == 4 * HOUR
+
+
+class TestLatencyTracker:
+    """Tests for rolling latency percentiles"""
+
+    def test_empty_tracker(self):
+        tracker = LatencyTracker()
+        assert tracker.percentile(50) is None
+        assert tracker.summary() == {"count": 0}
+
+    def test_window_drops_old_samples(self):
+        tracker = LatencyTracker(window=3)
+        for s in [10.0, 0.001, 0.002, 0.003]:
+            tracker.record(s)
+
+        assert len(tracker) == 3
+        assert tracker.summary()["max_ms"] == pytest.approx(3.0)
@@ -0,0 +1,111 @@
+"""
+Tests for the Signal History Store
+"""
+
+import asyncio
+import sqlite3
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from services.history_store import HistoryStore
+
+
+HOUR = 3600000
+
+
+@pytest.fixture
+async def store(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"), batch_size=10, flush_interval=0.05)
+    yield store
+    await store.close()
+
+
+class TestHistoryStore:
+    """Tests for batched writes and range queries"""
+
+    async def test_records_are_written_in_background(self, store):
+        for i in range(25):
+            store.record("signal", "ETH/USDT", "1h", i * HOUR, {"signal": "HOLD", "i": i})
+        assert store.stats["written"] < 25  # Nothing blocked on disk
+
+        await asyncio.sleep(0.2)
+        assert store.stats["written"] == 25
+        assert store.stats["batches"] == 3
+
+        records = await store.query("ETH/USDT", kind="signal")
+        assert [r["payload"]["i"] for r in records] == list(range(25))
+
+    async def test_range_and_filters(self, store):
+        for i in range(10):
+            store.record("signal", "ETH/USDT", "1h", i * HOUR, {"i": i})
+            store.record("indicators", "ETH/USDT", "1h", i * HOUR, {"rsi": 50 + i})
+            store.record("signal", "BTC/USDT", "1h", i * HOUR, {"i": i})
+        await store.flush()
+
+        records = await store.query("ETH/USDT", kind="signal", start=3 * HOUR, end=6 * HOUR)
+        assert [r["timestamp"] for r in records] == [3 * HOUR, 4 * HOUR, 5 * HOUR, 6 * HOUR]
+        assert all(r["symbol"] == "ETH/USDT" for r in records)
+
+        both = await store.query("ETH/USDT", start=8 * HOUR)
+        assert [(r["timestamp"], r["kind"]) for r in both] == [
+            (8 * HOUR, "indicators"), (8 * HOUR, "signal"),
+            (9 * HOUR, "indicators"), (9 * HOUR, "signal"),
+        ]
+        assert len(await store.query("ETH/USDT", limit=5)) == 5
+        assert await store.query("ETH/USDT", interval="4h") == []
+
+    async def test_same_bar_replaces_row(self, store):
+        store.record("signal", "ETH/USDT", "1h", HOUR, {"signal": "HOLD"})
+        store.record("signal", "ETH/USDT", "1h", HOUR, {"signal": "BUY_CALL"})
+        store.record("backtest", "ETH/USDT", "1h", HOUR, {"fee": 0}, tag="fee=0")
+        store.record("backtest", "ETH/USDT", "1h", HOUR, {"fee": 1}, tag="fee=1")
+        await store.flush()
+
+        signals = await store.query("ETH/USDT", kind="signal")
+        assert [r["payload"]["signal"] for r in signals] == ["BUY_CALL"]
+        assert len(await store.query("ETH/USDT", kind="backtest")) == 2
+
+    async def test_close_writes_pending_rows(self, tmp_path):
+        path = str(tmp_path / "history.db")
+        store = HistoryStore(path, batch_size=1000, flush_interval=60)
+        store.record("signal", "ETH/USDT", "1h", HOUR, {"signal": "HOLD"})
+        await store.close()
+
+        count = sqlite3.connect(path).execute("SELECT COUNT(*) FROM records").fetchone()[0]
+        assert count == 1
+
+    async def test_backlog_is_bounded(self, tmp_path):
+        store = HistoryStore(str(tmp_path / "history.db"), batch_size=1000, flush_interval=60, max_pending=5)
+        for i in range(8):
+            store.record("signal", "ETH/USDT", "1h", i * HOUR, {"i": i})
+        await store.close()
+
+        assert store.stats["dropped"] == 3
+        assert store.stats["written"] == 5
+
+    async def test_failed_batch_is_counted_and_logged(self, tmp_path, caplog):
+        store = HistoryStore(str(tmp_path / "history.db"), batch_size=1000, flush_interval=60)
+        store._writer.execute("DROP TABLE records")
+        for i in range(3):
+            store.record("signal", "ETH/USDT", "1h", i * HOUR, {"i": i})
+
+        with caplog.at_level("WARNING", logger="services.history_store"):
+            await store.flush()
+
+        assert store.stats["dropped"] == 3
+        assert store.stats["written"] == 0
+        assert "dropped 3 rows" in caplog.text
+        await store.close()
+
+    async def test_query_uses_index(self, store):
+        plan = sqlite3.connect(store.path).execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM records WHERE symbol = ? AND kind = ? "
+            "AND interval = ? AND timestamp >= ?", ("ETH/USDT", "signal", "1h", 0)
+        ).fetchall()
+        assert "SCAN" not in " ".join(str(row[-1]) for row in plan)
+
+    def test_unknown_kind(self, tmp_path):
+        store = HistoryStore(str(tmp_path / "history.db"))
+        with pytest.raises(ValueError):
+            store.record("trade", "ETH/USDT", "1h", 0, {})
@@ -0,0 +1,62 @@
+"""
+Tests for HTTP Cache Validators
+"""
+
+import sys
+sys.path.insert(0, '..')
+
+from services.http_cache import candle_fingerprint, make_etag, etag_matches
+
+
+def _create_candles(prices: list) -> list:
+    """Helper to create candle data from prices"""
+    return [[i * 3600000, p, p + 1, p - 1, p, 1000] for i, p in enumerate(prices)]
+
+
+class TestETag:
+    """Tests for validator computation"""
+
+    def test_same_inputs_give_same_etag(self):
+        """Identical inputs should produce identical validators"""
+        fp = candle_fingerprint(_create_candles([100, 101, 102]))
+        assert make_etag("analyze", "ETH/USDT", "1h", fp) == make_etag("analyze", "ETH/USDT", "1h", fp)
+
+    def test_new_candle_changes_etag(self):
+        """A newly closed candle should change the validator"""
+        before = candle_fingerprint(_create_candles([100, 101, 102]))
+        after = candle_fingerprint(_create_candles([100, 101, 102, 103]))
+        assert make_etag("analyze", "ETH/USDT", before) != make_etag("analyze", "ETH/USDT", after)
+
+    def test_strategy_params_change_etag(self):
+        """Different strategy parameters should change the validator"""
+        fp = candle_fingerprint(_create_candles([100, 101, 102]))
+        assert make_etag("analyze", fp, (30, 70)) != make_etag("analyze", fp, (25, 75))
+
+    def test_empty_candles_fingerprint(self):
+        """Empty windows should still fingerprint without errors"""
+        assert candle_fingerprint([]) == (None, None, None, 0)
+
+    def test_etag_is_weak(self):
+        """Validators should be weak ETags"""
+        assert make_etag("x").startswith('W/"')
+
+
+class TestIfNoneMatch:
+    """Tests for If-None-Match evaluation"""
+
+    def test_missing_header_does_not_match(self):
+        assert etag_matches(None, 'W/"abc"') is False
+
+    def test_exact_match(self):
+        assert etag_matches('W/"abc"', 'W/"abc"') is True
+
+    def test_weak_comparison_ignores_prefix(self):
+        """Weak comparison should treat W/"abc" and "abc" as equal"""
+        assert etag_matches('"abc"', 'W/"abc"') is True
+
+    def test_list_of_tags(self):
+        assert etag_matches('"xyz", W/"abc"', 'W/"abc"') is True
+        assert etag_matches('"xyz", W/"def"', 'W/"abc"') is False
+
+    def test_wildcard(self):
+        assert etag_matches('*', 'W/"abc"') is True
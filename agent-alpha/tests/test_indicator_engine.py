@@ -0,0 +1,124 @@
+"""
+Tests for the single-pass Indicator Engine
+"""
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from services.indicator_engine import IndicatorEngine, IndicatorParams, latest_values
+from services.indicators import (
+    calculate_rsi,
+    calculate_bollinger_bands,
+    calculate_sma,
+    calculate_ema,
+)
+
+
+def _random_candles(n: int, seed: int = 7) -> list:
+    """Random-walk candles with consistent OHLC and positive volume"""
+    rng = np.random.default_rng(seed)
+    closes = 100 + np.cumsum(rng.normal(0, 1, n))
+    candles = []
+    for i, close in enumerate(closes):
+        open_ = close + rng.normal(0, 0.3)
+        high = max(open_, close) + abs(rng.normal(0, 0.5))
+        low = min(open_, close) - abs(rng.normal(0, 0.5))
+        candles.append([i * 3600000, open_, high, low, close, rng.uniform(10, 100)])
+    return candles
+
+
+class TestEngineMatchesScalarFunctions:
+    """Series values at bar t should equal the scalar functions on candles[:t+1]"""
+
+    @pytest.fixture
+    def candles(self):
+        return _random_candles(200)
+
+    @pytest.fixture
+    def series(self, candles):
+        return IndicatorEngine(candles).compute(["rsi", "sma", "ema", "bollinger"])
+
+    def test_rsi_series(self, candles, series):
+        closes = [c[4] for c in candles]
+        assert np.all(np.isnan(series["rsi"][:14]))
+        for t in range(14, len(closes)):
+            assert series["rsi"][t] == calculate_rsi(closes[:t + 1], period=14)
+
+    def test_bollinger_series(self, candles, series):
+        closes = [c[4] for c in candles]
+        for t in range(19, len(closes)):
+            upper, middle, lower = calculate_bollinger_bands(closes[:t + 1], period=20, std_dev=2)
+            assert (series["bb_upper"][t], series["bb_middle"][t], series["bb_lower"][t]) == (upper, middle, lower)
+
+    def test_sma_and_ema_series(self, candles, series):
+        closes = [c[4] for c in candles]
+        for t in range(19, len(closes)):
+            assert series["sma"][t] == calculate_sma(closes[:t + 1], 20)
+            assert series["ema"][t] == calculate_ema(closes[:t + 1], 20)
+
+
+class TestExtendedIndicators:
+    """Tests for MACD, ATR, Stochastic and VWAP"""
+
+    @pytest.fixture
+    def candles(self):
+        return _random_candles(300, seed=11)
+
+    def test_macd_is_fast_minus_slow_ema(self, candles):
+        closes = [c[4] for c in candles]
+        series = IndicatorEngine(candles).compute(["macd"])
+        t = len(closes) - 1
+        expected = calculate_ema(closes, 12) - calculate_ema(closes, 26)
+
+        assert series["macd"][t] == pytest.approx(expected)
+        assert np.isnan(series["macd_signal"][25 + 7])
+        assert not np.isnan(series["macd_signal"][25 + 8])
+        np.testing.assert_allclose(series["macd_hist"], series["macd"] - series["macd_signal"])
+
+    def test_atr_of_constant_range_bars(self):
+        candles = [[i, 100, 102, 98, 100, 1] for i in range(50)]
+        atr = IndicatorEngine(candles).compute(["atr"])["atr"]
+
+        assert np.all(np.isnan(atr[:14]))
+        np.testing.assert_allclose(atr[14:], 4.0)
+
+    def test_stochastic_bounds(self, candles):
+        series = IndicatorEngine(candles).compute(["stochastic"])
+        k = series["stoch_k"][13:]
+        d = series["stoch_d"][15:]
+
+        assert np.all((k >= 0) & (k <= 100))
+        assert np.all((d >= 0) & (d <= 100))
+        assert series["stoch_d"][-1] == pytest.approx(np.mean(series["stoch_k"][-3:]))
+
+    def test_vwap_of_constant_typical_price(self):
+        candles = [[i, 10, 12, 8, 10, 5 + i] for i in range(30)]
+        vwap = IndicatorEngine(candles).compute(["vwap"])["vwap"]
+        np.testing.assert_allclose(vwap, 10.0)
+
+    def test_vwap_without_volume_is_undefined(self):
+        candles = [[i, 10, 12, 8, 10, 0] for i in range(30)]
+        assert latest_values(IndicatorEngine(candles).compute(["vwap"]))["vwap"] is None
+
+
+class TestEngineBehavior:
+    """Tests for request handling and shared intermediates"""
+
+    def test_unknown_indicator_raises(self):
+        with pytest.raises(ValueError):
+            IndicatorEngine(_random_candles(50)).compute(["rsi", "ichimoku"])
+
+    def test_short_history_warms_up_with_nan(self):
+        series = IndicatorEngine(_random_candles(10)).compute()
+        assert all(np.all(np.isnan(values)) for name, values in series.items() if name != "vwap")
+
+    def test_intermediates_are_shared(self):
+        engine = IndicatorEngine(_random_candles(100))
+        params = IndicatorParams(ema_period=12)
+        series = engine.compute(["ema", "macd"], params)
+
+        ema_keys = [key for key in engine._cache if key[0] == "ema"]
+        assert sorted(key[2] for key in ema_keys) == [12, 26]
+        assert series["ema"] is engine._cache[("ema", "close", 12)]
@@ -13,7 +13,9 @@ from services.indicators import (
     calculate_rsi,
     calculate_bollinger_bands,
     calculate_sma,
-    get_price_position
+    get_price_position,
+    calculate_rsi_batch,
+    calculate_bollinger_bands_batch
 )
 
 
@@ -161,3 +163,48 @@ class TestSMACalculation:
         
         expected = (10 + 20 + 30 + 40 + 50) / 5
         assert sma == expected, f"SMA should be {expected}, got {sma}"
+
+
+class TestBatchIndicators:
+    """Tests for multi-period batch calculations"""
+    
+    @pytest.fixture
+    def prices(self):
+        rng = np.random.default_rng(3)
+        return list(100 + np.cumsum(rng.normal(0, 1, 200)))
+    
+    def test_rsi_batch_matches_single_period(self, prices):
+        """Every cell should equal calculate_rsi on the matching prefix"""
+        periods = [7, 14, 21, 28]
+        batch = calculate_rsi_batch(prices, periods)
+        
+        assert batch.shape == (4, len(prices))
+        for row, period in enumerate(periods):
+            assert np.all(np.isnan(batch[row, :period]))
+            for t in range(period, len(prices)):
+                assert batch[row, t] == calculate_rsi(prices[:t + 1], period=period)
+    
+    def test_rsi_batch_all_gains(self):
+        """Monotonic gains should give RSI 100 for every period"""
+        batch = calculate_rsi_batch([100 + i for i in range(40)], [7, 14])
+        assert np.all(batch[0, 7:] == 100) and np.all(batch[1, 14:] == 100)
+    
+    def test_bollinger_batch_matches_single_period(self, prices):
+        """Every cell should equal calculate_bollinger_bands on the matching prefix"""
+        periods, std_devs = [10, 20, 30], [1.5, 2, 2.5]
+        upper, middle, lower = calculate_bollinger_bands_batch(prices, periods, std_devs)
+        
+        assert middle.shape == (3, len(prices))
+        assert upper.shape == lower.shape == (3, 3, len(prices))
+        for i, period in enumerate(periods):
+            for k, std_dev in enumerate(std_devs):
+                for t in range(period - 1, len(prices)):
+                    expected = calculate_bollinger_bands(prices[:t + 1], period=period, std_dev=std_dev)
+                    assert (upper[i, k, t], middle[i, t], lower[i, k, t]) == expected
+    
+    def test_batch_short_history_is_nan(self):
+        """Periods longer than the history should produce all-NaN rows"""
+        rsi = calculate_rsi_batch([1.0, 2.0, 3.0], [14])
+        _, middle, _ = calculate_bollinger_bands_batch([1.0, 2.0, 3.0], [20], [2])
+        
+        assert np.all(np.isnan(rsi)) and np.all(np.isnan(middle))
@@ -0,0 +1,234 @@
+"""
+Tests for the Background Job Queue
+"""
+
+import asyncio
+import json
+import os
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from services.jobs import (
+    JobManager, BacktestRunner, run_backtest_task, COMPLETED, CANCELLED, FAILED, RUNNING
+)
+from services.market_data import MarketDataService
+
+
+class GatedRunner:
+    """Runner whose tasks finish only when released"""
+
+    def __init__(self):
+        self.calls = []
+        self.release = asyncio.Event()
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, task):
+        self.calls.append(task)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await self.release.wait()
+        finally:
+            self.running -= 1
+        return {"value": task["n"] * 2}
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestJobManager:
+    """Tests for job lifecycle"""
+
+    async def test_submit_and_complete(self, tmp_path):
+        runner = GatedRunner()
+        runner.release.set()
+        manager = JobManager(runner, str(tmp_path))
+
+        job = manager.submit([{"n": 1}, {"n": 2}])
+        await manager.wait(job.id)
+
+        assert job.status == COMPLETED
+        assert job.progress == 1.0
+        assert job.results == [{"value": 2}, {"value": 4}]
+
+    async def test_progress_and_checkpoint(self, tmp_path):
+        runner = GatedRunner()
+        manager = JobManager(runner, str(tmp_path))
+        job = manager.submit([{"n": 1}, {"n": 2}])
+        await _settle()
+
+        assert job.status == RUNNING and job.progress == 0.0
+        with open(tmp_path / f"{job.id}.json") as f:
+            assert json.load(f)["status"] == RUNNING
+
+        runner.release.set()
+        await manager.wait(job.id)
+        with open(tmp_path / f"{job.id}.json") as f:
+            saved = json.load(f)
+        assert saved["status"] == COMPLETED and saved["results"][1] == {"value": 4}
+
+    async def test_cancel_keeps_finished_results(self, tmp_path):
+        calls = []
+
+        async def runner(task):
+            calls.append(task)
+            if task["n"] == 2:
+                await asyncio.sleep(10)
+            return {"value": task["n"]}
+
+        manager = JobManager(runner, str(tmp_path))
+        job = manager.submit([{"n": 1}, {"n": 2}, {"n": 3}])
+        await _settle()
+
+        manager.cancel(job.id)
+        await manager.wait(job.id)
+
+        assert job.status == CANCELLED
+        assert job.results == [{"value": 1}, None, None]
+        assert len(calls) == 2
+
+    async def test_caps_concurrent_jobs(self, tmp_path):
+        runner = GatedRunner()
+        manager = JobManager(runner, str(tmp_path), max_concurrent=2)
+        jobs = [manager.submit([{"n": i}]) for i in range(5)]
+        await _settle()
+
+        assert runner.max_running == 2
+        runner.release.set()
+        for job in jobs:
+            await manager.wait(job.id)
+        assert all(job.status == COMPLETED for job in jobs)
+        assert runner.max_running == 2
+
+    async def test_failed_task_fails_job(self, tmp_path):
+        async def runner(task):
+            raise RuntimeError("upstream down")
+
+        manager = JobManager(runner, str(tmp_path))
+        job = manager.submit([{"n": 1}])
+        await manager.wait(job.id)
+
+        assert job.status == FAILED
+        assert job.error == "upstream down"
+
+    async def test_resume_after_restart(self, tmp_path):
+        calls = []
+
+        async def slow_runner(task):
+            calls.append(task["n"])
+            if task["n"] == 2:
+                await asyncio.sleep(10)
+            return {"value": task["n"]}
+
+        first = JobManager(slow_runner, str(tmp_path))
+        job = first.submit([{"n": 1}, {"n": 2}, {"n": 3}])
+        await _settle()
+        await first.close()  # Simulated shutdown mid-job
+
+        resumed_calls = []
+
+        async def runner(task):
+            resumed_calls.append(task["n"])
+            return {"value": task["n"]}
+
+        second = JobManager(runner, str(tmp_path))
+        resumed = second.resume()
+        assert [j.id for j in resumed] == [job.id]
+
+        restored = await second.wait(job.id)
+        assert restored.status == COMPLETED
+        assert restored.results == [{"value": 1}, {"value": 2}, {"value": 3}]
+        assert resumed_calls == [2, 3]
+
+    async def test_finished_jobs_are_loaded_not_rerun(self, tmp_path):
+        runner = GatedRunner()
+        runner.release.set()
+        first = JobManager(runner, str(tmp_path))
+        job = first.submit([{"n": 1}])
+        await first.wait(job.id)
+
+        second = JobManager(runner, str(tmp_path))
+        assert second.resume() == []
+        assert second.get(job.id).results == [{"value": 2}]
+        assert not any(name.endswith(".tmp") for name in os.listdir(tmp_path))
+
+    async def test_old_finished_jobs_are_pruned(self, tmp_path):
+        runner = GatedRunner()
+        runner.release.set()
+        now = [0.0]
+        manager = JobManager(runner, str(tmp_path), clock=lambda: now[0], max_finished=2)
+
+        jobs = []
+        for n in range(4):
+            now[0] += 1
+            jobs.append(manager.submit([{"n": n}]))
+            await manager.wait(jobs[-1].id)
+
+        assert [job.id for job in manager.jobs()] == [jobs[2].id, jobs[3].id]
+        assert sorted(os.listdir(tmp_path)) == sorted(f"{job.id}.json" for job in jobs[2:])
+        with pytest.raises(KeyError):
+            manager.get(jobs[0].id)
+
+    def test_unknown_job(self, tmp_path):
+        manager = JobManager(GatedRunner(), str(tmp_path))
+        with pytest.raises(KeyError):
+            manager.get("missing")
+
+
+def _candles(count=400):
+    rng = np.random.default_rng(1)
+    prices = 100 + 10 * np.sin(np.arange(count) * 0.15) + rng.uniform(-1, 1, count)
+    return [[i * 3600000, p, p + 1, p - 1, float(p), 1000] for i, p in enumerate(prices)]
+
+
+class TestBacktestTasks:
+    """Tests for the backtest runner"""
+
+    def test_task_params_are_applied(self):
+        candles = _candles()
+        default = run_backtest_task(candles, {})
+        strict = run_backtest_task(candles, {"rsi_oversold": 5, "rsi_overbought": 95})
+        stopped = run_backtest_task(candles, {"stop_loss": 0.001, "take_profit": 0.05})
+
+        assert default["total_signals"] > 0
+        assert strict["total_signals"] < default["total_signals"]
+        assert stopped["win_rate"] < default["win_rate"]
+        json.dumps(default)
+
+    def test_sweep_exit_params_change_metrics(self):
+        candles = _candles(800)
+        sweep = [
+            {"take_profit": 0.01},
+            {"take_profit": 0.03},
+            {"take_profit": 0.03, "stop_loss": 0.005},
+            {"take_profit": 0.03, "stop_loss": 0.005, "trigger": "high_low"},
+        ]
+        metrics = [run_backtest_task(candles, task) for task in sweep]
+
+        summaries = {
+            (m["total_return"], m["sharpe"], m["exposure"], m["trades"]) for m in metrics
+        }
+        assert len(summaries) == len(sweep)
+
+    async def test_runner_fetches_candles(self, tmp_path):
+        candles = _candles()
+
+        class Source:
+            async def fetch_candles(self, symbol, interval, limit):
+                return candles[-limit:]
+
+        runner = BacktestRunner(MarketDataService(Source()))
+        manager = JobManager(runner, str(tmp_path))
+        job = manager.submit([{"symbol": "ETH/USDT", "limit": 300}, {"symbol": "ETH/USDT", "max_bars": 12}])
+        await manager.wait(job.id)
+        runner.shutdown()
+
+        assert job.status == COMPLETED
+        assert job.results[0]["candles"] == 300
+        assert job.results[1]["task"]["max_bars"] == 12
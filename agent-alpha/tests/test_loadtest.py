@@ -0,0 +1,65 @@
+"""
+Tests for the HTTP Load Driver
+"""
+
+import json
+
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from aiohttp.test_utils import TestServer
+
+from services.fake_upstream import FakeUpstream, FakeUpstreamConfig
+from services.loadtest import run_load_test, format_results
+
+
+@pytest.fixture
+async def server():
+    fake = FakeUpstream(FakeUpstreamConfig(latency_ms=20, seed=2))
+    async with TestServer(fake.app) as test_server:
+        test_server.fake = fake
+        yield test_server
+
+
+class TestLoadDriver:
+    """Tests for load levels and reporting"""
+
+    async def test_request_budget_and_percentiles(self, server):
+        endpoints = ["/simple/price?ids=ethereum", "/coins/markets?ids=bitcoin"]
+        results = await run_load_test(
+            str(server.make_url("")), endpoints, [1, 4], requests_per_level=20
+        )
+
+        assert [level.concurrency for level in results] == [1, 4]
+        for level in results:
+            assert sum(stats.requests for stats in level.endpoints.values()) == 20
+            for stats in level.endpoints.values():
+                assert stats.requests == 10 and stats.errors == 0
+                assert stats.latency["p50_ms"] >= 20
+                assert stats.statuses == {"200": 10}
+
+        # Four requests in flight should finish the same budget faster than one
+        assert results[1].elapsed_seconds < results[0].elapsed_seconds
+
+    async def test_counts_errors(self, server):
+        server.fake.config.error_rate = 1.0
+        results = await run_load_test(
+            str(server.make_url("")), ["/simple/price?ids=ethereum"], [2], requests_per_level=6
+        )
+        stats = results[0].endpoints["/simple/price?ids=ethereum"]
+        assert stats.errors == 6 and stats.statuses == {"500": 6}
+
+    async def test_duration_and_table(self, server):
+        results = await run_load_test(
+            str(server.make_url("")), ["/simple/price?ids=ethereum"], [2], duration=0.3
+        )
+        stats = results[0].endpoints["/simple/price?ids=ethereum"]
+        assert stats.requests > 5 and stats.throughput > 0
+
+        table = format_results(results)
+        assert "/simple/price?ids=ethereum" in table and "p95 ms" in table
+
+    async def test_requires_a_stop_condition(self, server):
+        with pytest.raises(ValueError):
+            await run_load_test(str(server.make_url("")), ["/"], [1])
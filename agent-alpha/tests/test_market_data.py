@@ -0,0 +1,124 @@
+"""
+Tests for the stale-while-revalidate Market Data Layer
+"""
+
+import asyncio
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from services.market_data import MarketDataService, UpstreamUnavailableError
+from services.resilience import CircuitBreaker
+
+
+class FakeClock:
+    """Manually advanced clock shared by the service and breaker"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSource:
+    """Upstream stand-in that counts calls and can be switched to fail"""
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+        self.delay = 0.0
+
+    async def fetch_candles(self, symbol, interval, limit):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise Exception("CoinGecko API error: 500")
+        return [[self.calls * 3600000, 1.0, 2.0, 0.5, 1.5, 0]]
+
+
+class TestMarketDataService:
+    """Tests for caching, staleness and outage behavior"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def source(self):
+        return FakeSource()
+
+    @pytest.fixture
+    def service(self, source, clock):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0, clock=clock)
+        return MarketDataService(source, fresh_ttl=60, max_stale=3600, breaker=breaker, clock=clock)
+
+    async def test_fresh_entry_is_served_from_cache(self, service, source):
+        """Repeated requests within the TTL should hit upstream once"""
+        first = await service.get_candles("ETH/USDT", "1h", 720)
+        second = await service.get_candles("ETH/USDT", "1h", 720)
+
+        assert source.calls == 1
+        assert first.candles == second.candles
+        assert second.stale is False
+
+    async def test_expired_entry_served_stale_and_refreshed(self, service, source, clock):
+        """Expired entries should be returned immediately and refreshed in the background"""
+        await service.get_candles("ETH/USDT", "1h", 720)
+        clock.now += 120
+
+        snapshot = await service.get_candles("ETH/USDT", "1h", 720)
+        assert snapshot.stale is True
+        assert snapshot.candles[0][0] == 3600000
+
+        await asyncio.sleep(0)
+        refreshed = await service.get_candles("ETH/USDT", "1h", 720)
+        assert source.calls == 2
+        assert refreshed.stale is False
+        assert refreshed.candles[0][0] == 2 * 3600000
+
+    async def test_outage_serves_stale_without_waiting(self, service, source, clock):
+        """During an outage cached data should be served without upstream latency"""
+        await service.get_candles("ETH/USDT", "1h", 720)
+        source.fail = True
+        source.delay = 0.05
+
+        for _ in range(3):
+            clock.now += 120
+            await service.get_candles("ETH/USDT", "1h", 720)
+            await asyncio.sleep(0.06)
+
+        assert service.breaker.state == CircuitBreaker.OPEN
+        calls_when_open = source.calls
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        snapshot = await service.get_candles("ETH/USDT", "1h", 720)
+        assert loop.time() - started < 0.05
+        assert snapshot.stale is True
+        assert source.calls == calls_when_open
+
+    async def test_no_cache_and_failure_raises_unavailable(self, service, source):
+        """With nothing cached an upstream failure should surface as unavailable"""
+        source.fail = True
+
+        with pytest.raises(UpstreamUnavailableError):
+            await service.get_candles("BTC/USDT", "1h", 720)
+
+    async def test_concurrent_misses_share_one_fetch(self, service, source):
+        """Concurrent cache misses for one key should trigger a single upstream call"""
+        source.delay = 0.01
+        results = await asyncio.gather(*[service.get_candles("SOL/USDT", "1h", 720) for _ in range(5)])
+
+        assert source.calls == 1
+        assert all(r.candles == results[0].candles for r in results)
+
+    async def test_entries_past_max_stale_are_not_served(self, service, source, clock):
+        """Snapshots older than max_stale should not be served during an outage"""
+        await service.get_candles("ETH/USDT", "1h", 720)
+        source.fail = True
+        clock.now += 7200
+
+        with pytest.raises(UpstreamUnavailableError):
+            await service.get_candles("ETH/USDT", "1h", 720)
@@ -0,0 +1,156 @@
+"""
+Tests for the Memory-Bounded Cache
+"""
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from services.market_data import MarketDataService
+from services.memory_cache import SizedCache, estimate_size
+
+
+def _array(kb):
+    return np.zeros(kb * 1024 // 8)
+
+
+class TestEstimateSize:
+    """Tests for the size estimate"""
+
+    def test_counts_array_buffers(self):
+        assert 64 * 1024 <= estimate_size(_array(64)) < 65 * 1024
+        # A view keeps the bytes it spans alive
+        assert 32 * 1024 <= estimate_size(_array(64)[:4096]) < 33 * 1024
+        assert estimate_size(_array(64)[:10]) < 1024
+
+    def test_long_lists_are_extrapolated(self):
+        candles = [[i * 3600000, 1.0, 2.0, 0.5, 1.5, 10.0] for i in range(1000)]
+        exact = sys.getsizeof(candles) + sum(
+            sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row) for row in candles
+        )
+        assert estimate_size(candles) == pytest.approx(exact, rel=0.05)
+
+
+class TestSizedCache:
+    """Tests for budget, eviction policies and pinning"""
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = SizedCache(max_bytes=3 * 1024, policy="lru")
+        cache.put(("A", "1h"), "a", size=1024)
+        cache.put(("B", "1h"), "b", size=1024)
+        cache.put(("C", "1h"), "c", size=1024)
+        cache.get(("A", "1h"))
+        cache.put(("D", "1h"), "d", size=1024)
+
+        assert ("B", "1h") not in cache
+        assert all(k in cache for k in [("A", "1h"), ("C", "1h"), ("D", "1h")])
+        assert cache.resident_bytes == 3 * 1024
+        assert cache.stats()["evictions"] == 1
+
+    def test_lfu_evicts_least_frequently_used(self):
+        cache = SizedCache(max_bytes=3 * 1024, policy="lfu")
+        for key in ("A", "B", "C"):
+            cache.put((key,), key, size=1024)
+        for _ in range(3):
+            cache.get(("A",))
+            cache.get(("B",))
+        cache.get(("C",))  # Most recent but least used
+        cache.put(("D",), "d", size=1024)
+
+        assert ("C",) not in cache
+        assert ("D",) in cache
+
+    def test_pinned_symbols_are_never_evicted(self):
+        cache = SizedCache(max_bytes=2 * 1024, pinned_symbols=["ETH/USDT"])
+        cache.put(("ETH/USDT", "1h"), "hot", size=1024)
+        for i in range(5):
+            cache.put((f"X{i}", "1h"), i, size=1024)
+
+        assert ("ETH/USDT", "1h") in cache
+        stats = cache.stats()
+        assert stats["pinned_bytes"] == 1024
+        assert stats["resident_bytes"] <= 2 * 1024
+
+        cache.unpin("ETH/USDT")
+        cache.put(("Y", "1h"), "y", size=2 * 1024)
+        assert ("ETH/USDT", "1h") not in cache
+
+    def test_lru_eviction_stops_at_first_unpinned_entries(self):
+        cache = SizedCache(max_bytes=100 * 1024, pinned_symbols=["P"])
+        cache.put(("P", "1h"), "pinned", size=1024)
+        for i in range(99):
+            cache.put((f"X{i}",), i, size=1024)
+        cache.put(("Y",), "y", size=3 * 1024)
+
+        assert [k for k in list(cache)[:2]] == [("P", "1h"), ("X3",)]
+        assert cache.stats()["evictions"] == 3
+        assert cache.resident_bytes == 100 * 1024
+
+    def test_oversized_values_are_rejected(self):
+        cache = SizedCache(max_bytes=1024)
+        cache.put(("A",), "a", size=512)
+
+        assert cache.put(("B",), _array(4)) is False
+        assert ("B",) not in cache
+        assert ("A",) in cache
+        assert cache.stats()["rejected"] == 1
+
+    def test_replacing_updates_resident_size(self):
+        cache = SizedCache(max_bytes=10 * 1024)
+        cache.put(("A",), "a", size=4096)
+        cache.put(("A",), "a", size=1024)
+        assert cache.resident_bytes == 1024
+        del cache[("A",)]
+        assert cache.resident_bytes == 0
+
+    def test_hit_and_miss_counters(self):
+        cache = SizedCache()
+        cache.put(("A",), 1)
+        cache.get(("A",))
+        cache.get(("B",))
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError):
+            SizedCache(policy="fifo")
+
+
+class CountingSource:
+    def __init__(self):
+        self.calls = 0
+
+    async def fetch_candles(self, symbol, interval, limit):
+        self.calls += 1
+        return [[i * 3600000, 1.0, 2.0, 0.5, 1.5, 10.0] for i in range(limit)]
+
+
+class TestMarketDataIntegration:
+    """MarketDataService keeps its snapshots in the sized cache"""
+
+    async def test_snapshots_stay_within_budget(self):
+        source = CountingSource()
+        one = estimate_size((await MarketDataService(CountingSource()).get_candles("S0", "1h", 100)))
+        cache = SizedCache(max_bytes=int(one * 2.5), pinned_symbols=["S0"])
+        service = MarketDataService(source, cache=cache)
+
+        for i in range(4):
+            await service.get_candles(f"S{i}", "1h", 100)
+        assert cache.resident_bytes <= cache.max_bytes
+        assert cache.stats()["evictions"] == 2
+
+        await service.get_candles("S0", "1h", 100)  # Pinned: still cached
+        assert source.calls == 4
+        await service.get_candles("S1", "1h", 100)  # Evicted: refetched
+        assert source.calls == 5
+
+    async def test_invalidate_drops_symbol_entries(self):
+        cache = SizedCache()
+        service = MarketDataService(CountingSource(), cache=cache)
+        await service.get_candles("ETH/USDT", "1h", 10)
+        cache.put(("ETH/USDT", "1h", "indicators"), {"rsi": _array(1)})
+        cache.put(("BTC/USDT", "1h", "indicators"), {"rsi": _array(1)})
+
+        service.invalidate("ETH/USDT")
+        assert list(cache) == [("BTC/USDT", "1h", "indicators")]
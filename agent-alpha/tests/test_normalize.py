@@ -0,0 +1,164 @@
+"""
+Tests for Candle Normalization
+"""
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from services.market_data import MarketDataService
+from services.normalize import infer_step, normalize_candles, resample_candles
+
+
+HOUR = 3600000
+
+
+def _candles(slots, offset=0):
+    return [[s * HOUR + offset, 100.0 + s, 101.0 + s, 99.0 + s, 100.5 + s, 10.0] for s in slots]
+
+
+def _reference_ffill(candles, step):
+    """Loop reference: dict by slot (last wins), then walk the grid"""
+    by_slot = {}
+    origin = min(c[0] for c in candles)
+    for c in sorted(candles, key=lambda c: c[0]):
+        by_slot[round((c[0] - origin) / step)] = c
+    rows, previous = [], None
+    for slot in range(max(by_slot) + 1):
+        if slot in by_slot:
+            previous = [origin + slot * step] + list(by_slot[slot][1:])
+            rows.append(previous)
+        else:
+            close = previous[4]
+            rows.append([origin + slot * step, close, close, close, close, 0.0])
+    return np.asarray(rows, dtype=float)
+
+
+class TestNormalizeCandles:
+    """Tests for gap, duplicate and alignment handling"""
+
+    def test_clean_series_is_unchanged(self):
+        candles = _candles(range(50))
+        result = normalize_candles(candles, "1h")
+        assert np.array_equal(result.candles, np.asarray(candles, dtype=float))
+        assert result.quality.clean
+        assert result.quality.coverage == 1.0
+
+    def test_ffill_gaps(self):
+        candles = _candles([0, 1, 2, 5, 6, 10])
+        result = normalize_candles(candles, "1h")
+        q = result.quality
+
+        assert len(result.candles) == 11
+        assert np.array_equal(result.candles[:, 0], np.arange(11) * HOUR)
+        assert (q.gaps, q.missing_bars, q.largest_gap, q.filled) == (2, 5, 3, 5)
+        assert np.array_equal(np.flatnonzero(result.filled), [3, 4, 7, 8, 9])
+        # Filled bars are flat at the previous close with no volume
+        assert np.all(result.candles[3:5, 1:5] == candles[2][4])
+        assert np.all(result.candles[7:10, 1:5] == candles[4][4])
+        assert np.all(result.candles[result.filled, 5] == 0)
+        assert q.coverage == pytest.approx(6 / 11)
+
+    def test_drop_and_mark(self):
+        candles = _candles([0, 1, 4])
+        dropped = normalize_candles(candles, "1h", policy="drop")
+        assert len(dropped.candles) == 3
+        assert dropped.quality.missing_bars == 2
+        assert dropped.quality.filled == 0
+
+        marked = normalize_candles(candles, "1h", policy="mark")
+        assert len(marked.candles) == 5
+        assert np.all(np.isnan(marked.candles[2:4, 1:5]))
+        assert not np.isnan(marked.candles[:, 0]).any()
+
+    def test_duplicates_and_out_of_order(self):
+        candles = _candles([0, 2, 1, 3])
+        updated = [3 * HOUR, 1.0, 2.0, 0.5, 1.5, 99.0]
+        result = normalize_candles(candles + [updated], "1h")
+
+        q = result.quality
+        assert (q.duplicates, q.out_of_order, q.missing_bars) == (1, 1, 0)
+        assert len(result.candles) == 4
+        assert list(result.candles[-1]) == updated  # Later row wins
+
+    def test_misaligned_rows_are_snapped(self):
+        candles = _candles([0, 1, 2]) + [[3 * HOUR + 1000, 1.0, 2.0, 0.5, 1.5, 1.0]]
+        result = normalize_candles(candles, "1h")
+        assert result.quality.misaligned == 1
+        assert result.candles[-1, 0] == 3 * HOUR
+
+    def test_step_is_inferred(self):
+        candles = _candles([0, 4, 8, 16, 20])  # 4h candles with one missing
+        assert infer_step(np.asarray(candles)[:, 0]) == 4 * HOUR
+        result = normalize_candles(candles)
+        assert result.quality.step_ms == 4 * HOUR
+        assert result.quality.missing_bars == 1
+
+    def test_matches_loop_reference(self):
+        rng = np.random.default_rng(3)
+        for _ in range(20):
+            slots = np.sort(rng.choice(300, size=200, replace=False))
+            slots = np.concatenate([slots, rng.choice(slots, size=10)])  # Duplicates
+            rng.shuffle(slots)
+            candles = [[s * HOUR, *rng.normal(100, 1, 4), rng.random()] for s in slots]
+            result = normalize_candles(candles, "1h")
+            assert np.array_equal(result.candles, _reference_ffill(candles, HOUR))
+
+    def test_empty_and_invalid(self):
+        assert len(normalize_candles([], "1h").candles) == 0
+        assert normalize_candles(_candles([5]), "1h").quality.rows_out == 1
+        with pytest.raises(ValueError):
+            normalize_candles(_candles([0]), "1h", policy="interpolate")
+
+
+def test_resample_aggregates_into_coarser_bars():
+    candles = [[s * HOUR, s, s + 2, s - 2, s + 1, 1.0] for s in [1, 0, 2, 3, 5]]
+    bars = resample_candles(candles, 4 * HOUR)
+
+    assert bars.tolist() == [
+        [0, 0, 5, -2, 4, 4.0],
+        [4 * HOUR, 5, 7, 3, 6, 1.0],
+    ]
+    assert len(resample_candles([], HOUR)) == 0
+
+
+class GappySource:
+    async def fetch_candles(self, symbol, interval, limit):
+        return _candles([0, 1, 2, 3, 7, 8, 9, 9])
+
+
+class SparseSource:
+    """Every other hour is missing; declares hourly granularity"""
+
+    def granularity_ms(self, interval, limit):
+        return HOUR
+
+    async def fetch_candles(self, symbol, interval, limit):
+        return _candles([0, 2, 4, 6, 7])
+
+
+class TestMarketDataNormalization:
+    """MarketDataService applies the gap policy to fetched candles"""
+
+    async def test_snapshot_is_regular(self):
+        service = MarketDataService(GappySource(), gap_policy="ffill")
+        snapshot = await service.get_candles("ETH/USDT", "1h", 8)
+
+        assert len(snapshot.candles) == 8  # Trimmed back to the requested limit
+        assert np.array_equal(np.diff(np.asarray(snapshot.candles)[:, 0]), np.full(7, HOUR))
+        assert snapshot.quality.missing_bars == 3
+        assert snapshot.quality.duplicates == 1
+        assert all(type(c[0]) is int for c in snapshot.candles)
+
+    async def test_declared_granularity_is_used(self):
+        snapshot = await MarketDataService(SparseSource(), gap_policy="ffill").get_candles("ETH/USDT", "1h", 8)
+
+        # Inferring would pick a 2h grid from the median spacing
+        assert snapshot.quality.step_ms == HOUR
+        assert [c[0] for c in snapshot.candles] == [i * HOUR for i in range(8)]
+
+    async def test_disabled_by_default(self):
+        snapshot = await MarketDataService(GappySource()).get_candles("ETH/USDT", "1h", 8)
+        assert snapshot.quality is None
+        assert len(snapshot.candles) == 8
@@ -0,0 +1,119 @@
+"""
+Tests for Options Pricing
+"""
+
+import math
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from services.options import (
+    norm_cdf, black_scholes, implied_volatility, realized_volatility,
+    strike_step, suggest_strike
+)
+
+
+class TestBlackScholes:
+    """Tests for prices and Greeks"""
+
+    def test_norm_cdf_matches_erfc(self):
+        x = np.linspace(-8, 8, 801)
+        expected = np.array([0.5 * math.erfc(-v / math.sqrt(2)) for v in x])
+        assert np.allclose(norm_cdf(x), expected, rtol=2e-7, atol=0)
+
+    def test_known_value(self):
+        # Hull's textbook example: S=42, K=40, r=10%, sigma=20%, T=0.5
+        call = black_scholes(42, 40, 0.5, 0.2, rate=0.1, is_call=True)
+        put = black_scholes(42, 40, 0.5, 0.2, rate=0.1, is_call=False)
+        assert float(call.price) == pytest.approx(4.76, abs=0.01)
+        assert float(put.price) == pytest.approx(0.81, abs=0.01)
+
+    def test_put_call_parity(self):
+        strikes = np.linspace(2000, 4000, 41)
+        call = black_scholes(3000, strikes, 0.25, 0.6, rate=0.03, is_call=True)
+        put = black_scholes(3000, strikes, 0.25, 0.6, rate=0.03, is_call=False)
+        assert np.allclose(call.price - put.price, 3000 - strikes * math.exp(-0.03 * 0.25))
+        assert np.allclose(call.delta - put.delta, 1.0)
+        assert np.allclose(call.gamma, put.gamma)
+        assert np.allclose(call.vega, put.vega)
+
+    def test_greeks_match_finite_differences(self):
+        args = dict(strike=3100.0, time=0.1, volatility=0.7, rate=0.02, is_call=False)
+        h = 1e-3
+
+        def price(spot=3000.0, **overrides):
+            params = {**args, **overrides}
+            return float(black_scholes(spot, **params).price)
+
+        greeks = black_scholes(3000.0, **args)
+        assert float(greeks.delta) == pytest.approx((price(3000 + h) - price(3000 - h)) / (2 * h), rel=1e-4)
+        assert float(greeks.gamma) == pytest.approx(
+            (price(3000 + 1) - 2 * price() + price(3000 - 1)), rel=1e-3
+        )
+        assert float(greeks.vega) == pytest.approx(
+            (price(volatility=0.7 + h) - price(volatility=0.7 - h)) / (2 * h), rel=1e-4
+        )
+        assert float(greeks.theta) == pytest.approx(
+            -(price(time=0.1 + h) - price(time=0.1 - h)) / (2 * h), rel=1e-3
+        )
+
+    def test_mixed_chain_broadcasts(self):
+        greeks = black_scholes(3000, [2900, 3000, 3100], 0.1, 0.5, is_call=[True, False, True])
+        assert greeks.price.shape == (3,)
+        assert greeks.delta[0] > 0 and greeks.delta[1] < 0
+
+
+class TestImpliedVolatility:
+    """Tests for the batch solver"""
+
+    def test_recovers_volatility(self):
+        rng = np.random.default_rng(0)
+        n = 5000
+        strikes = rng.uniform(2000, 4000, n)
+        times = rng.uniform(7 / 365, 1, n)
+        vols = rng.uniform(0.1, 1.5, n)
+        calls = rng.random(n) < 0.5
+        greeks = black_scholes(3000, strikes, times, vols, 0.03, calls)
+
+        solved = implied_volatility(greeks.price, 3000, strikes, times, 0.03, calls)
+        # Deep in-the-money options with no time value left do not pin down a volatility
+        identifiable = greeks.vega > 1.0
+        assert identifiable.mean() > 0.95
+        assert np.allclose(solved[identifiable], vols[identifiable], atol=1e-6)
+
+    def test_out_of_bounds_prices_are_nan(self):
+        solved = implied_volatility([0.5, 3000.0, 150.0], 3000, [2000, 3000, 3000], 0.5, is_call=True)
+        assert np.isnan(solved[0])  # Below intrinsic value
+        assert np.isnan(solved[1])  # At the spot price
+        assert not np.isnan(solved[2])
+
+
+class TestStrikeSuggestion:
+    """Tests for strike selection"""
+
+    def test_realized_volatility(self):
+        rng = np.random.default_rng(1)
+        closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 5000)))
+        assert realized_volatility(closes, 8760) == pytest.approx(0.01 * math.sqrt(8760), rel=0.05)
+        assert realized_volatility([100.0], 8760) == 0.0
+
+    def test_strike_step(self):
+        assert strike_step(3000) == 50
+        assert strike_step(60000) == 1000
+        assert strike_step(150) == 2
+
+    def test_call_and_put_suggestions(self):
+        call = suggest_strike("BUY_CALL", 3012.5, 0.6, expiry_days=7, target_delta=0.3)
+        put = suggest_strike("BUY_PUT", 3012.5, 0.6, expiry_days=7, target_delta=0.3)
+
+        assert call.option_type == "CALL" and call.strike > 3012.5
+        assert put.option_type == "PUT" and put.strike < 3012.5
+        assert call.delta == pytest.approx(0.3, abs=0.05)
+        assert put.delta == pytest.approx(-0.3, abs=0.05)
+        assert call.strike % 50 == 0 and call.theta < 0 and call.premium > 0
+
+    def test_no_suggestion_without_trade(self):
+        assert suggest_strike("HOLD", 3000, 0.6) is None
+        assert suggest_strike("BUY_CALL", 3000, 0.0) is None
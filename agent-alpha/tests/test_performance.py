@@ -0,0 +1,196 @@
+"""
+Tests for the Backtest Performance Engine
+"""
+
+import time
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from services.exits import ExitRules, find_exits
+from services.performance import (
+    positions_from_exits, evaluate_positions, backtest_performance,
+    periods_per_year
+)
+from services.signals import SignalGenerator
+
+
+def _mask(length, bars):
+    mask = np.zeros(length, dtype=bool)
+    mask[list(bars)] = True
+    return mask
+
+
+def _timed_positions(closes, buy_call, buy_put, max_bars):
+    """Positions closed by a time exit only"""
+    entries = np.flatnonzero(buy_call | buy_put)
+    rules = ExitRules(take_profit=None, max_bars=max_bars)
+    exits = find_exits(closes, entries, np.where(buy_call[entries], 1, -1), rules)
+    return positions_from_exits(buy_call, buy_put, exits)[0]
+
+
+class TestPositions:
+    """Tests for converting signal masks into positions"""
+
+    def test_no_signals_is_flat(self):
+        exits = find_exits(np.full(5, 100.0), [], [])
+        assert not positions_from_exits(_mask(5, []), _mask(5, []), exits)[0].any()
+
+    def test_positions_close_at_exit_bar(self):
+        closes = np.array([100.0, 100.0, 99.0, 97.0, 96.0, 98.0, 98.0, 98.0])
+        buy_call = _mask(8, [1])
+        timed = find_exits(closes, [1], [1], ExitRules(take_profit=0.05, max_bars=4))
+        stopped = find_exits(closes, [1], [1], ExitRules(take_profit=0.05, stop_loss=0.02, max_bars=4))
+
+        assert positions_from_exits(buy_call, _mask(8, []), timed)[0].tolist() == [0, 1, 1, 1, 1, 0, 0, 0]
+        positions, fills = positions_from_exits(buy_call, _mask(8, []), stopped)
+        assert positions.tolist() == [0, 1, 1, 0, 0, 0, 0, 0]
+        assert fills[3] == 97.0
+
+    def test_new_signal_replaces_open_trade(self):
+        closes = np.full(10, 100.0)
+        exits = find_exits(closes, [1, 3], [1, -1], ExitRules(max_bars=4))
+        positions, fills = positions_from_exits(_mask(10, [1]), _mask(10, [3]), exits)
+
+        assert positions.tolist() == [0, 1, 1, -1, -1, -1, -1, 0, 0, 0]
+        assert np.isnan(fills[5]) and fills[7] == 100.0
+
+    def test_open_trade_held_to_end(self):
+        exits = find_exits(np.full(5, 100.0), [2], [1], ExitRules(max_bars=10))
+        assert positions_from_exits(_mask(5, [2]), _mask(5, []), exits)[0].tolist() == [0, 0, 1, 1, 1]
+
+
+class TestMetrics:
+    """Tests for returns, equity and metrics"""
+
+    def test_long_position_earns_next_bar_return(self):
+        closes = np.array([100.0, 110.0, 121.0, 121.0])
+        report = evaluate_positions(closes, np.array([1, 1, 0, 0]))
+
+        assert np.allclose(report.returns, [0, 0.1, 0.1, 0])
+        assert np.allclose(report.equity, [1, 1.1, 1.21, 1.21])
+        assert report.total_return == pytest.approx(0.21)
+        assert report.trades == 1
+        assert report.hit_rate == 100.0
+        assert report.avg_win == pytest.approx(0.21)
+        assert report.exposure == 0.5
+
+    def test_short_position_and_drawdown(self):
+        closes = np.array([100.0, 110.0, 99.0, 99.0])
+        report = evaluate_positions(closes, np.array([-1, -1, 0, 0]))
+
+        assert np.allclose(report.returns, [0, -0.1, 0.1, 0])
+        assert report.max_drawdown == pytest.approx(0.1)
+        assert report.trades == 1
+        assert report.avg_loss == pytest.approx(0.9 * 1.1 - 1)
+
+    def test_fees_charged_on_position_changes(self):
+        closes = np.full(5, 100.0)
+        report = evaluate_positions(closes, np.array([1, 1, -1, 0, 0]), fee=0.001)
+
+        # Enter long, flip to short (2 units), exit
+        assert np.allclose(report.returns, [-0.001, 0, -0.002, -0.001, 0])
+        assert report.trades == 2
+        assert report.hit_rate == 0.0
+
+    def test_flip_cost_is_split_between_trades(self):
+        closes = np.array([100.0, 100.15, 100.15, 100.15, 100.15])
+        report = evaluate_positions(closes, np.array([1, 1, -1, 0, 0]), fee=0.001)
+
+        # The long pays its entry and half the flip, so its 0.15% gain is a loss
+        long_trade = 1.0015 * 0.999 * 0.999 - 1
+        short_trade = 0.999 * 0.999 - 1
+        assert report.hit_rate == 0.0
+        assert report.avg_loss == pytest.approx((long_trade + short_trade) / 2)
+
+    def test_trade_returns_match_per_trade_loop(self):
+        rng = np.random.default_rng(3)
+        closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 500)))
+        buy_call = rng.random(500) < 0.03
+        buy_put = (rng.random(500) < 0.03) & ~buy_call
+        positions = _timed_positions(closes, buy_call, buy_put, max_bars=10)
+        report = evaluate_positions(closes, positions)
+
+        expected = []
+        t = 0
+        while t < len(positions):
+            if positions[t] != 0 and (t == 0 or positions[t] != positions[t - 1]):
+                end = t
+                while end + 1 < len(positions) and positions[end + 1] == positions[t]:
+                    end += 1
+                exit_bar = min(end + 1, len(closes) - 1)
+                expected.append(positions[t] * (closes[t + 1:exit_bar + 1] / closes[t:exit_bar] - 1))
+                t = end + 1
+            else:
+                t += 1
+        trade_returns = np.array([np.prod(1 + r) - 1 for r in expected])
+
+        assert report.trades == len(trade_returns)
+        assert report.hit_rate == pytest.approx(np.mean(trade_returns > 0) * 100)
+        assert report.avg_win == pytest.approx(trade_returns[trade_returns > 0].mean())
+        assert report.total_return == pytest.approx(report.equity[-1] - 1)
+
+    def test_flat_series_has_zero_ratios(self):
+        report = evaluate_positions(np.full(10, 100.0), np.zeros(10))
+        assert report.sharpe == 0.0 and report.sortino == 0.0 and report.trades == 0
+
+    def test_million_bars(self):
+        rng = np.random.default_rng(0)
+        n = 1_000_000
+        closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+        buy_call = rng.random(n) < 0.01
+        buy_put = (rng.random(n) < 0.01) & ~buy_call
+
+        positions = _timed_positions(closes, buy_call, buy_put, max_bars=24)
+
+        started = time.perf_counter()
+        report = evaluate_positions(closes, positions, fee=0.0005)
+        assert time.perf_counter() - started < 5
+        assert len(report.equity) == n and report.trades > 0
+
+
+class TestPeriodsPerYear:
+    """Tests for annualizing by the observed bar spacing"""
+
+    def test_uses_candle_spacing_over_interval(self):
+        four_hours = [i * 4 * 3600000 for i in range(50)]
+        assert periods_per_year(four_hours, "1h") == pytest.approx(2190)
+        assert periods_per_year([i * 86400000 for i in range(10)], "4h") == pytest.approx(365)
+
+    def test_falls_back_to_interval(self):
+        assert periods_per_year([0], "1d") == 365
+        assert periods_per_year([], "unknown") == 8760
+
+
+class TestBacktestPerformance:
+    """Tests for trading the generator's own signals"""
+
+    def test_uses_generator_signals(self):
+        prices = [100.0] * 60 + [100 - 3 * i for i in range(1, 11)] + [80.0 + i for i in range(30)]
+        candles = [[i * 3600000, p, p + 1, p - 1, p, 1000] for i, p in enumerate(prices)]
+        generator = SignalGenerator()
+
+        report = backtest_performance(candles, generator)
+        _, buy_call, _ = generator.historical_signals(candles)
+
+        assert buy_call.any()
+        assert report.positions[np.argmax(buy_call)] == 1
+        # The rebound hits the last long's take-profit on the next bar
+        assert report.positions[np.flatnonzero(buy_call)[-1] + 1] == 0
+
+    def test_stop_loss_changes_metrics(self):
+        rng = np.random.default_rng(7)
+        prices = 100 + 10 * np.sin(np.arange(800) * 0.15) + np.cumsum(rng.normal(0, 0.8, 800))
+        candles = [[i * 3600000, p, p + 1, p - 1, p, 1000] for i, p in enumerate(prices)]
+        loose = SignalGenerator(exit_rules=ExitRules(take_profit=0.05, max_bars=24, trigger="high_low"))
+        tight = SignalGenerator(
+            exit_rules=ExitRules(take_profit=0.05, stop_loss=0.005, max_bars=24, trigger="high_low")
+        )
+
+        without_stop = backtest_performance(candles, loose)
+        with_stop = backtest_performance(candles, tight)
+
+        assert with_stop.exposure < without_stop.exposure
+        assert with_stop.summary() != without_stop.summary()
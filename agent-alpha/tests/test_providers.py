@@ -0,0 +1,101 @@
+"""
+Tests for the Market Data Provider registry
+"""
+
+import subprocess
+import sys
+import pytest
+sys.path.insert(0, '..')
+
+from services.providers import (
+    MarketDataProvider,
+    CoinGeckoProvider,
+    BinanceProvider,
+    create_provider,
+    register_provider,
+    available_providers,
+    interval_to_ms,
+)
+
+
+class StubService:
+    """Records the arguments passed by a provider"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def fetch_ohlc(self, symbol, days):
+        self.calls.append((symbol, days))
+        return [[0, 1, 2, 0.5, 1.5, 0]]
+
+    async def fetch_ohlcv(self, symbol, timeframe, limit):
+        self.calls.append((symbol, timeframe, limit))
+        return [[0, 1, 2, 0.5, 1.5, 10]]
+
+
+class TestRegistry:
+    """Tests for provider selection"""
+
+    def test_builtin_providers_registered(self):
+        assert {"coingecko", "binance"} <= set(available_providers())
+
+    def test_create_by_name(self):
+        assert isinstance(create_provider("coingecko"), CoinGeckoProvider)
+        assert isinstance(create_provider("BINANCE"), BinanceProvider)
+
+    def test_create_from_env(self, monkeypatch):
+        monkeypatch.setenv("MARKET_DATA_PROVIDER", "binance")
+        assert isinstance(create_provider(), BinanceProvider)
+
+    def test_unknown_provider_raises(self):
+        with pytest.raises(ValueError):
+            create_provider("nope")
+
+    def test_register_custom_provider(self):
+        class Custom(MarketDataProvider):
+            name = "custom"
+
+        register_provider("custom", Custom)
+        assert isinstance(create_provider("custom"), Custom)
+
+
+class TestProviders:
+    """Tests for the common fetch_candles API"""
+
+    async def test_coingecko_converts_limit_to_days(self):
+        provider = CoinGeckoProvider(api_key="")
+        provider._service = StubService()
+
+        await provider.fetch_candles("ETH/USDT", "1h", 720)
+        await provider.fetch_candles("ETH/USDT", "1d", 5000)
+
+        assert provider._service.calls == [("ETH/USDT", 30), ("ETH/USDT", 365)]
+
+    async def test_binance_passes_interval_and_limit(self):
+        provider = BinanceProvider()
+        provider._service = StubService()
+
+        candles = await provider.fetch_candles("BTC/USDT", "4h", 100)
+
+        assert provider._service.calls == [("BTC/USDT", "4h", 100)]
+        assert len(candles[0]) == 6
+
+    def test_interval_to_ms(self):
+        assert interval_to_ms("1h") == 3600000
+        with pytest.raises(ValueError):
+            interval_to_ms("7x")
+
+    def test_heavy_clients_not_imported_until_used(self):
+        """Creating providers must not import ccxt or aiohttp"""
+        code = (
+            "import sys; from services.providers import create_provider; "
+            "import services.binance; "
+            "create_provider('binance'); create_provider('coingecko'); "
+            "print('ccxt' in sys.modules, 'aiohttp' in sys.modules)"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True, text=True, check=True,
+            cwd=__file__.rsplit('/tests/', 1)[0]
+        )
+        assert out.stdout.strip() == "False False"
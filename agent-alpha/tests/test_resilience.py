@@ -0,0 +1,91 @@
+"""
+Tests for Circuit Breaker
+"""
+
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from services.resilience import CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def _fail():
+    raise Exception("upstream down")
+
+
+async def _ok():
+    return "ok"
+
+
+class TestCircuitBreaker:
+    """Tests for breaker state transitions"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def breaker(self, clock):
+        return CircuitBreaker(failure_threshold=3, reset_timeout=10.0, clock=clock)
+
+    async def test_opens_after_threshold_failures(self, breaker):
+        """Circuit should open after consecutive failures reach the threshold"""
+        for _ in range(3):
+            with pytest.raises(Exception, match="upstream down"):
+                await breaker.call(_fail)
+
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(_ok)
+
+    async def test_success_resets_failure_count(self, breaker):
+        """A success while closed should reset the consecutive failure count"""
+        for _ in range(2):
+            with pytest.raises(Exception):
+                await breaker.call(_fail)
+        await breaker.call(_ok)
+
+        assert breaker.failures == 0
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    async def test_half_open_probe_success_closes(self, breaker, clock):
+        """After the reset timeout a successful probe should close the circuit"""
+        for _ in range(3):
+            with pytest.raises(Exception):
+                await breaker.call(_fail)
+
+        clock.now += 10.0
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert await breaker.call(_ok) == "ok"
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    async def test_half_open_probe_failure_reopens(self, breaker, clock):
+        """A failed probe should re-open the circuit for another timeout"""
+        for _ in range(3):
+            with pytest.raises(Exception):
+                await breaker.call(_fail)
+
+        clock.now += 10.0
+        with pytest.raises(Exception, match="upstream down"):
+            await breaker.call(_fail)
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_half_open_limits_concurrent_probes(self, breaker, clock):
+        """Only half_open_max_calls probes should be admitted at once"""
+        for _ in range(3):
+            breaker.record_failure()
+
+        clock.now += 10.0
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
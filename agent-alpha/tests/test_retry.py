@@ -0,0 +1,225 @@
+"""
+Tests for the Retry Policy
+"""
+
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from aiohttp.test_utils import TestServer
+
+from services.binance import BinanceService
+from services.fake_upstream import FakeUpstream, FakeUpstreamConfig
+from services.providers import BinanceProvider, CoinGeckoProvider
+from services.rate_limit import RateLimiter
+from services.retry import RetryableError, RetryPolicy, parse_retry_after
+
+
+class FakeTime:
+    """Clock and sleep that advance together without waiting"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class Flaky:
+    """Fails with the given errors in turn, then succeeds"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def _policy(time, **kwargs):
+    kwargs.setdefault("jitter", lambda: 1.0)
+    return RetryPolicy(clock=time.clock, sleep=time.sleep, **kwargs)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7
+    assert parse_retry_after(" 1.5 ") == 1.5
+    assert parse_retry_after("-3") == 0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:30 GMT", now=lambda: 1445412480.0) == 30
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+
+class TestRetryPolicy:
+    """Tests for backoff, Retry-After and the deadline"""
+
+    async def test_exponential_backoff(self):
+        time = FakeTime()
+        policy = _policy(time, base_delay=0.5, max_delay=3.0, max_attempts=6)
+        fn = Flaky(*[RetryableError("500", status=500)] * 5)
+
+        assert await policy.call(fn) == "ok"
+        assert time.sleeps == [0.5, 1.0, 2.0, 3.0, 3.0]
+        assert policy.stats["retries"] == 5
+        assert policy.stats["attempts"] == 6
+
+    async def test_full_jitter(self):
+        time = FakeTime()
+        policy = _policy(time, jitter=lambda: 0.25, base_delay=1.0)
+        await policy.call(Flaky(RetryableError("500"), RetryableError("500")))
+        assert time.sleeps == [0.25, 0.5]
+
+    async def test_honors_retry_after(self):
+        time = FakeTime()
+        policy = _policy(time, jitter=lambda: 0.5, base_delay=0.2)
+        fn = Flaky(RetryableError("429", status=429, retry_after=4.0))
+
+        assert await policy.call(fn) == "ok"
+        assert time.sleeps == [pytest.approx(4.1)]
+        assert policy.stats["throttled"] == 1
+
+    async def test_gives_up_after_max_attempts(self):
+        time = FakeTime()
+        policy = _policy(time, max_attempts=3)
+        fn = Flaky(*[RetryableError("503", status=503)] * 5)
+
+        with pytest.raises(RetryableError, match="503"):
+            await policy.call(fn)
+        assert fn.calls == 3
+        assert policy.stats["gave_up"] == 1
+
+    async def test_deadline_stops_retries(self):
+        time = FakeTime()
+        policy = _policy(time, deadline=10.0, max_attempts=10)
+        # Waiting 30s would end past the deadline, so the error is raised at once
+        fn = Flaky(RetryableError("429", status=429, retry_after=30.0))
+
+        with pytest.raises(RetryableError):
+            await policy.call(fn)
+        assert fn.calls == 1
+        assert time.sleeps == []
+
+    async def test_other_errors_are_not_retried(self):
+        time = FakeTime()
+        policy = _policy(time)
+        fn = Flaky(ValueError("bad symbol"))
+
+        with pytest.raises(ValueError):
+            await policy.call(fn)
+        assert fn.calls == 1
+        assert policy.stats["retries"] == 0
+
+    async def test_retry_after_pauses_shared_limiter(self):
+        time = FakeTime()
+        limiter = RateLimiter(rate=10, burst=5, clock=time.clock)
+        policy = _policy(time, limiter=limiter, jitter=lambda: 0.0)
+        await policy.call(Flaky(RetryableError("429", status=429, retry_after=2.0)))
+
+        # Another caller of the same upstream is held off until the pause ends
+        # (plus the slot the retry itself took at t=2)
+        assert time.now == pytest.approx(2.0)
+        time.now = 1.0
+        assert limiter.reserve() == pytest.approx(1.1)
+
+
+class TestProviderRetries:
+    """Providers recover from a misbehaving upstream"""
+
+    @pytest.fixture
+    async def upstream(self):
+        fake = FakeUpstream(FakeUpstreamConfig(seed=4, retry_after=0), clock=lambda: 1_700_000_000.0)
+        async with TestServer(fake.app) as server:
+            fake.base_url = str(server.make_url("")).rstrip("/")
+            yield fake
+
+    async def test_coingecko_recovers(self, upstream):
+        upstream.config.throttle_rate = 0.3
+        upstream.config.error_rate = 0.2
+        retry = RetryPolicy(max_attempts=10, base_delay=0.001)
+        provider = CoinGeckoProvider(base_url=upstream.base_url, min_request_interval=0, retry=retry)
+        try:
+            for _ in range(10):
+                assert len(await provider.fetch_candles("ETH/USDT", "1h", 24)) > 0
+        finally:
+            await provider.close()
+
+        assert upstream.stats[("/coins/{coin_id}/ohlc", 200)] == 10
+        assert retry.stats["retries"] > 0
+        assert retry.stats["throttled"] == upstream.stats[("/coins/{coin_id}/ohlc", 429)]
+        assert provider.upstream_stats()["retry"]["gave_up"] == 0
+
+    async def test_binance_recovers(self, upstream):
+        retry = RetryPolicy(max_attempts=10, base_delay=0.001)
+        provider = BinanceProvider(base_url=upstream.base_url, retry=retry)
+        try:
+            await provider.fetch_candles("ETH/USDT", "1h", 24)  # Load markets while healthy
+            upstream.config.throttle_rate = 0.5
+            for _ in range(5):
+                assert len(await provider.fetch_candles("ETH/USDT", "1h", 24)) == 24
+        finally:
+            await provider.close()
+
+        assert upstream.stats[("/api/v3/klines", 429)] > 0
+        assert retry.stats["retries"] == upstream.stats[("/api/v3/klines", 429)]
+
+
+class TestBinanceThrottling:
+    """Binance requests share one rate limiter; IP bans are not retried"""
+
+    @pytest.fixture
+    async def service(self):
+        service = BinanceService(mock_fallback=False, min_request_interval=0.05)
+        yield service
+        await service.close()
+
+    def _stub(self, service, time, *errors, retry_after="2"):
+        """Klines answered by errors in turn (with Retry-After), then one candle"""
+        service.limiter = RateLimiter(rate=20, clock=time.clock)
+        service.retry = _policy(time, limiter=service.limiter, jitter=lambda: 0.0)
+        service.exchange.last_response_headers = {"Retry-After": retry_after}
+        fn = Flaky(*errors)
+
+        async def fetch_ohlcv(symbol, timeframe, since=None, limit=None):
+            await fn()
+            return [[0, 1.0, 1.0, 1.0, 1.0, 1.0]]
+
+        service.exchange.fetch_ohlcv = fetch_ohlcv
+        return fn
+
+    async def test_default_retry_shares_limiter(self, service):
+        assert service.retry.limiter is service.limiter
+        assert service.limiter.rate == pytest.approx(20)
+
+    async def test_throttle_pauses_every_caller(self, service):
+        import ccxt
+
+        time = FakeTime()
+        fn = self._stub(service, time, ccxt.DDoSProtection("binance 429 Too Many Requests"))
+        assert len(await service.fetch_ohlcv_since("ETH/USDT", "1h", 0, 1)) == 1
+
+        assert fn.calls == 2
+        assert service.retry.stats["throttled"] == 1
+        assert time.sleeps == [pytest.approx(2.0)]
+        # A caller that arrived during the pause waits until it ends
+        time.now = 1.0
+        assert service.limiter.reserve() == pytest.approx(1.05)
+
+    async def test_ip_ban_is_not_retried(self, service):
+        import ccxt
+
+        time = FakeTime()
+        fn = self._stub(service, time, ccxt.DDoSProtection("binance 418 I'm a teapot"), retry_after="60")
+        with pytest.raises(ccxt.DDoSProtection):
+            await service.fetch_ohlcv_since("ETH/USDT", "1h", 0, 1)
+
+        assert fn.calls == 1
+        assert service.retry.stats["retries"] == 0
+        assert service.limiter.reserve() == pytest.approx(60)
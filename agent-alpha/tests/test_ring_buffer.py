@@ -0,0 +1,100 @@
+"""
+Tests for the Candle Ring Buffer
+"""
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from services.indicator_engine import IndicatorEngine, latest_values
+from services.ring_buffer import CandleRing
+
+
+def _candles(count, start=0):
+    closes = 100 + np.cumsum(np.random.default_rng(start).normal(0, 1, count))
+    return [[(start + i) * 3600000, c, c + 1, c - 1, c, 10.0 + i] for i, c in enumerate(closes)]
+
+
+class TestCandleRing:
+    """Tests for append, eviction and views"""
+
+    def test_append_until_full_then_evict_oldest(self):
+        ring = CandleRing(capacity=5)
+        candles = _candles(12)
+        for i, candle in enumerate(candles):
+            ring.append(candle)
+            expected = np.asarray(candles[max(0, i - 4):i + 1])
+            assert len(ring) == len(expected)
+            assert np.array_equal(ring.to_array(), expected)
+
+        assert ring.full
+        assert ring.appended == 12
+        assert ring.latest("close") == candles[-1][4]
+
+    def test_extend_matches_appends(self):
+        candles = _candles(37)
+        for capacity in (1, 4, 10, 50):
+            appended = CandleRing(capacity)
+            for candle in candles:
+                appended.append(candle)
+            extended = CandleRing(capacity)
+            for start in range(0, 37, 6):  # Batches that wrap at different slots
+                extended.extend(candles[start:start + 6])
+
+            assert np.array_equal(extended.to_array(), appended.to_array())
+            assert extended.appended == appended.appended == 37
+
+    def test_extend_longer_than_capacity(self):
+        ring = CandleRing(capacity=8)
+        ring.append(_candles(1)[0])
+        ring.extend(_candles(20, start=1))
+        assert np.array_equal(ring.to_array(), np.asarray(_candles(20, start=1)[-8:]))
+
+    def test_views_are_contiguous_and_zero_copy(self):
+        ring = CandleRing(capacity=16)
+        ring.extend(_candles(27))
+        for n in (1, 5, 16):
+            view = ring.column("close", n)
+            assert view.flags.c_contiguous
+            assert np.shares_memory(view, ring._data)
+            assert not view.flags.writeable
+            assert np.array_equal(view, np.asarray(_candles(27))[-n:, 4])
+
+    def test_columns_feed_indicator_engine(self):
+        candles = _candles(300)
+        ring = CandleRing(capacity=200)
+        ring.extend(candles)
+        from_ring = latest_values(IndicatorEngine(columns=ring.columns()).compute(["rsi", "macd", "atr"]))
+        from_list = latest_values(IndicatorEngine(candles[-200:]).compute(["rsi", "macd", "atr"]))
+        assert from_ring == from_list
+
+    def test_drop_oldest_and_newest(self):
+        candles = _candles(30)
+        ring = CandleRing(capacity=10)
+        ring.extend(candles[:10])
+
+        ring.drop_oldest(3)
+        assert np.array_equal(ring.to_array(), np.asarray(candles[3:10]))
+        ring.drop_newest(2)
+        assert np.array_equal(ring.to_array(), np.asarray(candles[3:8]))
+        ring.extend(candles[8:13])  # Refills past the old write position
+        assert np.array_equal(ring.to_array(), np.asarray(candles[3:13]))
+        assert ring.full
+
+    def test_clear_resets_counters(self):
+        ring = CandleRing(capacity=4)
+        ring.extend(_candles(6))
+        ring.clear()
+        assert len(ring) == 0
+        assert ring.appended == 0
+        ring.append(_candles(1)[0])
+        assert ring.appended == 1
+
+    def test_empty_and_invalid(self):
+        ring = CandleRing(capacity=3)
+        assert len(ring.column("close")) == 0
+        with pytest.raises(IndexError):
+            ring.latest()
+        with pytest.raises(ValueError):
+            CandleRing(capacity=0)
@@ -0,0 +1,228 @@
+"""
+Tests for the Universe Scanner
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from services import scanner as scanner_module
+from services.backtest_cache import BacktestCache
+from services.market_data import MarketDataService
+from services.scanner import UniverseScanner
+from services.signals import SignalGenerator, TradingSignal
+
+
+HOUR = 3600000
+
+
+class DelayedSource:
+    """Flat candles; fetches can be slow or fail per symbol"""
+
+    def __init__(self, delays=None, failing=()):
+        self.delays = delays or {}
+        self.failing = set(failing)
+        self.calls = 0
+
+    async def fetch_candles(self, symbol, interval, limit):
+        self.calls += 1
+        await asyncio.sleep(self.delays.get(symbol, 0))
+        if symbol in self.failing:
+            raise Exception("CoinGecko API error: 500")
+        return [[i * HOUR, 1.0, 1.0, 1.0, 1.0, 1.0] for i in range(limit)]
+
+
+class StubGenerator(SignalGenerator):
+    """Every latest bar is a setup; scoring returns a fixed signal and confidence per symbol"""
+
+    def __init__(self, setups):
+        super().__init__()
+        self.setups = setups
+        self.calls = 0
+
+    def signal_masks(self, prices, rsi, bb_upper, bb_lower):
+        return np.ones(np.shape(prices), dtype=bool), np.zeros(np.shape(prices), dtype=bool)
+
+    def signal_from_indicators(self, candles, current_rsi, bb_upper, bb_middle, bb_lower, cache_key=None):
+        self.calls += 1
+        signal, confidence = self.setups.get(cache_key[0], ("HOLD", 0.0))
+        return TradingSignal(signal=signal, confidence=confidence, win_rate=50.0, reasoning=signal)
+
+
+def _scanner(source, setups, **kwargs):
+    market_data = MarketDataService(source, fresh_ttl=60)
+    return UniverseScanner(market_data, StubGenerator(setups), limit=10, **kwargs)
+
+
+SETUPS = {
+    "A/USDT": ("BUY_CALL", 80.0),
+    "B/USDT": ("BUY_PUT", 95.0),
+    "C/USDT": ("HOLD", 0.0),
+    "D/USDT": ("BUY_CALL", 61.0),
+    "E/USDT": ("BUY_PUT", 72.5),
+    "F/USDT": ("BUY_CALL", 72.5),
+}
+
+
+class TestUniverseScanner:
+    """Tests for ranking, budget and streaming"""
+
+    async def test_keeps_top_k_by_confidence(self):
+        scanner = _scanner(DelayedSource(), SETUPS)
+        report = await scanner.scan(list(SETUPS), top_k=4, budget=5)
+
+        assert [r.symbol for r in report.top[:2]] == ["B/USDT", "A/USDT"]
+        assert {r.symbol for r in report.top[2:]} == {"E/USDT", "F/USDT"}  # Tied at 72.5
+        assert report.completed == 6
+        assert report.timed_out == []
+
+    async def test_heap_matches_full_sort(self):
+        setups = {f"S{i}/USDT": ("BUY_CALL", float((i * 37) % 101)) for i in range(60)}
+        scanner = _scanner(DelayedSource(), setups)
+        report = await scanner.scan(list(setups), top_k=7, budget=5)
+
+        expected = sorted(setups.values(), key=lambda s: s[1], reverse=True)[:7]
+        assert [r.confidence for r in report.top] == [c for _, c in expected]
+
+    async def test_hold_is_not_ranked(self):
+        scanner = _scanner(DelayedSource(), {"C/USDT": ("HOLD", 0.0)})
+        report = await scanner.scan(["C/USDT"], top_k=5)
+        assert report.top == []
+        assert report.completed == 1
+
+    async def test_budget_returns_finished_results(self):
+        source = DelayedSource(delays={"A/USDT": 2.0})
+        scanner = _scanner(source, SETUPS)
+        report = await scanner.scan(["A/USDT", "B/USDT", "D/USDT"], top_k=5, budget=0.2)
+
+        assert [r.symbol for r in report.top] == ["B/USDT", "D/USDT"]
+        assert report.timed_out == ["A/USDT"]
+        assert report.elapsed_seconds < 1.0
+
+    async def test_failures_are_reported(self):
+        scanner = _scanner(DelayedSource(failing={"A/USDT"}), SETUPS)
+        streamed = []
+        report = await scanner.scan(["A/USDT", "B/USDT"], on_result=streamed.append)
+
+        assert report.failed == 1 and report.completed == 1
+        failed = next(r for r in streamed if r.symbol == "A/USDT")
+        assert "unavailable" in failed.error
+
+    async def test_streams_in_completion_order(self):
+        source = DelayedSource(delays={"A/USDT": 0.1, "B/USDT": 0.05, "D/USDT": 0.0})
+        streamed = []
+        await _scanner(source, SETUPS).scan(["A/USDT", "B/USDT", "D/USDT"], on_result=streamed.append)
+        assert [(r.symbol, r.evaluated) for r in streamed] == [
+            ("D/USDT", False), ("B/USDT", False), ("A/USDT", False),
+            ("D/USDT", True), ("B/USDT", True), ("A/USDT", True),
+        ]
+        assert streamed[0].price == 1.0 and streamed[0].signal == "HOLD"
+        assert streamed[3].signal == "BUY_CALL"
+
+    async def test_streams_before_slow_fetches_finish(self):
+        source = DelayedSource(delays={"A/USDT": 0.3})
+        scanner = _scanner(source, SETUPS)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        arrived = {}
+        await scanner.scan(["A/USDT", "B/USDT"], on_result=lambda r: arrived.setdefault(r.symbol, loop.time()))
+        assert arrived["B/USDT"] - started < 0.2
+
+    async def test_memoized_signals_stream_once(self):
+        scanner = _scanner(DelayedSource(), SETUPS)
+        await scanner.scan(["A/USDT", "B/USDT"])
+        streamed = []
+        await scanner.scan(["A/USDT", "B/USDT"], on_result=streamed.append)
+        assert sorted((r.symbol, r.signal) for r in streamed) == [("A/USDT", "BUY_CALL"), ("B/USDT", "BUY_PUT")]
+        assert all(r.evaluated for r in streamed)
+
+    async def test_reuses_cached_histories_and_signals(self):
+        source = DelayedSource()
+        scanner = _scanner(source, SETUPS)
+        await scanner.scan(list(SETUPS))
+        await scanner.scan(list(SETUPS))
+
+        assert source.calls == 6
+        assert scanner.generator.calls == 6
+
+    async def test_concurrency_limit(self):
+        running, peak = 0, 0
+
+        class CountingSource(DelayedSource):
+            async def fetch_candles(self, symbol, interval, limit):
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                try:
+                    await asyncio.sleep(0.01)
+                    return await super().fetch_candles(symbol, interval, limit)
+                finally:
+                    running -= 1
+
+        setups = {f"S{i}/USDT": ("BUY_CALL", float(i)) for i in range(20)}
+        await _scanner(CountingSource(), setups, concurrency=4).scan(list(setups))
+        assert peak == 4
+
+
+def _walk(seed, length, ending):
+    """Random walk whose last bars drop, spike or keep drifting"""
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.005, length)))
+    if ending == "drop":
+        prices[-6:] *= np.linspace(0.98, 0.9, 6)
+    elif ending == "spike":
+        prices[-6:] *= np.linspace(1.02, 1.1, 6)
+    return prices
+
+
+class WalkSource:
+    def __init__(self, series):
+        self.series = series
+
+    async def fetch_candles(self, symbol, interval, limit):
+        prices = self.series[symbol][-limit:]
+        offset = 720 - len(prices)  # Shorter histories start later on the same grid
+        return [[(offset + i) * HOUR, p, p * 1.002, p * 0.998, float(p), 1.0] for i, p in enumerate(prices)]
+
+
+class TestUniverseEvaluation:
+    """The universe-wide pass should agree with per-symbol signals"""
+
+    @pytest.fixture
+    def series(self):
+        endings = ["drop", "spike", "none"]
+        series = {f"S{i}/USDT": _walk(i, 720, endings[i % 3]) for i in range(12)}
+        series["SHORT/USDT"] = _walk(99, 300, "drop")
+        return series
+
+    async def test_matches_generate_signal(self, series):
+        generator = SignalGenerator(backtest_cache=BacktestCache())
+        scanner = UniverseScanner(MarketDataService(WalkSource(series), fresh_ttl=60), generator)
+        report = await scanner.scan(list(series), top_k=len(series))
+
+        reference = SignalGenerator()
+        expected = {}
+        for symbol in series:
+            candles = await WalkSource(series).fetch_candles(symbol, "1h", 720)
+            signal = reference.generate_signal(candles)
+            if signal.signal != "HOLD":
+                expected[symbol] = (signal.signal, signal.confidence, signal.win_rate)
+
+        assert len(expected) >= 4
+        assert {r.symbol: (r.signal, r.confidence, r.win_rate) for r in report.top} == expected
+
+    async def test_indicators_computed_once_per_scan(self, series, monkeypatch):
+        calls = []
+        compute = scanner_module.compute_universe_indicators
+        monkeypatch.setattr(
+            scanner_module, "compute_universe_indicators",
+            lambda aligned: calls.append(len(aligned.symbols)) or compute(aligned)
+        )
+        scanner = UniverseScanner(MarketDataService(WalkSource(series), fresh_ttl=60), SignalGenerator())
+        await scanner.scan(list(series))
+        await scanner.scan(list(series))  # Unchanged candles: memoized, no pass
+
+        assert calls == [len(series)]
@@ -0,0 +1,169 @@
+"""
+Tests for the Shared Candle Cache
+"""
+
+import asyncio
+import multiprocessing
+import os
+import numpy as np
+import sys
+sys.path.insert(0, '..')
+
+from services.http_cache import candle_fingerprint
+from services.indicator_engine import IndicatorEngine, latest_values
+from services.market_data import MarketDataService
+from services.shared_cache import SharedCandleCache, SharedProvider
+from services.signals import SignalGenerator
+
+
+def _candles(count, offset=0):
+    closes = 100 + np.cumsum(np.random.default_rng(7).normal(0, 1, count + offset))[offset:]
+    return [[i * 3600000, c, c + 1, c - 1, c, 10.0] for i, c in enumerate(closes)]
+
+
+class FileCountingSource:
+    """Upstream stand-in that logs each call to a file (visible across processes)"""
+
+    def __init__(self, log_path, delay=0.0):
+        self.log_path = log_path
+        self.delay = delay
+
+    async def fetch_candles(self, symbol, interval, limit):
+        with open(self.log_path, "a") as f:
+            f.write(f"{os.getpid()}\n")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return _candles(limit)
+
+    async def close(self):
+        pass
+
+    def calls(self):
+        if not os.path.exists(self.log_path):
+            return 0
+        with open(self.log_path) as f:
+            return len(f.readlines())
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSharedCandleCache:
+    """Tests for publishing and mapping windows"""
+
+    def test_round_trip_is_read_only_view(self, tmp_path):
+        cache = SharedCandleCache(str(tmp_path))
+        cache.publish("ETH/USDT", "1h", 100, _candles(100), fetched_at=1234.5)
+
+        entry = SharedCandleCache(str(tmp_path)).read("ETH/USDT", "1h", 100)
+        assert entry.fetched_at == 1234.5
+        assert np.array_equal(entry.candles, np.asarray(_candles(100)))
+        assert not entry.candles.flags.writeable
+        assert isinstance(entry.candles.base, np.memmap)
+
+    def test_mapping_is_reused_until_replaced(self, tmp_path):
+        cache = SharedCandleCache(str(tmp_path))
+        cache.publish("ETH/USDT", "1h", 10, _candles(10), fetched_at=1.0)
+        first = cache.read("ETH/USDT", "1h", 10)
+        assert cache.read("ETH/USDT", "1h", 10) is first
+
+        cache.publish("ETH/USDT", "1h", 10, _candles(10, offset=5), fetched_at=2.0)
+        second = cache.read("ETH/USDT", "1h", 10)
+        assert second.fetched_at == 2.0
+        # Views of the replaced window stay intact
+        assert np.array_equal(first.candles, np.asarray(_candles(10)))
+
+    def test_missing_key(self, tmp_path):
+        assert SharedCandleCache(str(tmp_path)).read("ETH/USDT", "1h", 10) is None
+
+    def test_lock_is_exclusive(self, tmp_path):
+        cache = SharedCandleCache(str(tmp_path))
+        fd = cache.try_lock("key")
+        assert fd is not None
+        assert SharedCandleCache(str(tmp_path)).try_lock("key") is None
+        cache.unlock(fd)
+        other = cache.try_lock("key")
+        assert other is not None
+        cache.unlock(other)
+
+    def test_json_payloads(self, tmp_path):
+        cache = SharedCandleCache(str(tmp_path))
+        assert cache.read_json("analyze-ETH") is None
+        cache.write_json("analyze-ETH", {"etag": "x", "response": {"signal": "HOLD"}})
+        assert SharedCandleCache(str(tmp_path)).read_json("analyze-ETH")["response"]["signal"] == "HOLD"
+
+
+class TestSharedProvider:
+    """Tests for single refresher behavior"""
+
+    async def test_second_worker_reads_published_window(self, tmp_path):
+        source = FileCountingSource(str(tmp_path / "calls.log"))
+        clock = FakeClock()
+        workers = [
+            SharedProvider(source, SharedCandleCache(str(tmp_path / "shm")), ttl=60, clock=clock)
+            for _ in range(3)
+        ]
+        results = [await worker.fetch_candles("ETH/USDT", "1h", 50) for worker in workers]
+
+        assert source.calls() == 1
+        assert all(np.array_equal(r, results[0]) for r in results)
+        assert workers[1].stats["shared_hits"] == 1
+
+        clock.now += 61
+        await workers[2].fetch_candles("ETH/USDT", "1h", 50)
+        assert source.calls() == 2
+
+    async def test_waiting_worker_picks_up_refresh(self, tmp_path):
+        source = FileCountingSource(str(tmp_path / "calls.log"), delay=0.05)
+        workers = [SharedProvider(source, SharedCandleCache(str(tmp_path / "shm"))) for _ in range(4)]
+
+        results = await asyncio.gather(*(w.fetch_candles("ETH/USDT", "1h", 50) for w in workers))
+        assert source.calls() == 1
+        assert sum(w.stats["lock_waits"] for w in workers) == 3
+        assert all(np.array_equal(r, results[0]) for r in results)
+
+    async def test_pipeline_accepts_shared_arrays(self, tmp_path):
+        source = FileCountingSource(str(tmp_path / "calls.log"))
+        service = MarketDataService(SharedProvider(source, SharedCandleCache(str(tmp_path / "shm"))))
+        snapshot = await service.get_candles("ETH/USDT", "1h", 300)
+        listed = _candles(300)
+
+        assert candle_fingerprint(snapshot.candles) == candle_fingerprint(listed)
+        assert latest_values(IndicatorEngine(snapshot.candles).compute(["rsi", "macd"])) == \
+            latest_values(IndicatorEngine(listed).compute(["rsi", "macd"]))
+        assert SignalGenerator().generate_signal(snapshot.candles) == SignalGenerator().generate_signal(listed)
+
+
+def _worker(directory, log_path, barrier, results):
+    barrier.wait()
+    provider = SharedProvider(FileCountingSource(log_path, delay=0.1), SharedCandleCache(directory))
+    candles = asyncio.run(provider.fetch_candles("ETH/USDT", "1h", 100))
+    results.put(float(candles[-1, 4]))
+
+
+class TestAcrossProcesses:
+    """Upstream traffic stays constant as workers are added"""
+
+    def test_one_upstream_fetch_for_many_processes(self, tmp_path):
+        context = multiprocessing.get_context("fork")
+        log_path = str(tmp_path / "calls.log")
+        workers = 6
+        barrier = context.Barrier(workers)
+        results = context.Queue()
+        processes = [
+            context.Process(target=_worker, args=(str(tmp_path / "shm"), log_path, barrier, results))
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        closes = [results.get(timeout=10) for _ in processes]
+        for process in processes:
+            process.join(timeout=10)
+
+        assert FileCountingSource(log_path).calls() == 1
+        assert len(set(closes)) == 1
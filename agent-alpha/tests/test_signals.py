@@ -2,10 +2,12 @@
 Tests for Signal Generation Engine
 """
 
+import numpy as np
 import pytest
 import sys
 sys.path.insert(0, '..')
 
+from services.indicators import calculate_rsi, calculate_bollinger_bands
 from services.signals import SignalGenerator, TradingSignal
 
 
@@ -127,3 +129,43 @@ class TestTradingSignalDataclass:
                 reasoning="Test"
             )
             assert signal.signal == signal_type
+
+
+class TestSignalHistory:
+    """Per-bar signals from the vectorized masks"""
+    
+    def test_matches_per_bar_evaluation(self):
+        """Every bar should get the signal _evaluate_conditions gives on its own prefix"""
+        generator = SignalGenerator()
+        rng = np.random.default_rng(11)
+        # Swings wide enough to cross both bands with extreme RSI
+        closes = 100 + 15 * np.sin(np.arange(300) / 9) + np.cumsum(rng.normal(0, 1.5, 300))
+        candles = [[i * 3600000, c, c + 1, c - 1, c, 1000] for i, c in enumerate(closes)]
+        
+        history = generator.signal_history(candles)
+        
+        expected = []
+        for i in range(len(candles)):
+            prefix = list(closes[:i + 1])
+            if i < generator.BACKTEST_MIN_LOOKBACK:
+                expected.append("HOLD")
+                continue
+            upper, middle, lower = calculate_bollinger_bands(prefix, period=20, std_dev=2)
+            signal, _ = generator._evaluate_conditions(
+                prefix[-1], calculate_rsi(prefix, period=14), upper, lower, middle
+            )
+            expected.append(signal)
+        
+        assert history.signals.tolist() == expected
+        assert {"BUY_CALL", "BUY_PUT"} <= set(expected)
+        assert np.array_equal(history.timestamps, np.arange(300) * 3600000)
+    
+    def test_agrees_with_backtest_entries(self):
+        generator = SignalGenerator()
+        closes = list(100 + 10 * np.sin(np.arange(200) / 6))
+        candles = [[i * 3600000, c, c + 1, c - 1, c, 1000] for i, c in enumerate(closes)]
+        
+        _, buy_call, buy_put = generator.historical_signals(candles)
+        signals = generator.signal_history(candles).signals
+        assert np.array_equal(signals == "BUY_CALL", buy_call)
+        assert np.array_equal(signals == "BUY_PUT", buy_put)
@@ -0,0 +1,94 @@
+"""
+Tests for cross-symbol Universe Matrix Computation
+"""
+
+import numpy as np
+import pytest
+import sys
+sys.path.insert(0, '..')
+
+from services.universe import align_candles, compute_universe_indicators, universe_signal_masks
+from services.indicators import calculate_rsi, calculate_bollinger_bands
+
+
+HOUR = 3600000
+
+
+def _candles(closes, start=0, skip=()):
+    """Hourly candles from closes, optionally omitting some bar indices"""
+    return [
+        [(start + i) * HOUR, c, c + 1, c - 1, c, 100]
+        for i, c in enumerate(closes) if i not in skip
+    ]
+
+
+@pytest.fixture
+def universe():
+    rng = np.random.default_rng(5)
+    return {
+        "ETH": _candles(list(3000 + np.cumsum(rng.normal(0, 10, 120)))),
+        "BTC": _candles(list(60000 + np.cumsum(rng.normal(0, 100, 100))), start=20),
+        "SOL": _candles(list(150 + np.cumsum(rng.normal(0, 2, 120))), skip={40, 41, 77}),
+    }
+
+
+class TestAlignment:
+    """Tests for timestamp alignment"""
+
+    def test_union_index_and_gaps(self, universe):
+        aligned = align_candles(universe)
+
+        assert aligned.close.shape == (3, 120)
+        assert np.all(np.diff(aligned.timestamps) == HOUR)
+        assert not aligned.present[1, :20].any() and aligned.present[1, 20:].all()
+        assert not aligned.present[2, [40, 41, 77]].any()
+
+    def test_last_bar_per_symbol(self):
+        aligned = align_candles({"ETH": _candles([1.0] * 10), "BTC": _candles([1.0] * 6), "SOL": []})
+        assert aligned.last_bar.tolist() == [9, 5, -1]
+        assert align_candles({"SOL": []}).last_bar.tolist() == [-1]
+
+    def test_duplicate_timestamps_keep_last(self):
+        aligned = align_candles({"ETH": [[0, 1, 1, 1, 1, 1], [0, 2, 2, 2, 2, 2]]})
+        assert aligned.close[0, 0] == 2
+
+
+class TestUniverseIndicators:
+    """Matrix results should equal per-symbol computation on each symbol's own candles"""
+
+    def test_matches_per_symbol_computation(self, universe):
+        aligned = align_candles(universe)
+        indicators = compute_universe_indicators(aligned)
+
+        for row, symbol in enumerate(aligned.symbols):
+            closes = [c[4] for c in universe[symbol]]
+            columns = np.flatnonzero(aligned.present[row])
+            for k in range(20, len(closes)):
+                t = columns[k]
+                upper, middle, lower = calculate_bollinger_bands(closes[:k + 1], 20, 2)
+                assert indicators["rsi"][row, t] == calculate_rsi(closes[:k + 1], 14)
+                assert indicators["bb_upper"][row, t] == upper
+                assert indicators["bb_lower"][row, t] == lower
+
+    def test_missing_bars_are_nan(self, universe):
+        aligned = align_candles(universe)
+        indicators = compute_universe_indicators(aligned)
+
+        assert np.all(np.isnan(indicators["rsi"][2, [40, 41, 77]]))
+        assert np.all(np.isnan(indicators["rsi"][1, :34]))
+
+    def test_signal_masks(self, universe):
+        aligned = align_candles(universe)
+        masks = universe_signal_masks(aligned)
+
+        assert masks["buy_call"].shape == aligned.close.shape
+        assert not (masks["buy_call"] & masks["buy_put"]).any()
+        assert not masks["buy_call"][~aligned.present].any()
+
+    def test_oversold_symbol_signals(self):
+        closes = [100.0] * 60 + [100 - 3 * i for i in range(1, 11)]
+        aligned = align_candles({"DROP": _candles(closes), "FLAT": _candles([100.0] * 70)})
+        masks = universe_signal_masks(aligned)
+
+        assert masks["buy_call"][0, -1]
+        assert not masks["buy_call"][1].any()